@@ -2,83 +2,174 @@
 """Compile all LaTeX slide files to PDFs."""
 
 import os
-import subprocess
-import glob
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-def compile_tex_to_pdf(tex_file):
-    """Compile a single .tex file to PDF using pdflatex."""
-    directory = os.path.dirname(tex_file)
-    filename = os.path.basename(tex_file)
-    
-    print(f"Compiling: {tex_file}")
-    
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from build_cache import BuildManifest, manifest_lock
+from build_stats import new_build_id
+from compile_deck import compile_deck
+from latex_log import format_summary
+
+def _run_latex(tex_file, engine='pdflatex', max_passes=4, preamble_format=False, tikz_cache=False,
+               out_of_tree=False, timeout=120):
+    """Compile a single .tex file and return (status, detail)."""
     try:
-        # Change to the directory containing the .tex file
-        result = subprocess.run(
-            ["pdflatex", "-interaction=nonstopmode", filename],
-            cwd=directory,
-            capture_output=True,
-            text=True,
-            timeout=120  # 2 minute timeout per file
+        # Passes run in the directory containing the .tex file and are
+        # repeated only while the .aux/.toc/.nav files keep changing
+        result = compile_deck(
+            tex_file,
+            engine=engine,
+            max_passes=max_passes,
+            timeout=timeout,
+            deck_timeout=timeout,  # one budget for all passes of the deck
+            interaction='nonstopmode',
+            preamble_format=preamble_format,
+            tikz_cache=tikz_cache,
+            out_of_tree=out_of_tree
         )
-        
-        if result.returncode == 0:
-            print(f"✅ Success: {tex_file}")
-            return True
-        else:
-            print(f"❌ Failed: {tex_file}")
-            if result.stderr:
-                print(f"   Error: {result.stderr[:200]}...")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        print(f"⏰ Timeout: {tex_file}")
-        return False
+
+        if result.timed_out:
+            return "timeout", None
+        if result.success:
+            return "success", None
+        # The engine reports problems in the .log, not on stderr
+        if result.log_entries:
+            return "failed", format_summary(result.errors or result.log_entries, limit=5)
+        return "failed", result.stderr[:200] if result.stderr else None
+
     except Exception as e:
-        print(f"💥 Exception: {tex_file} - {str(e)}")
-        return False
+        return "exception", str(e)
 
-def main():
-    """Find and compile all LaTeX slide files."""
-    # Find all .tex files in */slides/ directories
+def _report(tex_file, status, detail):
+    """Print the outcome of one compilation and return True on success."""
+    if status == "success":
+        print(f"✅ Success: {tex_file}")
+        return True
+    if status == "failed":
+        print(f"❌ Failed: {tex_file}")
+        if detail:
+            for line in detail.splitlines():
+                print(f"   {line}")
+    elif status == "timeout":
+        print(f"⏰ Timeout: {tex_file}")
+    else:
+        print(f"💥 Exception: {tex_file} - {detail}")
+    return False
+
+def compile_tex_to_pdf(tex_file):
+    """Compile a single .tex file to PDF using pdflatex."""
+    print(f"Compiling: {tex_file}")
+    status, detail = _run_latex(tex_file)
+    return _report(tex_file, status, detail)
+
+def find_slide_files():
+    """Find all .tex files in */slides/ directories."""
     slide_files = []
     for root, dirs, files in os.walk('.'):
         if 'slides' in root and 'build' not in root and '.git' not in root:
             for file in files:
                 if file.endswith('.tex'):
                     slide_files.append(os.path.join(root, file))
-    
+
     slide_files.sort()
-    
-    print(f"Found {len(slide_files)} slide files to compile:")
+    return slide_files
+
+def main():
+    """Find and compile all LaTeX slide files."""
+    parser = argparse.ArgumentParser(description="Compile all LaTeX slide decks to PDF")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Number of decks to compile concurrently (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rebuild every deck, ignoring the build manifest')
+    parser.add_argument('--engine', default='pdflatex',
+                        help='TeX engine to run (default: pdflatex)')
+    parser.add_argument('--max-passes', type=int, default=4,
+                        help='Maximum LaTeX passes per deck (default: 4)')
+    parser.add_argument('--preamble-format', action='store_true',
+                        help='Load shared preambles from precompiled format files')
+    parser.add_argument('--tikz-cache', action='store_true',
+                        help='Reuse TikZ pictures from the shared cache in .cache/tikz')
+    parser.add_argument('--out-of-tree', action='store_true',
+                        help='Compile each deck in its own scratch directory (tmpfs when available)')
+    parser.add_argument('--timeout', type=int, default=120,
+                        help='Seconds per deck, all LaTeX passes together (default: 120)')
+    args = parser.parse_args()
+    jobs = max(1, args.jobs)
+    # Group this run's records in the build statistics (scripts/build_stats.py)
+    os.environ.setdefault('SLIDE_BUILD_ID', new_build_id())
+
+    slide_files = find_slide_files()
+    manifest = BuildManifest()
+
+    # Skip decks whose sources, assets and styles hash the same as last time
+    if args.force:
+        stale_files = slide_files
+    else:
+        stale_files = [f for f in slide_files if not manifest.is_up_to_date(f)]
+    skipped = len(slide_files) - len(stale_files)
+
+    print(f"Found {len(slide_files)} slide files, {len(stale_files)} need compiling:")
     for f in slide_files:
-        print(f"  {f}")
-    
+        print(f"  {f}" if f in stale_files else f"  {f} (up to date)")
+
     print("\n" + "="*60)
-    print("Starting compilation...")
+    print(f"Starting compilation ({jobs} parallel job{'s' if jobs != 1 else ''})...")
     print("="*60)
-    
+
     successful = 0
     failed = 0
-    
-    for tex_file in slide_files:
-        if compile_tex_to_pdf(tex_file):
-            successful += 1
-        else:
-            failed += 1
-        print()  # Empty line for readability
-    
+
+    # Decks are independent, so they can be compiled side by side. Results
+    # are reported in sorted order regardless of which deck finishes first.
+    run = partial(_run_latex, engine=args.engine, max_passes=max(1, args.max_passes),
+                  preamble_format=args.preamble_format, tikz_cache=args.tikz_cache,
+                  out_of_tree=args.out_of_tree, timeout=max(1, args.timeout))
+    if jobs == 1:
+        results = map(run, stale_files)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        results = executor.map(run, stale_files)
+
+    built = []
+    try:
+        for tex_file, (status, detail) in zip(stale_files, results):
+            print(f"Compiling: {tex_file}")
+            if _report(tex_file, status, detail):
+                successful += 1
+                built.append(tex_file)
+            else:
+                failed += 1
+            print()  # Empty line for readability
+    finally:
+        if executor is not None:
+            # On Ctrl-C don't wait for the queued decks; they are forgotten below
+            executor.shutdown(cancel_futures=True)
+        with manifest_lock():
+            manifest = BuildManifest()
+            for tex_file in stale_files:
+                if tex_file in built:
+                    manifest.record(tex_file)
+                else:
+                    manifest.forget(tex_file)
+            manifest.save()
+
     print("="*60)
     print(f"Compilation complete!")
     print(f"✅ Successful: {successful}")
     print(f"❌ Failed: {failed}")
+    print(f"⏭️  Up to date: {skipped}")
     print(f"📊 Total: {len(slide_files)}")
     print("="*60)
-    
+    print("Timing per deck: python scripts/build_stats.py")
+
     if failed > 0:
         print("\nNote: Some files failed to compile. This is normal for files with")
         print("missing figures or dependencies. The important slides should work.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -8,16 +8,32 @@ echo "=== ML Teaching Repository - Rebuild All Slides ==="
 echo "🕐 Starting full rebuild at $SCRIPT_START_DATE"
 echo ""
 
+# Every deck compile of this run is recorded under one build id in
+# .cache/build-stats.jsonl (see scripts/build_stats.py)
+export SLIDE_BUILD_ID=$(date +%Y%m%d-%H%M%S)
+
 # Initialize timing arrays
 declare -A TOPIC_START_TIMES
 declare -A TOPIC_END_TIMES
 declare -A TOPIC_DURATIONS
 
-# Clean everything first AND remove all PDFs to force complete rebuild
-echo "🧹 Cleaning all build artifacts and existing PDFs..."
+# Decks whose content hashes are unchanged are skipped via the build manifest
+# (.cache/build-manifest.json). Pass --force to remove all PDFs and rebuild.
+FORCE_REBUILD=false
+if [ "$1" = "--force" ]; then
+    FORCE_REBUILD=true
+fi
+
 CLEAN_START=$(date +%s)
-make clean
-make distclean
+if [ "$FORCE_REBUILD" = true ]; then
+    echo "🧹 Cleaning all build artifacts and existing PDFs..."
+    make clean
+    make distclean
+    python3 scripts/build_cache.py clear
+else
+    # Decks compile out of tree, so there are no auxiliary files to clean
+    echo "🧹 Nothing to clean for an incremental build (unchanged PDFs are kept)"
+fi
 CLEAN_END=$(date +%s)
 CLEAN_DURATION=$((CLEAN_END - CLEAN_START))
 echo "   ⏱️  Cleaning completed in ${CLEAN_DURATION}s"
@@ -39,8 +55,12 @@ done
 echo "📊 Building ${TOTAL_TOPICS} topics with ${TOTAL_TEX_FILES} total .tex files..."
 echo ""
 
-# Build all with progress reporting - Force rebuild by using clean + all
-echo "🔨 Building all slides with progress (FORCED REBUILD)..."
+# Build all with progress reporting
+if [ "$FORCE_REBUILD" = true ]; then
+    echo "🔨 Building all slides with progress (FORCED REBUILD)..."
+else
+    echo "🔨 Building changed slides with progress (INCREMENTAL)..."
+fi
 BUILD_SUCCESS=true
 CURRENT_TOPIC=0
 
@@ -117,6 +137,12 @@ for topic in "${TOPICS[@]}"; do
 done
 echo ""
 
+# Per-deck timing from the build statistics
+python3 scripts/build_stats.py slowest -n 5
+echo ""
+python3 scripts/build_stats.py regressions
+echo ""
+
 # Count successes and show detailed breakdown
 SUCCESS_COUNT=$(find . -name "*.pdf" -path "*/slides/*" | wc -l)
 echo "📊 Generated PDFs: $SUCCESS_COUNT out of $TOTAL_TEX_FILES .tex files"
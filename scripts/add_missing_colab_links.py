@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
-"""Add Colab links to notebooks that have metadata but are missing Colab links."""
+"""Add Colab links to notebooks that have metadata but are missing Colab links.
+
+The edit is the "colab" pass of notebook_transforms.py.
+"""
 
-import json
-import shutil
 from pathlib import Path
 
+from notebook_transforms import add_arguments, find_notebooks, report, transform_notebooks
+
 def has_quarto_metadata(notebook_data):
     """Check if notebook has Quarto metadata in first raw cell."""
     if not notebook_data.get('cells'):
@@ -37,64 +40,28 @@ def create_colab_cell(notebook_path):
         "source": [colab_content + "\n"]
     }
 
-def add_colab_link(notebook_path, dry_run=False):
-    """Add Colab link to notebook that has metadata but missing link."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        notebook_data = json.load(f)
-    
+def colab_pass(notebook_data, notebook_path):
+    """Insert a Colab link after the metadata cell where it is missing."""
     # Check if has metadata but missing Colab link
-    if not has_quarto_metadata(notebook_data):
-        return False, "No Quarto metadata"
-    
-    if has_colab_link(notebook_data):
-        return False, "Already has Colab link"
-    
-    print(f"Adding Colab link to {notebook_path.name}")
-    
-    if dry_run:
-        print("  [DRY RUN - no changes made]")
-        return True, "Would add Colab link"
-    
-    # Backup original
-    backup_path = notebook_path.with_suffix('.ipynb.backup-colab')
-    shutil.copy2(notebook_path, backup_path)
-    print(f"  Backup created: {backup_path.name}")
+    if not has_quarto_metadata(notebook_data) or has_colab_link(notebook_data):
+        return []
     
     # Insert Colab cell as second cell (after metadata)
-    colab_cell = create_colab_cell(notebook_path)
-    notebook_data['cells'].insert(1, colab_cell)
-    
-    # Save modified notebook
-    with open(notebook_path, 'w', encoding='utf-8') as f:
-        json.dump(notebook_data, f, indent=2, ensure_ascii=False)
-    
-    print(f"  ✓ Added Colab link")
-    return True, "Added Colab link"
+    notebook_data['cells'].insert(1, create_colab_cell(notebook_path))
+    return ["added Colab link"]
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Add Colab links to notebooks missing them")
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
+    add_arguments(parser)
     args = parser.parse_args()
     
-    notebooks = list(Path('notebooks').glob('**/*.ipynb'))
+    notebooks = find_notebooks([Path('notebooks')])
     print(f"Found {len(notebooks)} notebooks to check:")
     
-    modified_count = 0
-    
-    for notebook in sorted(notebooks):
-        try:
-            modified, reason = add_colab_link(notebook, dry_run=args.dry_run)
-            if modified:
-                modified_count += 1
-            elif reason != "Already has Colab link":
-                print(f"Skipped {notebook.name}: {reason}")
-            print()
-        except Exception as e:
-            print(f"  ✗ Error processing {notebook.name}: {e}")
-            print()
-    
-    print(f"Summary: {modified_count} notebooks {'would be ' if args.dry_run else ''}modified")
+    results = transform_notebooks(notebooks, [('colab', {})], args.jobs, args.dry_run, 'colab')
+    report(results, args.dry_run)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -11,14 +11,16 @@ Features:
 - Adds Colab link in the second cell
 - Backs up original notebook before making changes
 - Dry-run mode to preview changes without modifying files
+
+The edit is the "metadata" pass of notebook_transforms.py, which reads and
+writes each notebook once and can combine it with the other passes.
 """
 
-import json
 import argparse
-import shutil
 from pathlib import Path
 from datetime import datetime
-import re
+
+from notebook_transforms import add_arguments, find_notebooks, report, transform_notebooks
 
 def has_quarto_metadata(notebook_data):
     """Check if notebook already has Quarto metadata in first cell."""
@@ -119,21 +121,13 @@ def infer_metadata_from_filename(notebook_path):
     
     return title, description, tags
 
-def add_notebook_metadata(notebook_path, title=None, description=None, tags=None, dry_run=False):
-    """Add Quarto metadata and Colab link to notebook."""
-    notebook_path = Path(notebook_path)
-    
-    if not notebook_path.exists():
-        raise FileNotFoundError(f"Notebook not found: {notebook_path}")
-    
-    # Load notebook
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        notebook_data = json.load(f)
-    
-    # Check if already has metadata
+def metadata_pass(notebook_data, notebook_path, title=None, description=None, tags=None, author="Nipun Batra"):
+    """Add a Quarto metadata cell and a Colab link where the metadata is missing."""
     if has_quarto_metadata(notebook_data):
-        print(f"✓ {notebook_path.name} already has Quarto metadata")
-        return False
+        return []
+    
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',')]
     
     # Infer metadata if not provided
     if not title or not description or not tags:
@@ -142,34 +136,25 @@ def add_notebook_metadata(notebook_path, title=None, description=None, tags=None
         description = description or inferred_desc
         tags = tags or inferred_tags
     
-    print(f"Adding metadata to {notebook_path.name}:")
-    print(f"  Title: {title}")
-    print(f"  Description: {description}")
-    print(f"  Tags: {tags}")
-    
-    if dry_run:
-        print("  [DRY RUN - no changes made]")
-        return True
-    
-    # Backup original
-    backup_path = notebook_path.with_suffix('.ipynb.backup')
-    shutil.copy2(notebook_path, backup_path)
-    print(f"  Backup created: {backup_path.name}")
-    
-    # Create new cells
-    metadata_cell = create_metadata_cell(title, description, tags)
-    colab_cell = create_colab_cell(notebook_path)
-    
     # Insert at beginning
-    notebook_data['cells'].insert(0, colab_cell)
-    notebook_data['cells'].insert(0, metadata_cell)
+    notebook_data.setdefault('cells', [])[:0] = [
+        create_metadata_cell(title, description, tags, author),
+        create_colab_cell(notebook_path),
+    ]
+    return [f"added metadata (title: {title}; tags: {', '.join(tags)})", "added Colab link"]
+
+def add_notebook_metadata(notebook_path, title=None, description=None, tags=None, dry_run=False,
+                          author="Nipun Batra"):
+    """Add Quarto metadata and Colab link to notebook."""
+    notebook_path = Path(notebook_path)
     
-    # Save modified notebook
-    with open(notebook_path, 'w', encoding='utf-8') as f:
-        json.dump(notebook_data, f, indent=2, ensure_ascii=False)
+    if not notebook_path.exists():
+        raise FileNotFoundError(f"Notebook not found: {notebook_path}")
     
-    print(f"  ✓ Added metadata and Colab link")
-    return True
+    options = {'title': title, 'description': description, 'tags': tags, 'author': author}
+    results = transform_notebooks([notebook_path], [('metadata', options)], dry_run=dry_run,
+                                  backup='metadata')
+    return report(results, dry_run)['changed'] > 0
 
 def main():
     parser = argparse.ArgumentParser(
@@ -198,6 +183,7 @@ Examples:
     parser.add_argument('--author', default='Nipun Batra', help='Author name')
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
     parser.add_argument('--batch', action='store_true', help='Process all notebooks in directory')
+    add_arguments(parser)
     
     args = parser.parse_args()
     
@@ -210,28 +196,19 @@ Examples:
             title=args.title, 
             description=args.description, 
             tags=args.tags.split(',') if args.tags else None,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            author=args.author
         )
     elif path.is_dir() and args.batch:
-        # Batch process directory
-        notebooks = list(path.glob('**/*.ipynb'))
+        # Batch process directory, metadata inferred per notebook
+        notebooks = find_notebooks([path])
         if not notebooks:
             print(f"No notebooks found in {path}")
             return
         
         print(f"Found {len(notebooks)} notebooks to process:")
-        modified_count = 0
-        
-        for notebook in sorted(notebooks):
-            try:
-                if add_notebook_metadata(notebook, dry_run=args.dry_run):
-                    modified_count += 1
-                print()
-            except Exception as e:
-                print(f"  ✗ Error processing {notebook.name}: {e}")
-                print()
-        
-        print(f"Summary: {modified_count} notebooks modified")
+        passes = [('metadata', {'author': args.author})]
+        report(transform_notebooks(notebooks, passes, args.jobs, args.dry_run, 'metadata'), args.dry_run)
     else:
         print("Error: Path must be a notebook file or use --batch for directories")
 
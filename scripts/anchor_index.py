@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Index of the anchors of every page, for checking "page#fragment" links.
+
+Quarto renders .qmd files and notebooks with pandoc, which gives every
+heading an identifier (the auto_identifiers extension):
+
+- the heading text without formatting, links reduced to their text,
+  footnotes dropped
+- lowercased, keeping only letters, digits, "_", "-" and "."
+- words joined with "-", everything before the first letter dropped
+  ("section" if nothing is left)
+- a repeated identifier gets "-1", "-2", ... appended
+
+"## 1. Fitting *the* [Model](x.qmd) {#fit}" has the explicit id "fit"
+instead. Explicit ids also come from attributes on spans, divs and images
+([text]{#id}, ::: {#id}, ![..](..){#fig-x}), HTML id attributes, and code
+cell labels ("#| label: fig-x").
+
+file_facts.py stores the anchors of each page in the fact cache, so they
+are computed once per file version; AnchorIndex holds them as sets for
+check_links.py, one lookup per link.
+
+Usage:
+    python scripts/anchor_index.py FILE [FILE ...]     # anchors of pages
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Set
+
+ATX_HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?[ \t]*$')
+SETEXT_UNDERLINE_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+# Lines that cannot be the text of a setext heading
+NOT_PARAGRAPH_PATTERN = re.compile(r'^\s*(?:[-*+>|<]|\d+[.)]\s|:::|#|`{3,}|~{3,}|\$\$|$)')
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+TRAILING_ATTRIBUTES_PATTERN = re.compile(r'\s*\{([^{}]*)\}\s*$')
+ATTRIBUTES_PATTERN = re.compile(r'\{([^{}]*)\}')
+ID_PATTERN = re.compile(r'(?:^|\s)#([A-Za-z_][\w:.\-]*)')
+HTML_ID_PATTERN = re.compile(r'<[A-Za-z][^>]*?\s(?:id|name)\s*=\s*["\']([^"\']+)["\']')
+CODE_LABEL_PATTERN = re.compile(r'^\s*#\|\s*label:\s*["\']?([^\s"\']+)', re.MULTILINE)
+CODE_SPAN_PATTERN = re.compile(r'(`+)(.+?)\1')
+
+# Inline markup reduced to its text, in order
+PLAIN_REPLACEMENTS = [
+    (re.compile(r'\[\^[^\]]*\]'), ''),                          # footnote references
+    (re.compile(r'!?\[([^\]]*)\]\([^)]*\)'), r'\1'),            # links and images
+    (re.compile(r'\[([^\]]*)\]\{[^}]*\}'), r'\1'),               # spans
+    (re.compile(r'<[^>]+>'), ''),                               # raw HTML
+    (re.compile(r'(?<!\w)(_{1,3})(?=\S)(.+?)(?<=\S)\1(?!\w)'), r'\2'),   # _emphasis_
+    (re.compile(r'\\([!-/:-@\[-`{-~])'), r'\1'),                 # backslash escapes
+]
+
+
+def _plain(text: str) -> str:
+    """Heading text as pandoc's stringify sees it (code spans kept verbatim)."""
+    parts = []
+    for index, part in enumerate(CODE_SPAN_PATTERN.split(text)):
+        # split() yields text, fence, code, text, fence, code, ...
+        if index % 3 == 0:
+            for pattern, replacement in PLAIN_REPLACEMENTS:
+                part = pattern.sub(replacement, part)
+            parts.append(part)
+        elif index % 3 == 2:
+            parts.append(part)
+    return ''.join(parts)
+
+
+def slugify(text: str) -> str:
+    """Pandoc's automatic identifier for a heading with this text."""
+    kept = ''.join(ch for ch in _plain(text).lower() if ch.isalnum() or ch.isspace() or ch in '_-.')
+    slug = '-'.join(kept.split())
+    first_letter = next((i for i, ch in enumerate(slug) if ch.isalpha()), len(slug))
+    return slug[first_letter:] or 'section'
+
+
+class AnchorCollector:
+    """The anchors of one page, fed block by block (a notebook's cells)."""
+
+    def __init__(self):
+        self.anchors: List[str] = []
+        self.seen: Set[str] = set()
+
+    def _add(self, anchor: str):
+        if anchor not in self.seen:
+            self.seen.add(anchor)
+            self.anchors.append(anchor)
+
+    def _heading(self, text: str):
+        attributes = TRAILING_ATTRIBUTES_PATTERN.search(text)
+        if attributes:
+            explicit = ID_PATTERN.search(attributes.group(1))
+            if explicit:
+                self._add(explicit.group(1))
+                return
+            text = text[:attributes.start()]
+        slug = base = slugify(text)
+        number = 0
+        while slug in self.seen:
+            number += 1
+            slug = f"{base}-{number}"
+        self._add(slug)
+
+    def feed_markdown(self, text: str):
+        fence = None
+        previous = ''
+        for line in text.split('\n'):
+            if fence:
+                if line.strip().startswith(fence):
+                    fence = None
+                else:
+                    self.feed_code(line)
+                previous = ''
+                continue
+            opening = FENCE_PATTERN.match(line)
+            if opening:
+                fence = opening.group(1)
+                previous = ''
+                continue
+
+            heading = ATX_HEADING_PATTERN.match(line)
+            if heading:
+                self._heading(re.sub(r'[ \t]+#+$', '', heading.group(2) or ''))
+                previous = ''
+                continue
+            if SETEXT_UNDERLINE_PATTERN.match(line) and previous:
+                self._heading(previous.strip())
+                previous = ''
+                continue
+
+            code_free = CODE_SPAN_PATTERN.sub('', line)
+            for attributes in ATTRIBUTES_PATTERN.findall(code_free):
+                for anchor in ID_PATTERN.findall(attributes):
+                    self._add(anchor)
+            for anchor in HTML_ID_PATTERN.findall(code_free):
+                self._add(anchor)
+            previous = '' if NOT_PARAGRAPH_PATTERN.match(line) else line
+
+    def feed_code(self, text: str):
+        for label in CODE_LABEL_PATTERN.findall(text):
+            self._add(label)
+
+
+def _strip_front_matter(text: str) -> str:
+    """Blank out a leading YAML block, keeping the line count."""
+    if not text.startswith('---'):
+        return text
+    lines = text.split('\n')
+    for index in range(1, len(lines)):
+        if lines[index].strip() in ('---', '...'):
+            return '\n' * index + '\n'.join(lines[index + 1:])
+    return text
+
+
+def markdown_anchors(text: str) -> List[str]:
+    """Anchors of a .qmd/.md page."""
+    collector = AnchorCollector()
+    collector.feed_markdown(_strip_front_matter(text))
+    return collector.anchors
+
+
+def notebook_anchors(cells: Iterable[dict]) -> List[str]:
+    """Anchors of a notebook page, from its cells as stored in the .ipynb."""
+    collector = AnchorCollector()
+    for cell in cells:
+        source = cell.get('source', [])
+        text = ''.join(source) if isinstance(source, list) else source
+        if cell.get('cell_type') == 'markdown':
+            collector.feed_markdown(text)
+        elif cell.get('cell_type') == 'code':
+            collector.feed_code(text)
+    return collector.anchors
+
+
+class AnchorIndex:
+    """Page (root-relative path of the source) -> its anchors."""
+
+    def __init__(self):
+        self.pages: Dict[str, Set[str]] = {}
+
+    def add(self, page: str, anchors: Iterable[str]):
+        self.pages[page] = set(anchors)
+
+    def merge(self, other: 'AnchorIndex'):
+        self.pages.update(other.pages)
+
+    def __contains__(self, page: str) -> bool:
+        return page in self.pages
+
+    def has(self, page: str, anchor: str) -> bool:
+        return anchor in self.pages.get(page, ())
+
+    def anchors(self, page: str) -> Set[str]:
+        return self.pages.get(page, set())
+
+
+def page_anchors(path: str) -> Optional[List[str]]:
+    """Anchors of the page at ``path``, None if it is not a page."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        text = f.read()
+    if path.endswith('.ipynb'):
+        return notebook_anchors(json.loads(text).get('cells', []))
+    if path.endswith(('.qmd', '.md')):
+        return markdown_anchors(text)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the anchors of pages")
+    parser.add_argument('files', nargs='+', help='.qmd, .md or .ipynb files')
+    args = parser.parse_args()
+
+    status = 0
+    for path in args.files:
+        try:
+            anchors = page_anchors(path)
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            status = 1
+            continue
+        if anchors is None:
+            print(f"⚠️  {path}: not a page")
+            continue
+        print(f"📄 {path}: {len(anchors)} anchors")
+        for anchor in anchors:
+            print(f"  #{anchor}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+In-memory index of the asset files, built once per run.
+
+The validators and the content audit check referenced figures and PDFs by
+probing candidate paths: with and without an extension, next to the deck,
+in figures/, diagrams/, imgs/ ... AssetIndex walks the asset trees once
+(every */assets, shared/ and images/) and answers those probes from sets
+and dicts: by normalized path, and by path without extension. Paths whose
+directory is not indexed fall back to the memoized stat of
+repo_scanner.path_is_file(), so one resolver works for every reference.
+
+For a missing asset the index suggests the closest existing ones: the same
+name with another extension, otherwise the most similar paths (difflib).
+
+Usage:
+    python scripts/asset_index.py                   # what is indexed
+    python scripts/asset_index.py PATH [PATH ...]   # resolve paths, with suggestions
+"""
+
+import argparse
+import difflib
+import functools
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from repo_scanner import PRUNE_DIRS, path_exists, path_is_file
+from slide_deps import REPO_ROOT
+
+ASSET_ROOTS = ('*/assets', 'shared', 'images')
+GRAPHICS_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.svg', '.eps')
+
+
+class AssetIndex:
+    def __init__(self, root: Path = REPO_ROOT, patterns: Sequence[str] = ASSET_ROOTS):
+        self.root = Path(root).resolve()
+        self.files: Set[str] = set()    # root-relative, normalized
+        self.dirs: Set[str] = set()     # only the directories that were walked
+        self.by_stem: Dict[str, List[str]] = defaultdict(list)   # path without extension -> files
+        self.by_name: Dict[str, List[str]] = defaultdict(list)   # file name -> files
+        for pattern in patterns:
+            for top in sorted(self.root.glob(pattern)):
+                if top.is_dir() and not top.is_symlink() and top.relative_to(self.root).parts[0] not in PRUNE_DIRS:
+                    self._walk(top)
+
+    def _walk(self, top: Path):
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS)
+            directory = os.path.relpath(dirpath, self.root)
+            self.dirs.add(directory)
+            for name in filenames:
+                path = os.path.join(directory, name)
+                self.files.add(path)
+                self.by_stem[os.path.splitext(path)[0]].append(path)
+                self.by_name[name].append(path)
+
+    def _relative(self, path) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root)
+
+    def _key(self, path) -> Optional[str]:
+        """Root-relative key of ``path``, or None if its directory is not indexed."""
+        relative = self._relative(path)
+        return relative if os.path.dirname(relative) in self.dirs else None
+
+    def is_file(self, path) -> bool:
+        key = self._key(path)
+        return path_is_file(path) if key is None else key in self.files
+
+    def exists(self, path) -> bool:
+        key = self._key(path)
+        if key is None:
+            return path_exists(path)
+        return key in self.files or key in self.dirs
+
+    def first(self, candidates: Iterable) -> Optional[Path]:
+        """The first of ``candidates`` that is a file."""
+        for candidate in candidates:
+            if self.is_file(candidate):
+                return Path(candidate)
+        return None
+
+    def resolve(self, path, extensions: Sequence[str] = GRAPHICS_EXTENSIONS) -> Optional[Path]:
+        """``path`` itself, or ``path`` with the first of ``extensions`` that exists."""
+        return self.first([str(path)] + [f"{path}{ext}" for ext in extensions])
+
+    def with_stem(self, path) -> List[str]:
+        """Indexed files named like ``path`` with any extension (root-relative)."""
+        return sorted(self.by_stem.get(os.path.splitext(self._relative(path))[0], []))
+
+    def suggest(self, path, relative_to=None, n: int = 3) -> List[str]:
+        """Up to ``n`` existing assets closest to the missing ``path``, relative
+        to the directory ``relative_to`` (root-relative if not given)."""
+        matches = self.with_stem(path)
+        if not matches:
+            # Files with a similar name, the ones in the most similar directory first
+            relative = self._relative(path)
+            name = os.path.basename(relative)
+            names = [name] if name in self.by_name else \
+                difflib.get_close_matches(name, self.by_name, n=n * 3, cutoff=0.75)
+            candidates = sorted(p for name in names for p in self.by_name[name])
+            matches = sorted(candidates, key=lambda p: -difflib.SequenceMatcher(None, relative, p).ratio())
+        if relative_to is not None:
+            base = os.path.abspath(relative_to)
+            return [os.path.relpath(self.root / match, base) for match in matches[:n]]
+        return matches[:n]
+
+
+@functools.lru_cache(maxsize=None)
+def asset_index(root: Path = REPO_ROOT) -> AssetIndex:
+    """The index of ``root``, built on first use."""
+    return AssetIndex(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve asset paths against the asset index")
+    parser.add_argument('paths', nargs='*', help='Paths to resolve (relative to the current directory)')
+    args = parser.parse_args()
+
+    index = asset_index()
+    if not args.paths:
+        print(f"🗂️  {len(index.files)} files in {len(index.dirs)} directories indexed under "
+              f"{', '.join(ASSET_ROOTS)}")
+        return 0
+
+    missing = 0
+    for path in args.paths:
+        found = index.resolve(path)
+        if found:
+            print(f"✅ {path} → {found}")
+            continue
+        missing += 1
+        suggestions = index.suggest(path, relative_to='.')
+        hint = f" (did you mean {', '.join(suggestions)}?)" if suggestions else ''
+        print(f"❌ {path} not found{hint}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
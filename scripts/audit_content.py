@@ -9,15 +9,199 @@ This script performs thorough checks for:
 - Content accuracy and completeness
 - Formatting consistency
 - Reference validity
+
+Files are read through one pass of scripts/latex_tokens.py; every check is a
+visitor over that token stream, so comments, verbatim blocks and escaped
+braces are never mistaken for content.
 """
 
 import re
 import subprocess
-from pathlib import Path
 from collections import defaultdict
 import json
 
-class ContentAuditor:
+from asset_index import asset_index
+from latex_tokens import BEGIN, BGROUP, COMMAND, EGROUP, MATH, NEWLINE, TEXT, LatexTokenizer, tokenize
+from repo_scanner import Checker, RepoScanner
+from term_matcher import TermMatcher
+from tikz_cache import named_externs
+
+SECTION_COMMANDS = ('section', 'subsection', 'subsubsection')
+# Commands whose arguments the reference and structure checks need
+COLLECTED_COMMANDS = SECTION_COMMANDS + ('documentclass', 'cite', 'bibitem', 'includegraphics', 'graphicspath',
+                                         'input', 'include', 'usepackage', 'tikzsetnextfilename')
+LETTER = re.compile(r'[a-zA-Z]')
+# Common commands that need packages (matched as prefixes of the command)
+PACKAGE_COMMANDS = {
+    'amsmath': ['\\align', '\\equation', '\\matrix'],
+    'amssymb': ['\\mathbb', '\\mathfrak'],
+    'graphicx': ['\\includegraphics'],
+    'hyperref': ['\\href', '\\url'],
+    'tikz': ['\\begin{tikzpicture}'],
+    'booktabs': ['\\toprule', '\\midrule', '\\bottomrule'],
+}
+
+
+class TokenCheck:
+    """A check over the tokens of one file; reports once the file is read."""
+
+    def token(self, token):
+        raise NotImplementedError
+
+    def finish(self, auditor, file_path):
+        pass
+
+
+class CommandCollector(TokenCheck):
+    """Arguments of the commands in COLLECTED_COMMANDS, for the reference checks."""
+
+    def __init__(self):
+        self.arguments = defaultdict(list)
+
+    def token(self, token):
+        if token.kind == COMMAND and token.name in COLLECTED_COMMANDS and token.arg is not None:
+            if token.name == 'usepackage':
+                self.arguments['usepackage'].extend(name.strip() for name in token.arg.split(','))
+            else:
+                self.arguments[token.name].append(token.arg.strip())
+
+
+class NotationCheck(TokenCheck):
+    """Counts commands like \\mathbf{x} that have a macro in the notation conventions."""
+
+    def __init__(self, notation_patterns):
+        self.patterns = [(category, pattern, re.compile(pattern))
+                         for category, patterns in notation_patterns.items()
+                         for pattern, _ in patterns]
+        self.counts = defaultdict(int)
+
+    def token(self, token):
+        if token.kind != COMMAND or token.arg is None:
+            return
+        source = f"{token.text}{{{token.arg}}}"
+        for category, pattern, compiled in self.patterns:
+            if compiled.match(source):
+                self.counts[category, pattern] += 1
+
+    def finish(self, auditor, file_path):
+        for category, pattern, _ in self.patterns:
+            if self.counts[category, pattern]:
+                auditor.issues[file_path].append(
+                    f"Inconsistent notation ({category}): Found {self.counts[category, pattern]} instances of {pattern}"
+                )
+
+
+class MathSpacingCheck(TokenCheck):
+    """$...$ and $$...$$ glued to the surrounding words."""
+
+    def __init__(self):
+        self.previous = None
+        self.letters = False          # the open math contains a letter
+        self.glued_before = False     # the open $ directly follows a letter
+        self.closed = None            # closing delimiter waiting for the next token
+        self.found = set()
+
+    def _after_letter(self, token) -> bool:
+        previous = self.previous
+        return (previous is not None and previous.line == token.line and previous.kind != NEWLINE
+                and bool(LETTER.fullmatch(previous.text[-1:])))
+
+    def token(self, token):
+        if self.closed is not None:
+            if token.kind == NEWLINE and self.closed.text == '$$':
+                return
+            if token.kind == TEXT and LETTER.match(token.text):
+                self.found.add('after' if self.closed.text == '$' else 'display after')
+            self.closed = None
+        if token.kind == MATH and token.text in ('$', '$$'):
+            if token.opens:
+                self.letters, self.glued_before = False, self._after_letter(token)
+                if token.text == '$$' and self.glued_before:
+                    self.found.add('display before')
+            elif self.letters:
+                if token.text == '$' and self.glued_before:
+                    self.found.add('before')
+                self.closed = token
+        elif token.math in ('$', '$$') and token.kind != NEWLINE and LETTER.search(token.text):
+            self.letters = True
+        self.previous = token
+
+    def finish(self, auditor, file_path):
+        if 'after' in self.found:
+            auditor.issues[file_path].append("Math formatting issue: Missing space after inline math")
+        if 'before' in self.found:
+            auditor.issues[file_path].append("Math formatting issue: Missing space before inline math")
+        if 'display after' in self.found:
+            auditor.warnings[file_path].append("Display math followed immediately by text (missing newline)")
+        if 'display before' in self.found:
+            auditor.warnings[file_path].append("Display math preceded immediately by text (missing newline)")
+
+
+class TermCheck(TokenCheck):
+    """Discouraged spellings in prose and commands that need a package, found
+    with the auditor's term automaton in one pass; math and verbatim are not prose."""
+
+    def __init__(self, auditor, latex: bool):
+        self.matcher = auditor.term_matcher
+        self.corrections = auditor.corrections
+        self.latex = latex
+        self.included = set()
+        self.found = defaultdict(list)    # term -> [(line, column)]
+
+    def token(self, token):
+        if token.kind == TEXT and token.math is None:
+            for start, _, (kind, term) in self.matcher.finditer(token.text):
+                if kind == 'spelling':
+                    self.found[term].append((token.line, token.col + start + 1))
+        elif self.latex and token.kind in (COMMAND, BEGIN):
+            if token.name == 'usepackage' and token.arg:
+                self.included.update(name.strip() for name in token.arg.split(','))
+            for start, _, (kind, term) in self.matcher.finditer(token.text):
+                # Commands match as prefixes and case-sensitively
+                if kind == 'package' and start == 0 and token.text.startswith(term):
+                    self.found[term].append((token.line, token.col + 1))
+
+    def finish(self, auditor, file_path):
+        for incorrect, correct in self.corrections.items():
+            if self.found[incorrect]:
+                auditor.issues[file_path].append(
+                    f"Spelling/terminology: '{incorrect}' should be '{correct}' "
+                    f"({len(self.found[incorrect])} instances, {_locations(self.found[incorrect])})"
+                )
+        for package, commands in PACKAGE_COMMANDS.items():
+            if package in self.included:
+                continue
+            for command in commands:
+                if self.found[command]:
+                    auditor.warnings[file_path].append(
+                        f"May need \\usepackage{{{package}}} for {command} ({_locations(self.found[command])})")
+
+
+def _locations(found, limit=5) -> str:
+    shown = ', '.join(f"{line}:{column}" for line, column in found[:limit])
+    return f"line {shown}{', ...' if len(found) > limit else ''}"
+
+
+class BraceCheck(TokenCheck):
+    """Unbalanced { and } outside comments and verbatim."""
+
+    def __init__(self):
+        self.depth = 0
+
+    def token(self, token):
+        if token.kind == BGROUP:
+            self.depth += 1
+        elif token.kind == EGROUP:
+            self.depth -= 1
+
+    def finish(self, auditor, file_path):
+        if self.depth != 0:
+            auditor.issues[file_path].append(f"Unmatched braces: {self.depth} difference")
+
+
+class ContentAuditor(Checker):
+    suffixes = ('.tex', '.latex', '.md')
+
     def __init__(self):
         self.issues = defaultdict(list)
         self.warnings = defaultdict(list)
@@ -36,11 +220,8 @@ class ContentAuditor:
             'inconsistent_sets': [
                 (r'\\mathbb\{([^}]+)\}', r'\\s\1'),  # Should use \s prefix for sets
             ],
-            'math_mode_issues': [
-                (r'\$([^$]*[a-zA-Z][^$]*)\$(?=[a-zA-Z])', 'Missing space after inline math'),
-                (r'(?<=[a-zA-Z])\$([^$]*[a-zA-Z][^$]*)\$', 'Missing space before inline math'),
-            ]
         }
+        # Math spacing is checked by MathSpacingCheck
         
         # Common spelling/grammar issues in ML content
         self.common_errors = {
@@ -54,6 +235,18 @@ class ContentAuditor:
             'machine learning': ['machine-learning', 'machinelearning'],
         }
         
+        self.corrections = {incorrect: correct for correct, incorrect_list in self.common_errors.items()
+                            for incorrect in incorrect_list}
+        
+        # One automaton for every spelling variant and package command
+        self.term_matcher = TermMatcher(ignore_case=True)
+        for incorrect in self.corrections:
+            self.term_matcher.add(incorrect, ('spelling', incorrect))
+        for commands in PACKAGE_COMMANDS.values():
+            for command in commands:
+                self.term_matcher.add(command, ('package', command))
+        self.term_matcher.build()
+        
         # LaTeX commands that should be consistent
         self.latex_consistency = {
             'argmin': r'\\argmin',
@@ -62,108 +255,43 @@ class ContentAuditor:
             'subject to': r'\\text{subject to}',
         }
 
-    def audit_file(self, file_path):
+    def audit_file(self, file_path, content=None):
         """Audit a single file for issues."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            self.issues[file_path].append(f"Cannot read file: {e}")
-            return
+        if content is None:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                self.issues[file_path].append(f"Cannot read file: {e}")
+                return
         
         self.stats['files_checked'] += 1
-        
-        # Check mathematical notation
-        self._check_math_notation(file_path, content)
-        
-        # Check spelling and common errors
-        self._check_spelling(file_path, content)
+        is_latex = file_path.suffix == '.tex'
+        
+        # All token checks share one pass over the file
+        tokenizer = LatexTokenizer(comments=file_path.suffix != '.md')
+        commands = CommandCollector()
+        checks = [NotationCheck(self.notation_patterns), MathSpacingCheck(),
+                  TermCheck(self, latex=is_latex), commands]
+        if is_latex:
+            checks.append(BraceCheck())
+        for token in tokenize(content, tokenizer=tokenizer):
+            for check in checks:
+                check.token(token)
+        for check in checks:
+            check.finish(self, file_path)
         
         # Check LaTeX specific issues
-        if file_path.suffix == '.tex':
-            self._check_latex_issues(file_path, content)
+        if is_latex:
+            self.issues[file_path].extend(message for _, message in tokenizer.problems)
         
         # Check content structure
-        self._check_content_structure(file_path, content)
+        self._check_content_structure(file_path, content, commands)
         
         # Check references and citations
-        self._check_references(file_path, content)
-
-    def _check_math_notation(self, file_path, content):
-        """Check mathematical notation consistency."""
-        for category, patterns in self.notation_patterns.items():
-            for pattern, suggestion in patterns:
-                if isinstance(suggestion, str) and suggestion.startswith('\\'):
-                    # Pattern replacement suggestion
-                    matches = re.findall(pattern, content)
-                    if matches:
-                        self.issues[file_path].append(
-                            f"Inconsistent notation ({category}): Found {len(matches)} instances of {pattern}"
-                        )
-                else:
-                    # Issue description
-                    if re.search(pattern, content):
-                        self.issues[file_path].append(f"Math formatting issue: {suggestion}")
-        
-        # Check for common math notation errors
-        if re.search(r'\$\$[^$]*[a-zA-Z][^$]*\$\$\n*[a-zA-Z]', content):
-            self.warnings[file_path].append("Display math followed immediately by text (missing newline)")
-        
-        if re.search(r'[a-zA-Z]\$\$', content):
-            self.warnings[file_path].append("Display math preceded immediately by text (missing newline)")
-
-    def _check_spelling(self, file_path, content):
-        """Check for common spelling and terminology errors."""
-        for correct, incorrect_list in self.common_errors.items():
-            for incorrect in incorrect_list:
-                # Case-insensitive search
-                pattern = re.compile(re.escape(incorrect), re.IGNORECASE)
-                matches = pattern.findall(content)
-                if matches:
-                    self.issues[file_path].append(
-                        f"Spelling/terminology: '{incorrect}' should be '{correct}' ({len(matches)} instances)"
-                    )
-
-    def _check_latex_issues(self, file_path, content):
-        """Check LaTeX-specific issues."""
-        # Check for missing packages
-        packages_used = set()
-        packages_included = set()
-        
-        # Find package inclusions
-        for match in re.finditer(r'\\usepackage(?:\[[^\]]*\])?\{([^}]+)\}', content):
-            packages_included.update(match.group(1).split(','))
-        
-        # Check for common commands that need packages
-        package_commands = {
-            'amsmath': [r'\\align', r'\\equation', r'\\matrix'],
-            'amssymb': [r'\\mathbb', r'\\mathfrak'],
-            'graphicx': [r'\\includegraphics'],
-            'hyperref': [r'\\href', r'\\url'],
-            'tikz': [r'\\begin\{tikzpicture\}'],
-            'booktabs': [r'\\toprule', r'\\midrule', r'\\bottomrule'],
-        }
-        
-        for package, commands in package_commands.items():
-            for cmd_pattern in commands:
-                if re.search(cmd_pattern, content) and package not in packages_included:
-                    self.warnings[file_path].append(f"May need \\usepackage{{{package}}} for {cmd_pattern}")
-        
-        # Check for unmatched braces/environments
-        brace_count = content.count('{') - content.count('}')
-        if brace_count != 0:
-            self.issues[file_path].append(f"Unmatched braces: {brace_count} difference")
-        
-        # Check for common LaTeX errors
-        if re.search(r'\\begin\{[^}]+\}.*?\\end\{[^}]+\}', content, re.DOTALL):
-            # Find mismatched environments
-            begin_envs = re.findall(r'\\begin\{([^}]+)\}', content)
-            end_envs = re.findall(r'\\end\{([^}]+)\}', content)
-            
-            if len(begin_envs) != len(end_envs):
-                self.issues[file_path].append("Mismatched \\begin and \\end environments")
+        self._check_references(file_path, commands)
 
-    def _check_content_structure(self, file_path, content):
+    def _check_content_structure(self, file_path, content, commands):
         """Check content structure and organization."""
         lines = content.split('\n')
         
@@ -184,24 +312,17 @@ class ContentAuditor:
         
         # Check for proper section structure in LaTeX
         if file_path.suffix == '.tex':
-            sections = re.findall(r'\\(sub)*section\{([^}]+)\}', content)
-            if len(sections) == 0 and '\\documentclass' in content:
+            sections = sum(len(commands.arguments[name]) for name in SECTION_COMMANDS)
+            if sections == 0 and commands.arguments['documentclass']:
                 self.warnings[file_path].append("No sections found in document")
 
-    def _check_references(self, file_path, content):
+    def _check_references(self, file_path, commands):
         """Check references and citations."""
-        # Find citations
-        citations = re.findall(r'\\cite\{([^}]+)\}', content)
-        
-        # Find bibliography entries  
-        bib_entries = re.findall(r'\\bibitem\{([^}]+)\}', content)
-        
-        # Check for uncited references
         cited = set()
-        for cite_list in citations:
-            cited.update(cite_list.split(','))
+        for cite_list in commands.arguments['cite']:
+            cited.update(key.strip() for key in cite_list.split(','))
         
-        bib_keys = set(bib_entries)
+        bib_keys = set(commands.arguments['bibitem'])
         
         uncited = bib_keys - cited
         if uncited:
@@ -212,18 +333,17 @@ class ContentAuditor:
             self.issues[file_path].append(f"Missing bibliography entries: {missing}")
         
         # Check for missing file references
-        self._check_file_references(file_path, content)
+        self._check_file_references(file_path, commands)
 
-    def _check_file_references(self, file_path, content):
+    def _check_file_references(self, file_path, commands):
         """Check for missing figure files, graphics, etc."""
-        import os
-        
         # Get directory of the current file
         base_dir = file_path.parent
+        # Candidate paths are looked up in the asset index, not stat'ed one by one
+        assets = asset_index()
         
         # Find includegraphics references
-        graphics_matches = re.findall(r'\\includegraphics(?:\[[^\]]*\])?\{([^}]+)\}', content)
-        for graphic_file in graphics_matches:
+        for graphic_file in commands.arguments['includegraphics']:
             # Handle different possible paths
             possible_paths = [
                 base_dir / graphic_file,
@@ -247,19 +367,20 @@ class ContentAuditor:
                     ])
             
             # Check if any path exists
-            if not any(path.exists() for path in possible_paths):
-                self.issues[file_path].append(f"Missing figure file: {graphic_file}")
+            if not assets.first(possible_paths):
+                suggestions = assets.suggest(base_dir / graphic_file, relative_to=base_dir)
+                hint = f" (did you mean {', '.join(suggestions)}?)" if suggestions else ''
+                self.issues[file_path].append(f"Missing figure file: {graphic_file}{hint}")
         
         # Find graphicspath specifications
-        graphicspaths = re.findall(r'\\graphicspath\{\s*\{([^}]+)\}\s*\}', content)
-        for graphics_path in graphicspaths:
-            full_path = base_dir / graphics_path
-            if not full_path.exists():
-                self.warnings[file_path].append(f"Graphics path does not exist: {graphics_path}")
+        for paths in commands.arguments['graphicspath']:
+            for graphics_path in re.findall(r'\{([^{}]+)\}', paths):
+                full_path = base_dir / graphics_path
+                if not assets.exists(full_path):
+                    self.warnings[file_path].append(f"Graphics path does not exist: {graphics_path}")
         
         # Find input/include file references
-        input_matches = re.findall(r'\\(?:input|include)\{([^}]+)\}', content)
-        for input_file in input_matches:
+        for input_file in commands.arguments['input'] + commands.arguments['include']:
             # Skip if it looks like a package
             if not input_file.endswith('.tex') and '/' not in input_file:
                 continue
@@ -269,54 +390,55 @@ class ContentAuditor:
                 base_dir / f"{input_file}.tex",
             ]
             
-            if not any(path.exists() for path in possible_paths):
+            if not assets.first(possible_paths):
                 self.issues[file_path].append(f"Missing input file: {input_file}")
                 
         # Find usepackage with file paths (local packages)
-        package_matches = re.findall(r'\\usepackage\{([^}]*[./][^}]*)\}', content)
-        for package_file in package_matches:
+        for package_file in commands.arguments['usepackage']:
+            if '.' not in package_file and '/' not in package_file:
+                continue
             possible_paths = [
                 base_dir / package_file,
                 base_dir / f"{package_file}.sty",
             ]
             
-            if not any(path.exists() for path in possible_paths):
+            if not assets.first(possible_paths):
                 self.warnings[file_path].append(f"Local package file not found: {package_file}")
                 
-        # Check for TikZ external files
-        tikz_matches = re.findall(r'\\tikzsetnextfilename\{([^}]+)\}', content)
-        for tikz_file in tikz_matches:
+        # Check for TikZ external files, either next to the deck (TikZ external
+        # library) or in the shared picture cache (.cache/tikz/<name>.<md5>-<md5>.pdf)
+        for tikz_file in commands.arguments['tikzsetnextfilename']:
             tikz_path = base_dir / f"{tikz_file}.pdf"
-            if not tikz_path.exists():
+            if not assets.is_file(tikz_path) and not named_externs(tikz_file):
                 self.warnings[file_path].append(f"TikZ external file missing: {tikz_file}.pdf")
 
-    def audit_all_content(self):
-        """Audit all slides and tutorials."""
-        print("🔍 Starting comprehensive content audit...\n")
-        
-        # Find all LaTeX files
-        latex_files = []
-        for pattern in ['**/*.tex', '**/*.latex']:
-            latex_files.extend(Path('.').glob(pattern))
-        
-        # Find all markdown files
-        md_files = list(Path('.').glob('**/*.md'))
-        
-        all_files = latex_files + md_files
-        
-        print(f"Found {len(all_files)} files to audit:")
+    def wants(self, source):
+        # Skip certain directories
+        return super().wants(source) and not any(
+            skip in str(source.path) for skip in ['.git', '.cache', 'node_modules', '_site', 'figures'])
+
+    def start(self, scanner):
+        latex_files = scanner.with_suffix('.tex', '.latex')
+        md_files = scanner.with_suffix('.md')
+
+        print(f"Found {len(latex_files) + len(md_files)} files to audit:")
         print(f"  - LaTeX files: {len(latex_files)}")
         print(f"  - Markdown files: {len(md_files)}")
         print()
+
+    def visit(self, source):
+        print(f"Auditing: {source.path}")
+        content = source.text
+        if source.error:
+            self.issues[source.path].append(f"Cannot read file: {source.error}")
+            return
+        self.audit_file(source.path, content)
+
+    def audit_all_content(self):
+        """Audit all slides and tutorials."""
+        print("🔍 Starting comprehensive content audit...\n")
         
-        for file_path in sorted(all_files):
-            # Skip certain directories
-            if any(skip in str(file_path) for skip in ['.git', 'node_modules', '_site', 'figures']):
-                continue
-                
-            print(f"Auditing: {file_path}")
-            self.audit_file(file_path)
-        
+        RepoScanner('.').feed([self])
         self._print_report()
 
     def _print_report(self):
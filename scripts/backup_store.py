@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for the backups the notebook scripts make.
+
+The notebook scripts used to copy a notebook to a sibling file
+(.ipynb.backup, .ipynb.backup-colab, .ipynb.backup-tags) before rewriting
+it, which about tripled the size of notebooks/ and put the copies in every
+glob over it. Backups now go to .cache/notebook-backups/:
+
+- objects/ab/cdef...   the backed-up bytes, zlib-compressed, named by the
+                       SHA-256 of the uncompressed content, so identical
+                       backups (of one notebook or of several) are stored once
+- index.json           notebook (repo-relative) -> its backups, oldest
+                       first: {hash, size, time, label}
+
+The index is updated under a lock (the transforms run in several processes)
+and written atomically. Retention is applied whenever a notebook is backed
+up: its newest KEEP backups are kept and older ones are dropped once they
+are MAX_AGE_DAYS old; the newest backup of a notebook is always kept.
+Backups imported from sibling files are left alone by that and only
+dropped by an explicit prune. Objects no backup refers to any more are
+deleted.
+
+Usage:
+    python scripts/backup_store.py list [NOTEBOOK ...]          # backups, newest first
+    python scripts/backup_store.py restore NOTEBOOK [-b REF]    # REF: number from list or hash prefix
+    python scripts/backup_store.py prune [--keep N] [--max-age DAYS]
+    python scripts/backup_store.py import [PATH ...] [--remove] # sibling .backup* files into the store
+    python scripts/backup_store.py stats
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from slide_deps import REPO_ROOT
+
+STORE_DIR = REPO_ROOT / ".cache" / "notebook-backups"
+INDEX_VERSION = 1
+KEEP = 10
+MAX_AGE_DAYS = 90
+# Sibling backups the scripts used to write, and the label they get on import
+SIBLING_SUFFIXES = {
+    '.ipynb.backup': 'backup',
+    '.ipynb.backup-colab': 'colab',
+    '.ipynb.backup-tags': 'tags',
+}
+
+
+def store_key(path) -> str:
+    """Index key for a notebook: repo-relative and POSIX style when possible."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp() creates 0600; keep the old file's mode, or use the umask default
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class BackupStore:
+    """Backups of notebooks, deduplicated by content."""
+
+    def __init__(self, root: Path = STORE_DIR, keep: int = KEEP, max_age_days: float = MAX_AGE_DAYS):
+        self.root = Path(root)
+        self.index_path = self.root / 'index.json'
+        self.keep = keep
+        self.max_age_days = max_age_days
+
+    # -- objects --------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / 'objects' / digest[:2] / digest[2:]
+
+    def _put(self, digest: str, compressed: bytes):
+        """Store an object once; called with the index locked, so it cannot
+        be collected between this check and the entry that refers to it."""
+        path = self._object_path(digest)
+        if not path.exists():
+            _write_atomic(path, compressed)
+
+    def read(self, digest: str) -> bytes:
+        data = zlib.decompress(self._object_path(digest).read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"backup object {digest[:12]} is corrupt")
+        return data
+
+    def objects(self) -> Dict[str, int]:
+        """Hash -> stored (compressed) size of every object."""
+        found = {}
+        for path in (self.root / 'objects').glob('??/*'):
+            if not path.name.startswith('.'):
+                found[path.parent.name + path.name] = path.stat().st_size
+        return found
+
+    # -- index ----------------------------------------------------------
+
+    @contextmanager
+    def _locked(self):
+        """The index for a read-modify-write cycle; saved on exit."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / 'index.lock', 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                backups = self.index()
+                yield backups
+                data = json.dumps({'version': INDEX_VERSION, 'backups': backups}, indent=1, sort_keys=True)
+                _write_atomic(self.index_path, data.encode('utf-8'))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def index(self) -> Dict[str, List[dict]]:
+        """Notebook -> its backups, oldest first."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('backups', {}) if data.get('version') == INDEX_VERSION else {}
+
+    def history(self, path) -> List[dict]:
+        """The backups of one notebook, newest first."""
+        return list(reversed(self.index().get(store_key(path), [])))
+
+    def find(self, path, ref: Optional[str] = None) -> dict:
+        """A backup of ``path``: the newest, the ``ref``-th newest (0, 1, ...)
+        or the one whose hash starts with ``ref``."""
+        history = self.history(path)
+        if not history:
+            raise KeyError(f"no backups of {store_key(path)}")
+        if ref is None:
+            return history[0]
+        if ref.isdigit() and len(ref) < 4:
+            if int(ref) >= len(history):
+                raise KeyError(f"{store_key(path)} has {len(history)} backups")
+            return history[int(ref)]
+        matches = [entry for entry in history if entry['hash'].startswith(ref)]
+        if not matches:
+            raise KeyError(f"no backup of {store_key(path)} matches {ref!r}")
+        return matches[0]
+
+    # -- backups --------------------------------------------------------
+
+    def save(self, path, data: Optional[bytes] = None, label: str = '',
+             timestamp: Optional[float] = None, retain: bool = True, imported: bool = False) -> dict:
+        """Back up ``path`` (its current bytes unless ``data`` is given) and,
+        with ``retain``, apply the retention limits to its backups."""
+        if data is None:
+            data = Path(path).read_bytes()
+        entry = {'hash': hashlib.sha256(data).hexdigest(), 'size': len(data), 'label': label,
+                 'time': time.time() if timestamp is None else timestamp}
+        if imported:
+            entry['imported'] = True
+        compressed = zlib.compress(data)
+        with self._locked() as backups:
+            self._put(entry['hash'], compressed)
+            history = backups.setdefault(store_key(path), [])
+            # Backing up the same bytes again only refreshes the entry; the
+            # label of the first backup says which passes produced them
+            same = [old for old in history if old['hash'] == entry['hash']]
+            if same:
+                entry['label'] = same[0]['label']
+            history[:] = [old for old in history if old['hash'] != entry['hash']]
+            history.append(entry)
+            history.sort(key=lambda old: old['time'])
+            if retain:
+                self._collect(self._retain(history, imported=False), backups)
+        return entry
+
+    def _retain(self, history: List[dict], keep: Optional[int] = None,
+                max_age_days: Optional[float] = None, imported: bool = True) -> List[dict]:
+        """Apply the retention limits to one history (oldest first); return the
+        dropped entries. Without ``imported`` imported entries are all kept."""
+        keep = self.keep if keep is None else keep
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        candidates = [entry for entry in history if imported or not entry.get('imported')]
+        kept = candidates[-max(keep, 1):]
+        kept = [entry for entry in kept[:-1] if entry['time'] >= cutoff] + kept[-1:]
+        dropped = [entry for entry in candidates if entry not in kept]
+        history[:] = [entry for entry in history if entry not in dropped]
+        return dropped
+
+    def _collect(self, dropped: Iterable[dict], backups: Dict[str, List[dict]]) -> Tuple[int, int]:
+        """Delete the objects of ``dropped`` entries that no entry of ``backups``
+        refers to (index locked); return (objects, bytes) deleted."""
+        candidates = {entry['hash'] for entry in dropped}
+        if not candidates:
+            return 0, 0
+        referenced = {entry['hash'] for history in backups.values() for entry in history}
+        count = size = 0
+        for digest in candidates - referenced:
+            path = self._object_path(digest)
+            try:
+                size += path.stat().st_size
+                path.unlink()
+                count += 1
+            except FileNotFoundError:
+                pass
+        return count, size
+
+    def prune(self, keep: Optional[int] = None, max_age_days: Optional[float] = None) -> Tuple[int, int, int]:
+        """Apply the retention limits to every notebook and delete unreferenced
+        objects (also ones left by interrupted runs); return (backups, objects, bytes) removed."""
+        dropped = []
+        with self._locked() as backups:
+            for key in list(backups):
+                dropped.extend(self._retain(backups[key], keep, max_age_days))
+                if not backups[key]:
+                    del backups[key]
+            orphans = [{'hash': digest} for digest in self.objects()]
+            count, size = self._collect(dropped + orphans, backups)
+        return len(dropped), count, size
+
+    def restore(self, path, ref: Optional[str] = None) -> dict:
+        """Put a backup back in place; the current file is backed up first
+        (without retention, which could collect the backup being restored)."""
+        entry = self.find(path, ref)
+        data = self.read(entry['hash'])
+        path = Path(path)
+        if path.exists():
+            current = path.read_bytes()
+            if current == data:
+                return entry
+            self.save(path, current, label='before-restore', retain=False)
+        _write_atomic(path, data)
+        return entry
+
+    def import_siblings(self, paths: Iterable, remove: bool = False) -> List[Tuple[Path, Path, dict]]:
+        """Move sibling backup files (notebook.ipynb.backup*) into the store,
+        all of them however old (prune() applies the limits later);
+        return (backup file, notebook, entry) for each."""
+        imported = []
+        for backup_path in find_sibling_backups(paths):
+            suffix = next(s for s in sorted(SIBLING_SUFFIXES, key=len, reverse=True)
+                          if backup_path.name.endswith(s))
+            notebook = backup_path.with_name(backup_path.name[:-len(suffix)] + '.ipynb')
+            entry = self.save(notebook, backup_path.read_bytes(), label=SIBLING_SUFFIXES[suffix],
+                              timestamp=backup_path.stat().st_mtime, retain=False, imported=True)
+            if remove:
+                backup_path.unlink()
+            imported.append((backup_path, notebook, entry))
+        return imported
+
+
+def find_sibling_backups(paths: Iterable) -> List[Path]:
+    """The .ipynb.backup* files given, directories searched recursively."""
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(p for p in sorted(path.glob('**/*.ipynb.backup*'))
+                         if any(p.name.endswith(s) for s in SIBLING_SUFFIXES))
+        elif any(path.name.endswith(s) for s in SIBLING_SUFFIXES):
+            found.append(path)
+    return found
+
+
+def _size(size: int) -> str:
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1 << 20 else f"{size / 1024:.0f} KB"
+
+
+def _when(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backups of notebooks in a content-addressed store")
+    parser.add_argument('--store', type=Path, default=STORE_DIR, help='Store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    list_parser = commands.add_parser('list', help='List backups, newest first')
+    list_parser.add_argument('notebooks', nargs='*')
+    restore_parser = commands.add_parser('restore', help='Put a backup back in place')
+    restore_parser.add_argument('notebook')
+    restore_parser.add_argument('-b', '--backup', help='Number from "list" (0 = newest) or hash prefix')
+    prune_parser = commands.add_parser('prune', help='Apply retention limits')
+    prune_parser.add_argument('--keep', type=int, default=KEEP, help=f'Backups kept per notebook (default: {KEEP})')
+    prune_parser.add_argument('--max-age', type=float, default=MAX_AGE_DAYS,
+                              help=f'Days older backups are kept (default: {MAX_AGE_DAYS})')
+    import_parser = commands.add_parser('import', help='Move sibling .backup* files into the store')
+    import_parser.add_argument('paths', nargs='*', default=[str(REPO_ROOT / 'notebooks')])
+    import_parser.add_argument('--remove', action='store_true', help='Delete the sibling files once stored')
+    commands.add_parser('stats', help='Size of the store')
+    args = parser.parse_args()
+
+    store = BackupStore(args.store)
+    if args.command == 'list':
+        index = store.index()
+        keys = [store_key(path) for path in args.notebooks] or sorted(index)
+        for key in keys:
+            history = store.history(key) if key in index else []
+            print(f"📓 {key}: {len(history)} backups")
+            for number, entry in enumerate(history):
+                print(f"  {number:2d}  {entry['hash'][:12]}  {_when(entry['time'])}  "
+                      f"{_size(entry['size']):>8s}  {entry['label']}")
+        return 0
+
+    if args.command == 'restore':
+        try:
+            entry = store.restore(args.notebook, args.backup)
+        except (KeyError, OSError, ValueError, zlib.error) as e:
+            print(f"❌ {e.args[0] if isinstance(e, KeyError) else e}")
+            return 1
+        print(f"✅ Restored {store_key(args.notebook)} from {entry['hash'][:12]} ({_when(entry['time'])})")
+        return 0
+
+    if args.command == 'prune':
+        backups, objects, size = store.prune(args.keep, args.max_age)
+        print(f"🧹 Dropped {backups} backups, deleted {objects} objects ({_size(size)})")
+        return 0
+
+    if args.command == 'import':
+        imported = store.import_siblings(args.paths, args.remove)
+        for backup_path, notebook, entry in imported:
+            print(f"  {backup_path.name} -> {store_key(notebook)} {entry['hash'][:12]}")
+        verb = 'Moved' if args.remove else 'Copied'
+        print(f"📦 {verb} {len(imported)} backup files into {args.store}")
+        return 0
+
+    index = store.index()
+    entries = [entry for history in index.values() for entry in history]
+    objects = store.objects()
+    print(f"📦 {args.store}")
+    print(f"  {len(index)} notebooks, {len(entries)} backups of {_size(sum(e['size'] for e in entries))}")
+    print(f"  {len(objects)} objects, {_size(sum(objects.values()))} on disk")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
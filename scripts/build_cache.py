@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Content-hash build manifest for LaTeX slide decks.
+
+For each deck the manifest stores a SHA-256 of every file it depends on
+(see slide_deps.py) plus the hash of the PDF that was produced. A deck is
+up to date when its PDF still exists with the recorded hash and none of its
+dependency hashes changed. Unlike make's mtime comparison this survives a
+git checkout or a CI cache restore.
+
+Usage:
+    python scripts/build_cache.py check <deck.tex>    # exit 0 if up to date
+    python scripts/build_cache.py record <deck.tex>   # store hashes after a build
+    python scripts/build_cache.py forget <deck.tex>   # drop a deck, e.g. after a failed build
+    python scripts/build_cache.py clear               # forget every deck
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+from slide_deps import REPO_ROOT, deck_dependencies
+
+CACHE_DIR = REPO_ROOT / ".cache"
+MANIFEST_PATH = CACHE_DIR / "build-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@contextmanager
+def manifest_lock(path: Path = MANIFEST_PATH):
+    """Serialize read-modify-write cycles, e.g. from `make -j` recipes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix('.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def file_hash(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _key(path: Path) -> str:
+    """Manifest key for a path: repo-relative and POSIX style when possible."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+class BuildManifest:
+    """Persistent record of the inputs each deck was last built from."""
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = Path(path)
+        self.decks: Dict[str, dict] = {}
+        self._hashes: Dict[Path, str] = {}  # per-run memo; shared .sty files are hashed once
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.decks = data.get('decks', {})
+
+    def save(self):
+        """Write the manifest atomically so an interrupted build can't corrupt it."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.manifest-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'decks': self.decks}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _hash(self, path: Path) -> str:
+        if path not in self._hashes:
+            self._hashes[path] = file_hash(path)
+        return self._hashes[path]
+
+    def input_hashes(self, tex_file) -> Dict[str, str]:
+        """Hash every dependency of a deck, keyed by repo-relative path."""
+        return {_key(dep): self._hash(dep) for dep in deck_dependencies(tex_file)}
+
+    def is_up_to_date(self, tex_file) -> bool:
+        """True when the deck's PDF exists and none of its inputs changed."""
+        entry = self.decks.get(_key(tex_file))
+        if not entry:
+            return False
+        pdf_file = Path(tex_file).with_suffix('.pdf')
+        if not pdf_file.exists() or file_hash(pdf_file) != entry.get('pdf'):
+            return False
+        return entry.get('inputs') == self.input_hashes(tex_file)
+
+    def record(self, tex_file):
+        """Remember the current inputs of a freshly built deck."""
+        pdf_file = Path(tex_file).with_suffix('.pdf')
+        if not pdf_file.exists():
+            return
+        self.decks[_key(tex_file)] = {
+            'inputs': self.input_hashes(tex_file),
+            'pdf': file_hash(pdf_file),
+        }
+
+    def forget(self, tex_file):
+        self.decks.pop(_key(tex_file), None)
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ('check', 'record', 'forget', 'clear'):
+        print(__doc__.strip())
+        return 2
+
+    command = sys.argv[1]
+
+    if command == 'clear':
+        with manifest_lock():
+            manifest = BuildManifest()
+            manifest.decks = {}
+            manifest.save()
+        print(f"🧹 Cleared build manifest: {manifest.path}")
+        return 0
+
+    if len(sys.argv) < 3:
+        print(f"Usage: build_cache.py {command} <deck.tex> [<deck.tex> ...]")
+        return 2
+
+    tex_files = sys.argv[2:]
+    if command == 'check':
+        manifest = BuildManifest()
+        return 0 if all(manifest.is_up_to_date(tex) for tex in tex_files) else 1
+
+    with manifest_lock():
+        manifest = BuildManifest()
+        for tex_file in tex_files:
+            if command == 'record':
+                manifest.record(tex_file)
+            else:
+                manifest.forget(tex_file)
+        manifest.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Build telemetry for slide decks.
+
+compile_deck.py appends one JSON line per deck compile to
+.cache/build-stats.jsonl, whichever driver ran it (the topic Makefiles,
+compile_all_slides.py, ...). A record holds the deck, topic, engine, pass
+count, wall time, peak RSS of the engine, page count, PDF size, exit
+status and the number of errors and warnings in the log. Records of one
+make run or one compile_all_slides.py run share a build id
+(SLIDE_BUILD_ID); compiles outside such a run are grouped by day.
+
+Usage:
+    python scripts/build_stats.py                            # all reports below
+    python scripts/build_stats.py slowest [-n 10]            # slowest decks, latest build of each
+    python scripts/build_stats.py regressions [--builds 5]   # decks slower than their recent median
+    python scripts/build_stats.py trend [--builds 5]         # seconds per deck per topic and build
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from slide_deps import REPO_ROOT, TOPICS
+
+STATS_PATH = REPO_ROOT / ".cache" / "build-stats.jsonl"
+
+# "Output written on knn.pdf (23 pages, 123456 bytes)." - wrapped at 79 columns;
+# XeTeX (xdvipdfmx) writes only "(23 pages)."
+OUTPUT_PATTERN = re.compile(r'Output written on .*?\((\d+)\s+pages?(?:,\s+(\d+)\s+bytes)?\)', re.DOTALL)
+
+
+def new_build_id() -> str:
+    return time.strftime('%Y%m%d-%H%M%S')
+
+
+def parse_output_summary(log_file: Path) -> Tuple[Optional[int], Optional[int]]:
+    """Pages and bytes from the engine's "Output written on" log line
+    (bytes are None for XeTeX, which does not log them)."""
+    try:
+        tail = log_file.read_bytes()[-4096:].decode('utf-8', errors='replace')
+    except OSError:
+        return None, None
+    matches = OUTPUT_PATTERN.findall(tail.replace('\n', ''))
+    if not matches:
+        return None, None
+    pages, size = matches[-1]
+    return int(pages), int(size) if size else None
+
+
+def _relative(path: Path) -> str:
+    try:
+        return path.relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def record_build(result, engine: str, path: Path = STATS_PATH):
+    """Append the outcome of one deck compile (a compile_deck.CompileResult)."""
+    tex_file = result.tex_file
+    pages, size = parse_output_summary(result.log_file)
+    # The PDF written by this run: its log reports pages, or the run succeeded
+    if size is None and (pages is not None or result.success) and result.pdf_file.exists():
+        size = result.pdf_file.stat().st_size
+    deck = _relative(tex_file)
+    topic = deck.split('/')[0]
+
+    if result.timed_out:
+        status = 'timeout'
+    elif result.success:
+        status = 'success'
+    else:
+        status = 'failed'
+
+    record = {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'build': os.environ.get('SLIDE_BUILD_ID') or time.strftime('%Y-%m-%d'),
+        'deck': deck,
+        'topic': topic if topic in TOPICS else None,
+        'engine': engine,
+        'passes': result.passes,
+        'wall_time': round(result.wall_time, 3),
+        'peak_rss_kb': result.peak_rss_kb,  # KiB on Linux
+        'pages': pages,
+        'pdf_bytes': size,
+        'status': status,
+        'returncode': result.returncode,
+        'errors': len(result.errors),
+        'warnings': sum(1 for entry in result.log_entries if entry.level == 'warning'),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # One short write in append mode, so parallel compiles don't interleave
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def load_records(path: Path = STATS_PATH) -> List[dict]:
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # a line cut short by an interrupted build
+    except OSError:
+        pass
+    return records
+
+
+def _by_deck(records: List[dict]) -> Dict[str, List[dict]]:
+    decks = defaultdict(list)
+    for record in records:
+        if record.get('status') == 'success':
+            decks[record['deck']].append(record)
+    return decks
+
+
+def _builds(records: List[dict]) -> List[str]:
+    """Build ids, oldest first."""
+    first_seen = {}
+    for record in records:
+        first_seen.setdefault(record['build'], record['time'])
+    return sorted(first_seen, key=first_seen.get)
+
+
+def _size(record: dict) -> str:
+    size = record.get('pdf_bytes')
+    return f"{size / 1024:.0f} KiB" if size else '?'
+
+
+def report_slowest(records: List[dict], count: int):
+    latest = [history[-1] for history in _by_deck(records).values()]
+    latest.sort(key=lambda r: r['wall_time'], reverse=True)
+    print(f"🐢 SLOWEST DECKS (latest successful build of each, {len(latest)} decks):")
+    for record in latest[:count]:
+        rss = record.get('peak_rss_kb') or 0
+        passes = f"{record['passes']} pass{'es' if record['passes'] != 1 else ''}"
+        print(f"  {record['wall_time']:7.1f}s  {passes:<8}  {rss / 1024:6.0f} MiB"
+              f"  {record.get('pages') or '?':>4} pages  {_size(record):>9}  {record['deck']}")
+
+
+def report_regressions(records: List[dict], builds: int, threshold: float, min_seconds: float) -> int:
+    """Decks whose latest build is ``threshold`` times slower than the median
+    of their previous ``builds`` builds. Returns the number found."""
+    regressions = []
+    for deck, history in _by_deck(records).items():
+        if len(history) < 2:
+            continue
+        latest, previous = history[-1], history[-builds - 1:-1]
+        baseline = statistics.median(r['wall_time'] for r in previous)
+        if latest['wall_time'] > baseline * threshold and latest['wall_time'] - baseline >= min_seconds:
+            regressions.append((latest['wall_time'] / baseline if baseline else float('inf'),
+                                deck, baseline, latest))
+
+    print(f"📈 REGRESSIONS (latest vs. median of previous {builds} builds, >{(threshold - 1) * 100:.0f}%):")
+    if not regressions:
+        print("  (None)")
+    for ratio, deck, baseline, latest in sorted(regressions, reverse=True):
+        print(f"  {deck}: {baseline:.1f}s → {latest['wall_time']:.1f}s (x{ratio:.2f}, "
+              f"{latest['passes']} pass{'es' if latest['passes'] != 1 else ''})")
+    return len(regressions)
+
+
+def report_trend(records: List[dict], builds: int):
+    recent = _builds(records)[-builds:]
+    times = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        if record.get('status') == 'success' and record['build'] in recent:
+            times[record.get('topic') or 'other'][record['build']].append(record['wall_time'])
+
+    print(f"📊 PER-TOPIC TREND (mean seconds per compiled deck, last {len(recent)} builds, oldest → newest):")
+    for topic in TOPICS + ['other']:
+        if topic not in times:
+            continue
+        cells = []
+        for build in recent:
+            walls = times[topic].get(build)
+            cells.append(f"{statistics.mean(walls):6.1f}" if walls else f"{'-':>6}")
+        print(f"  {topic:<16}{''.join(cells)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report slide build telemetry")
+    parser.add_argument('command', nargs='?', choices=['slowest', 'regressions', 'trend'],
+                        help='Report to show (default: all)')
+    parser.add_argument('-n', '--count', type=int, default=10, help='Decks listed by slowest (default: 10)')
+    parser.add_argument('--builds', type=int, default=5,
+                        help='Previous builds compared against / shown in the trend (default: 5)')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio reported as a regression (default: 1.25)')
+    parser.add_argument('--min-seconds', type=float, default=1.0,
+                        help='Ignore slowdowns smaller than this (default: 1.0)')
+    args = parser.parse_args()
+
+    records = load_records()
+    if not records:
+        print(f"⚠️  No build statistics in {STATS_PATH} yet")
+        return 0
+
+    if args.command in (None, 'slowest'):
+        report_slowest(records, args.count)
+    if args.command in (None, 'regressions'):
+        if args.command is None:
+            print()
+        report_regressions(records, max(1, args.builds), args.threshold, args.min_seconds)
+    if args.command in (None, 'trend'):
+        if args.command is None:
+            print()
+        report_trend(records, max(1, args.builds))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
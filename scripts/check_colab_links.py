@@ -1,25 +1,26 @@
 #!/usr/bin/env python3
 """Check if notebooks have Colab links in the second cell after metadata."""
 
-import json
 from pathlib import Path
 
+from notebook_stream import iter_cells
+
 def has_colab_link(notebook_path):
     """Check if notebook has Colab link in second cell."""
     try:
-        with open(notebook_path, 'r') as f:
-            data = json.load(f)
+        # Only the first two cells are parsed (notebook_stream.py)
+        cells = list(iter_cells(notebook_path, limit=2))
         
-        if len(data.get('cells', [])) < 2:
+        if len(cells) < 2:
             return False, "Less than 2 cells"
         
         # Check if first cell is raw metadata
-        first_cell = data['cells'][0]
+        first_cell = cells[0]
         if first_cell.get('cell_type') != 'raw':
             return False, "First cell is not raw metadata"
         
         # Check if second cell has Colab link
-        second_cell = data['cells'][1]
+        second_cell = cells[1]
         if second_cell.get('cell_type') != 'markdown':
             return False, "Second cell is not markdown"
         
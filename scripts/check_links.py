@@ -1,71 +1,267 @@
 #!/usr/bin/env python3
 """
-Script to check for broken links in QMD files
+Check the links of the whole site in one pass.
+
+LinkChecker visits every .qmd, .md, notebook and .tex file in one
+RepoScanner walk and checks the links they contain: markdown links and
+images in pages and notebook markdown cells, href/src attributes, and
+\\href/\\url in LaTeX. The links themselves are extracted by file_facts.py,
+so they are cached per file (size, mtime and content hash) and only
+changed files are parsed again. Targets are looked up in the asset index
+(asset_index.py), fragments ("page.qmd#section", "#section") in the anchor
+index of the pages (anchor_index.py), once every page has been visited.
+
+Every link has a kind:
+
+- external: http(s), mailto, ...; with --external the http(s) ones are
+  fetched by http_checker.py (notebookbox URLs of the decks included)
+- anchor: "#section" on the same page
+- notebook: a notebook or its rendered page (notebooks/x.ipynb, x.html)
+- internal: any other file of the repository
+
+Broken links have a type: missing_file, missing_notebook, missing_html
+(an .html page that is not in the tree; Quarto renders it from a source
+next to it, which the link should point to instead) or unbuilt_pdf (a
+slide PDF whose .tex is there but has not been built), missing_anchor
+(the page exists but has no such heading or id); with --external also
+broken_external.
+
+Usage:
+    python scripts/check_links.py [repo_root]
+    python scripts/check_links.py --external         # fetch external links too
+    python scripts/generate_link_report.py [repo_root]   # markdown report
 """
+
+import argparse
+import difflib
 import os
 import re
 import sys
+from collections import Counter
 from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from anchor_index import AnchorIndex
+from asset_index import asset_index
+from http_checker import HttpChecker, add_arguments, describe, from_arguments
+from repo_scanner import Checker, RepoScanner
+from slide_deps import REPO_ROOT
+
+SCHEME_PATTERN = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//)')
+# Sources Quarto renders to an .html page of the same name
+RENDERED_SOURCES = ('.qmd', '.ipynb', '.md')
+PAGE_SUFFIXES = set(RENDERED_SOURCES)
+
+FIXES = {
+    'missing_html': ["- Link the source (`.ipynb`, `.qmd`) instead of the rendered `.html` page; "
+                     "Quarto rewrites the link when it renders the site",
+                     "- `python scripts/fix_notebook_links.py` does this for notebook links"],
+    'unbuilt_pdf': ["- Build the deck with `make` in its directory; slide PDFs are build outputs"],
+    'missing_notebook': ["- Check the notebook name against `notebooks/` (lowercase-with-hyphens)",
+                         "- Remove the link if the notebook was dropped"],
+    'missing_file': ["- Fix the path relative to the linking file, or add the missing file"],
+    'missing_anchor': ["- Headings get their id from their text (lowercase, words joined with `-`); "
+                       "`python scripts/anchor_index.py PAGE` lists the ids of a page",
+                       "- Give the heading an explicit id (`## Title {#id}`) so links survive rewording"],
+    'broken_external': ["- Update or remove links to pages that are gone; "
+                        "`python scripts/http_checker.py --no-cache URL` checks one again"],
+}
+
+
+class LinkChecker(Checker):
+    suffixes = ('.qmd', '.md', '.ipynb', '.tex')
+
+    def __init__(self, repo_root='.'):
+        self.root = Path(repo_root).resolve()
+        self.assets = asset_index(self.root)
+        self.files_checked = 0
+        self.kinds: Counter = Counter()
+        self.broken_links: List[dict] = []
+        self.external: List[dict] = []
+        self.anchors = AnchorIndex()
+        # Links with a fragment, checked once all anchors are known
+        self.fragments: List[dict] = []
+
+    def check_all_links(self) -> dict:
+        """Check every page of the site; return the summary."""
+        RepoScanner(self.root).feed([self])
+        return self.summary()
+
+    def start(self, scanner):
+        # Notebook names, for suggestions on broken notebook links
+        self.notebooks = {source.path.stem: os.path.relpath(source.path, self.root)
+                          for source in scanner.with_suffix('.ipynb')}
+
+    def visit(self, source):
+        facts = source.facts
+        if 'error' in facts:
+            print(f"⚠️  Could not read {source.path}: {facts['error']}")
+            return
+        self.files_checked += 1
+        relative = os.path.relpath(source.path, self.root)
+        if 'anchors' in facts:
+            self.anchors.add(relative, facts['anchors'])
+        links = facts.get('links', []) + [[line, 'notebookbox', url] for line, url in facts.get('notebookbox', [])]
+        for line, text, url, *cell in links:
+            kind, problem, target = self.check_link(source.path, url)
+            self.kinds[kind] += 1
+            if kind == 'external' and url.startswith(('http://', 'https://')):
+                self.external.append({'file': relative, 'line': line, 'cell': cell[0] if cell else None,
+                                      'text': text, 'url': url})
+            elif problem:
+                self.broken_links.append({
+                    'file': relative, 'line': line, 'cell': cell[0] if cell else None,
+                    'text': text, 'url': url, 'kind': kind, 'type': problem,
+                    'suggestion': self._suggest(problem, target),
+                })
+            elif '#' in url:
+                page = self._page(target)
+                fragment = unquote(url.split('#', 1)[1])
+                if page and fragment:
+                    self.fragments.append({'file': relative, 'line': line, 'cell': cell[0] if cell else None,
+                                           'text': text, 'url': url, 'kind': kind, 'page': page,
+                                           'fragment': fragment})
+
+    def merge(self, other):
+        self.files_checked += other.files_checked
+        self.kinds.update(other.kinds)
+        self.broken_links.extend(other.broken_links)
+        self.external.extend(other.external)
+        self.anchors.merge(other.anchors)
+        self.fragments.extend(other.fragments)
+
+    def _page(self, target: Path) -> Optional[str]:
+        """Root-relative source of the page ``target`` renders to, if it is one."""
+        if target.suffix == '.html':
+            target = self.assets.first(target.with_suffix(suffix) for suffix in RENDERED_SOURCES)
+        if target is None or target.suffix not in PAGE_SUFFIXES:
+            return None
+        return os.path.relpath(target, self.root)
+
+    def check_fragments(self):
+        """Look up the collected fragments in the anchor index; the ones
+        missing from their page are added as missing_anchor. Pages that
+        were not scanned are not judged."""
+        for link in self.fragments:
+            page, fragment = link.pop('page'), link.pop('fragment')
+            if page not in self.anchors or self.anchors.has(page, fragment):
+                continue
+            close = difflib.get_close_matches(fragment, self.anchors.anchors(page), n=1, cutoff=0.6)
+            suggestion = f"{link['url'].split('#', 1)[0]}#{close[0]}" if close else None
+            self.broken_links.append(dict(link, type='missing_anchor', suggestion=suggestion))
+        self.fragments = []
+
+    def check_external(self, http: HttpChecker):
+        """Fetch the external links found by the scan; the broken ones are
+        added as broken_external."""
+        results = http.check(link['url'] for link in self.external)
+        unknown = sum(result['ok'] is None for result in results.values())
+        if unknown:
+            print(f"⏳ {unknown} of {len(results)} external URLs could not be checked (timeouts, rate limits)")
+        for link in self.external:
+            result = results[link['url'].split('#', 1)[0]]
+            if result['ok'] is False:
+                self.broken_links.append(dict(link, kind='external', type='broken_external',
+                                              suggestion=None, error=describe(result)))
+
+    def check_link(self, page: Path, url: str):
+        """(kind, problem or None, resolved target or None) of ``url`` on ``page``."""
+        if SCHEME_PATTERN.match(url):
+            return 'external', None, None
+        path = unquote(url.split('#', 1)[0].split('?', 1)[0])
+        if not path:
+            return 'anchor', None, page
+
+        target = self.root / path.lstrip('/') if path.startswith('/') else page.parent / path
+        target = Path(os.path.normpath(target))
+        kind = 'notebook' if target.suffix == '.ipynb' or (
+            target.suffix == '.html' and target.parent.name == 'notebooks') else 'internal'
+        if self.assets.exists(target):
+            return kind, None, target
+        if target.suffix == '.html' and self.assets.first(target.with_suffix(suffix) for suffix in RENDERED_SOURCES):
+            return kind, 'missing_html', target
+        if target.suffix == '.pdf' and self.assets.is_file(target.with_suffix('.tex')):
+            return kind, 'unbuilt_pdf', target
+        return kind, ('missing_notebook' if kind == 'notebook' else 'missing_file'), target
+
+    def _suggest(self, problem: str, target: Optional[Path]) -> Optional[str]:
+        if target is None:
+            return None
+        if problem == 'missing_html':
+            source = self.assets.first(target.with_suffix(suffix) for suffix in RENDERED_SOURCES)
+            return os.path.relpath(source, self.root)
+        if problem == 'unbuilt_pdf':
+            return os.path.relpath(target.with_suffix('.tex'), self.root)
+        if problem == 'missing_notebook':
+            # Compare names without extension: ".ipynb" makes any two names look alike
+            close = difflib.get_close_matches(target.stem, self.notebooks, n=1, cutoff=0.75)
+            return self.notebooks[close[0]] if close else None
+        close = self.assets.suggest(target, n=1)
+        return close[0] if close else None
+
+    def summary(self) -> dict:
+        self.check_fragments()
+        broken_by_type = Counter(link['type'] for link in self.broken_links)
+        self.broken_links.sort(key=lambda link: (link['file'], link['cell'] or 0, link['line']))
+        return {
+            'total_files': self.files_checked,
+            'total_links': sum(self.kinds.values()),
+            'broken_links': len(self.broken_links),
+            'broken_by_type': dict(broken_by_type.most_common()),
+            'links_by_kind': dict(self.kinds.most_common()),
+        }
+
+    def suggest_fixes(self) -> Dict[str, List[str]]:
+        """Markdown bullet points per broken-link type."""
+        suggestions = {}
+        for problem, advice in FIXES.items():
+            links = [link for link in self.broken_links if link['type'] == problem]
+            if not links:
+                continue
+            suggestions[problem] = list(advice)
+            for link in links:
+                if link['suggestion']:
+                    suggestions[problem].append(
+                        f"- `{link['file']}`: `{link['url']}` → `{link['suggestion']}`?")
+        return suggestions
+
+    def finish(self) -> bool:
+        summary = self.summary()
+        kinds = ', '.join(f"{count} {kind}" for kind, count in summary['links_by_kind'].items())
+        print(f"🔗 Checked {summary['total_links']} links in {summary['total_files']} files ({kinds})")
+        if not self.broken_links:
+            print("\n✅ All links are valid!")
+            return True
+
+        current_file = None
+        for link in self.broken_links:
+            if link['file'] != current_file:
+                current_file = link['file']
+                print(f"\n📄 {current_file}")
+            where = f"cell {link['cell']}, line {link['line']}" if link['cell'] is not None else f"line {link['line']}"
+            hint = f" → {link['suggestion']}?" if link['suggestion'] else ''
+            problem = f"{link['type']}: {link['error']}" if link.get('error') else link['type']
+            print(f"  ❌ {where}: [{link['text']}]({link['url']}) ({problem}){hint}")
+
+        print(f"\n❌ Found {summary['broken_links']} broken links: "
+              + ', '.join(f"{count} {problem}" for problem, count in summary['broken_by_type'].items()))
+        return False
 
-def extract_links(content):
-    """Extract all links from markdown content"""
-    # Pattern to match markdown links [text](url)
-    pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-    links = re.findall(pattern, content)
-    return [(text.strip(), url.strip()) for text, url in links]
-
-def check_link(link, base_path):
-    """Check if a link is valid"""
-    url = link[1]
-    
-    # Skip external links
-    if url.startswith('http'):
-        return True, "External link"
-    
-    # Handle relative paths
-    if url.startswith('.'):
-        full_path = (base_path.parent / url).resolve()
-    else:
-        full_path = (base_path.parent / url).resolve()
-    
-    # Check if file exists
-    if full_path.exists():
-        return True, f"File exists: {full_path}"
-    else:
-        return False, f"File not found: {full_path}"
 
 def main():
-    # Get all QMD files
-    project_root = Path(__file__).parent
-    qmd_files = list(project_root.glob('*.qmd'))
-    
-    # Also check slides and tutorials directories
-    for dir_name in ['slides', 'tutorials']:
-        qmd_files.extend(project_root.glob(f'{dir_name}/*.qmd'))
-    
-    broken_links = []
-    
-    for qmd_file in qmd_files:
-        print(f"\nChecking {qmd_file.name}...")
-        content = qmd_file.read_text()
-        links = extract_links(content)
-        
-        for link in links:
-            is_valid, message = check_link(link, qmd_file)
-            if not is_valid:
-                broken_links.append((qmd_file.name, link[0], link[1]))
-                print(f"  ❌ BROKEN: [{link[0]}]({link[1]})")
-            else:
-                print(f"  ✅ OK: [{link[0]}]({link[1]}) - {message}")
-    
-    if broken_links:
-        print(f"\n\nFound {len(broken_links)} broken links:")
-        for file, text, url in broken_links:
-            print(f"  - {file}: [{text}]({url})")
-        return 1
-    else:
-        print("\n\nAll links are valid!")
-        return 0
+    parser = argparse.ArgumentParser(description="Check the links of the site")
+    parser.add_argument('repo_root', nargs='?', default=REPO_ROOT, help='Repository root (default: this repository)')
+    parser.add_argument('--external', action='store_true', help='Also fetch the external (http/https) links')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    checker = LinkChecker(args.repo_root)
+    RepoScanner(checker.root).feed([checker])
+    if args.external:
+        checker.check_external(from_arguments(args))
+    return 0 if checker.finish() else 1
+
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -1,27 +1,27 @@
 #!/usr/bin/env python3
 """Check coverage of Quarto metadata in notebooks."""
 
-import json
-from pathlib import Path
+from notebook_stream import iter_cells
+from repo_scanner import RepoScanner
 
-def has_quarto_metadata(notebook_path):
+def has_quarto_metadata(path):
     """Check if notebook has Quarto metadata in first raw cell."""
+    # Only the first cell is parsed (notebook_stream.py), not the outputs after it
     try:
-        with open(notebook_path, 'r') as f:
-            data = json.load(f)
-        if not data.get('cells'):
-            return False
-        first_cell = data['cells'][0]
-        if first_cell.get('cell_type') != 'raw':
-            return False
-        source = ''.join(first_cell.get('source', []))
-        return source.strip().startswith('---') and 'title:' in source
-    except:
+        first = next(iter_cells(path, limit=1), {})
+    except (OSError, ValueError):
         return False
+    if first.get('cell_type') != 'raw':
+        return False
+    source = first.get('source', [])
+    front_matter = ''.join(source) if isinstance(source, list) else source
+    return front_matter.strip().startswith('---') and 'title:' in front_matter
 
 def main():
-    notebooks = list(Path('notebooks').glob('**/*.ipynb'))
-    with_metadata = [nb for nb in notebooks if has_quarto_metadata(nb)]
+    scanner = RepoScanner('notebooks', cache=False)
+    notebooks = scanner.with_suffix('.ipynb')
+    with_metadata = [nb.path for nb in notebooks if has_quarto_metadata(nb.path)]
+    without_metadata = [nb.path for nb in notebooks if nb.path not in with_metadata]
     
     print(f'Coverage: {len(with_metadata)}/{len(notebooks)} notebooks have Quarto metadata ({len(with_metadata)/len(notebooks)*100:.1f}%)')
     print()
@@ -31,9 +31,8 @@ def main():
     
     print()
     print('Notebooks WITHOUT metadata:')
-    without_metadata = [nb for nb in notebooks if not has_quarto_metadata(nb)]
     for nb in sorted(without_metadata):
         print(f'  ✗ {nb.name}')
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -8,6 +8,9 @@ import re
 import sys
 from pathlib import Path
 
+from asset_index import asset_index
+from repo_scanner import RepoScanner
+
 def extract_links(content):
     """Extract all links from markdown content"""
     # Pattern to match markdown links [text](url)
@@ -43,7 +46,7 @@ def check_link(link, base_path):
         full_path = (base_path.parent / url).resolve()
     
     # Check if file exists
-    if full_path.exists():
+    if asset_index().exists(full_path):
         return True, f"File exists: {full_path.relative_to(Path.cwd())}"
     else:
         return False, f"File not found: {full_path.relative_to(Path.cwd())}"
@@ -52,23 +55,23 @@ def check_pdf_references():
     """Check for PDF references in LaTeX files using \includepdf"""
     print("\n🔍 Checking PDF references in LaTeX files...")
     
-    # Find all .tex files
-    tex_files = list(Path('.').rglob('*.tex'))
+    # Find all .tex files (one walk, build output and caches pruned)
+    scanner = RepoScanner('.')
+    tex_files = scanner.with_suffix('.tex')
     
     missing_pdfs = []
     found_pdfs = []
+    assets = asset_index()
     
-    for tex_file in tex_files:
+    for source in tex_files:
+        tex_file = source.path
         try:
-            with open(tex_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find \includepdf commands
-            pattern = r'\\includepdf(?:\[[^\]]*\])?\s*\{([^}]+)\}'
-            matches = re.findall(pattern, content)
+            # \includepdf targets are found by file_facts.py
+            facts = source.facts
+            if 'error' in facts:
+                raise OSError(facts['error'])
             
-            for match in matches:
-                pdf_path = match.strip()
+            for pdf_path in facts['includepdf']:
                 # Skip LaTeX variables
                 if '\\' in pdf_path:
                     continue
@@ -89,7 +92,7 @@ def check_pdf_references():
                 pdf_exists = False
                 actual_path = None
                 for path in possible_paths:
-                    if path.exists() and path.is_file():
+                    if assets.is_file(path):
                         pdf_exists = True
                         actual_path = str(path)
                         break
@@ -104,15 +107,19 @@ def check_pdf_references():
                     missing_pdfs.append({
                         'tex_file': str(tex_file),
                         'pdf_path': pdf_path,
-                        'searched_paths': [str(p) for p in possible_paths]
+                        'searched_paths': [str(p) for p in possible_paths],
+                        'suggestions': assets.suggest(pdf_dir / pdf_path, relative_to=pdf_dir)
                     })
         except Exception as e:
             print(f"Warning: Could not read {tex_file}: {e}")
+    scanner.fact_cache.save()
     
     if missing_pdfs:
         print(f"❌ Found {len(missing_pdfs)} missing PDF references:")
         for missing in missing_pdfs:
             print(f"   📄 {missing['pdf_path']} referenced in {missing['tex_file']}")
+            if missing['suggestions']:
+                print(f"      Closest existing: {', '.join(missing['suggestions'])}")
         return False
     else:
         print(f"✅ All PDF references are valid ({len(found_pdfs)} found)")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Compile a LaTeX deck, running extra passes only when they are needed.
+
+After every pass the auxiliary files that feed back into the next run
+(.aux, .nav, .toc, .snm, .out) are hashed. Another pass is run only if one
+of them changed, up to --max-passes. A deck without cross-references or a
+table of contents whose auxiliary files are already settled finishes in a
+single pass.
+
+With --preamble-format the deck's package block is loaded from a
+precompiled format (see preamble_format.py); if that fails the deck is
+compiled again the usual way.
+
+With --tikz-cache TikZ pictures are memoized into the shared, content-
+addressed cache in .cache/tikz (see tikz_cache.py). Whenever a pass
+memoized new pictures they are extracted and one more pass is run.
+
+Every compile appends its pass count, wall time, peak RSS, page count and
+output size to the build statistics (see build_stats.py). The .log of the
+last pass is parsed (see latex_log.py) and its errors are printed with
+file:line instead of the engine's stderr.
+
+With --out-of-tree the deck is compiled in a scratch directory of its own
+(on tmpfs under /dev/shm when available, otherwise .cache/build) through
+-output-directory, so no .aux/.log/.nav/... files land in */slides/. The
+scratch directory keeps the auxiliary files between builds and is locked
+while in use; only the finished PDF is moved next to the deck, atomically.
+
+Usage:
+    python scripts/compile_deck.py [--engine xelatex] [--max-passes 4] [--preamble-format]
+                                   [--tikz-cache] [--out-of-tree] <deck.tex>
+"""
+
+import argparse
+import fcntl
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from build_stats import record_build
+from latex_log import LogEntry, format_summary, parse_log
+from preamble_format import body_path, ensure_format, format_environment, split_preamble, write_body
+from slide_deps import REPO_ROOT
+from tikz_cache import cache_environment, cache_prelude, extract_externs
+
+RERUN_EXTENSIONS = ['.aux', '.nav', '.toc', '.snm', '.out']
+
+
+def _scratch_root() -> Path:
+    shm = Path('/dev/shm')
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        checkout = hashlib.sha256(str(REPO_ROOT).encode()).hexdigest()[:8]
+        return shm / f"ml-teaching-{os.getuid()}-{checkout}"
+    return REPO_ROOT / ".cache" / "build"
+
+
+SCRATCH_ROOT = _scratch_root()
+
+
+class CompileResult:
+    def __init__(self, tex_file: Path):
+        self.tex_file = tex_file
+        self.passes = 0
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self.stderr = ''
+        self.format_name: Optional[str] = None
+        self.new_pictures = 0
+        self.peak_rss_kb = 0
+        self.wall_time = 0.0
+        self.log_entries: List[LogEntry] = []
+        self.work_dir = tex_file.parent  # where the engine writes its output
+
+    @property
+    def pdf_file(self) -> Path:
+        return self.tex_file.with_suffix('.pdf')
+
+    @property
+    def log_file(self) -> Path:
+        return self.work_dir / f"{self.tex_file.stem}.log"
+
+    @property
+    def errors(self) -> List[LogEntry]:
+        return [entry for entry in self.log_entries if entry.level == 'error']
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def scratch_dir(tex_file: Path) -> Path:
+    """The deck's own out-of-tree build directory."""
+    digest = hashlib.sha256(str(tex_file).encode()).hexdigest()[:12]
+    return SCRATCH_ROOT / f"{tex_file.stem}-{digest}"
+
+
+def aux_state(tex_file: Path, work_dir: Optional[Path] = None) -> Dict[str, Optional[str]]:
+    """Hash the auxiliary files that can make another pass necessary."""
+    state = {}
+    for ext in RERUN_EXTENSIONS:
+        aux_file = (work_dir or tex_file.parent) / f"{tex_file.stem}{ext}"
+        try:
+            state[ext] = hashlib.sha256(aux_file.read_bytes()).hexdigest()
+        except OSError:
+            state[ext] = None
+    return state
+
+
+def warm_format(tex_file, engine: str = 'xelatex', tikz_cache: bool = False) -> Optional[str]:
+    """Dump the preamble format a later ``compile_deck(..., preamble_format=True)``
+    of this deck will use, so its first compile does not pay for it."""
+    tex_file = Path(tex_file).resolve()
+    head, _ = split_preamble(tex_file.read_text(encoding='utf-8', errors='ignore'))
+    if not head:
+        return None
+    prelude = cache_prelude(tex_file, engine) if tikz_cache else ''
+    return ensure_format(head, tex_file.parent, engine, prelude=prelude)
+
+
+def _format_command(tex_file: Path, engine: str, interaction: str, prelude: str = ''):
+    """Command line that compiles the deck from its precompiled preamble, or None."""
+    head, body = split_preamble(tex_file.read_text(encoding='utf-8', errors='ignore'))
+    if not head:
+        return None, None
+    format_name = ensure_format(head, tex_file.parent, engine, prelude=prelude)
+    if not format_name:
+        return None, None
+    body_file = write_body(tex_file, head, body)
+    return format_name, [engine, f'-fmt={format_name}', f'-interaction={interaction}',
+                         f'-jobname={tex_file.stem}', str(body_file)]
+
+
+def run_pass(command, cwd: Path, env: Optional[dict], timeout: int):
+    """Run one engine pass; return (returncode, stderr, peak RSS in KiB).
+
+    The child is reaped with os.wait4 so its own peak RSS is known, which
+    resource.getrusage(RUSAGE_CHILDREN) cannot give inside a worker that
+    compiles several decks. Raises subprocess.TimeoutExpired.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                                   stdout=subprocess.DEVNULL, stderr=stderr)
+        deadline = time.monotonic() + timeout
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.monotonic() > deadline:
+                process.kill()
+                process.wait()
+                raise subprocess.TimeoutExpired(command, timeout)
+            time.sleep(0.05)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        stderr.seek(0)
+        return process.returncode, stderr.read().decode(errors='replace'), rusage.ru_maxrss
+
+
+def _scratch_environment(tex_file: Path, env: Optional[dict]) -> dict:
+    """Search the deck directory, its topic's assets and shared/ for inputs,
+    then kpathsea's defaults (the trailing separator)."""
+    env = dict(os.environ if env is None else env)
+    search = [str(tex_file.parent), f"{tex_file.parent.parent / 'assets'}//", f"{REPO_ROOT / 'shared'}//"]
+    env['TEXINPUTS'] = os.pathsep.join(['.', *search, env.get('TEXINPUTS', '')])
+    return env
+
+
+def _place_pdf(built: Path, target: Path):
+    """Copy ``built`` next to the deck and rename it over ``target`` in one step,
+    so readers never see a half-written PDF."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.stem}-", suffix='.pdf', dir=target.parent)
+    try:
+        with os.fdopen(fd, 'wb') as tmp, open(built, 'rb') as source:
+            shutil.copyfileobj(source, tmp)
+        os.replace(tmp_name, target)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _compile(tex_file: Path, engine: str, max_passes: int, timeout: int, interaction: str,
+             preamble_format: bool, tikz_cache: bool, work_dir: Optional[Path] = None,
+             deadline: Optional[float] = None) -> CompileResult:
+    result = CompileResult(tex_file)
+    command = [engine, f'-interaction={interaction}', tex_file.name]
+    env = None
+    prelude = ''
+
+    if tikz_cache:
+        # The definitions must come before the deck loads custom.sty
+        prelude = cache_prelude(tex_file, engine)
+        command = [engine, f'-interaction={interaction}', f'-jobname={tex_file.stem}',
+                   f'{prelude}\\input{{{tex_file.name}}}']
+        env = cache_environment()
+
+    if preamble_format:
+        format_name, format_command = _format_command(tex_file, engine, interaction, prelude)
+        if format_command:
+            result.format_name = format_name
+            command, env = format_command, format_environment(env)
+
+    if work_dir:
+        # The engine still runs from the deck directory, so the decks'
+        # relative ../../shared paths keep working
+        command.insert(1, f'-output-directory={work_dir}')
+        env = _scratch_environment(tex_file, env)
+        result.work_dir = work_dir
+        (work_dir / f"{tex_file.stem}.pdf").unlink(missing_ok=True)
+
+    before = aux_state(tex_file, work_dir)
+    while result.passes < max_passes:
+        pass_timeout = timeout
+        if deadline is not None:
+            # The deck's budget also bounds the passes that are left
+            pass_timeout = min(timeout, deadline - time.monotonic())
+            if pass_timeout <= 0:
+                result.timed_out = True
+                break
+        result.passes += 1
+        try:
+            result.returncode, result.stderr, peak_rss = run_pass(command, tex_file.parent, env, pass_timeout)
+        except subprocess.TimeoutExpired:
+            result.timed_out = True
+            break
+        result.peak_rss_kb = max(result.peak_rss_kb, peak_rss)
+
+        after = aux_state(tex_file, work_dir)
+        # New pictures are typeset in place and as extra pages on this
+        # pass; once extracted, the next pass reads them from the cache
+        new_pictures = extract_externs(tex_file, env, work_dir) if tikz_cache and result.success else 0
+        result.new_pictures += new_pictures
+        if after == before and not new_pictures:
+            break
+        before = after
+    return result
+
+
+def compile_deck(tex_file, engine: str = 'xelatex', max_passes: int = 4,
+                 timeout: int = 120, interaction: str = 'batchmode',
+                 preamble_format: bool = False, tikz_cache: bool = False,
+                 out_of_tree: bool = False, stats: bool = True,
+                 deck_timeout: Optional[float] = None) -> CompileResult:
+    """Run ``engine`` on a deck until its auxiliary files stop changing.
+
+    ``timeout`` applies to each pass separately, ``deck_timeout`` (if given)
+    to all passes of the deck together. Unless ``stats`` is False the
+    outcome is appended to the build statistics (see build_stats.py).
+    """
+    tex_file = Path(tex_file).resolve()
+    started = time.monotonic()
+    deadline = started + deck_timeout if deck_timeout else None
+    work_dir = scratch_dir(tex_file) if out_of_tree else None
+    if work_dir:
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+    # Two builds of the same deck take turns on its scratch directory
+    with open(work_dir / '.lock' if work_dir else os.devnull, 'w') as lock_file:
+        if work_dir:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        result = _compile(tex_file, engine, max_passes, timeout, interaction,
+                          preamble_format, tikz_cache, work_dir, deadline)
+
+        if result.format_name and not result.success and not result.timed_out:
+            # Some preambles don't survive being dumped; fall back to a normal run
+            failed = result
+            result = _compile(tex_file, engine, max_passes, timeout, interaction,
+                              False, tikz_cache, work_dir, deadline)
+            result.passes += failed.passes
+            result.peak_rss_kb = max(result.peak_rss_kb, failed.peak_rss_kb)
+
+        built = (work_dir / result.pdf_file.name) if work_dir else None
+        if built and built.exists() and not result.timed_out:
+            # Like an in-tree run, a PDF produced despite errors is kept
+            _place_pdf(built, result.pdf_file)
+
+    result.wall_time = time.monotonic() - started
+    if result.log_file.exists():
+        # Report a format-based compile against the deck, not its body file
+        aliases = {str(body_path(tex_file)): f"./{tex_file.name}"}
+        result.log_entries = list(parse_log(result.log_file, aliases))
+    if stats:
+        record_build(result, engine)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a LaTeX deck with rerun detection")
+    parser.add_argument('tex_file', help='Deck to compile')
+    parser.add_argument('--engine', default='xelatex', help='TeX engine (default: xelatex)')
+    parser.add_argument('--max-passes', type=int, default=4, help='Upper bound on passes (default: 4)')
+    parser.add_argument('--timeout', type=int, default=120, help='Timeout per pass in seconds (default: 120)')
+    parser.add_argument('--deck-timeout', type=int, help='Timeout for all passes together in seconds')
+    parser.add_argument('--preamble-format', action='store_true',
+                        help='Load the package block from a precompiled format')
+    parser.add_argument('--tikz-cache', action='store_true',
+                        help='Reuse TikZ pictures from the shared cache in .cache/tikz')
+    parser.add_argument('--out-of-tree', action='store_true',
+                        help='Compile in a scratch directory and only move the PDF into place')
+    args = parser.parse_args()
+
+    try:
+        result = compile_deck(args.tex_file, engine=args.engine,
+                              max_passes=max(1, args.max_passes), timeout=args.timeout,
+                              deck_timeout=args.deck_timeout,
+                              preamble_format=args.preamble_format, tikz_cache=args.tikz_cache,
+                              out_of_tree=args.out_of_tree)
+    except FileNotFoundError:
+        print(f"    💥 {args.engine} not found on PATH")
+        return 1
+    plural = 'es' if result.passes != 1 else ''
+    if result.timed_out:
+        print(f"    ⏰ Timeout in pass {result.passes}: {args.tex_file}")
+    elif not result.success:
+        print(f"    ⚠️  {args.engine} exited with {result.returncode} after {result.passes} pass{plural}")
+        if result.log_entries:
+            print('\n'.join(f"      {line}" for line in format_summary(result.log_entries, limit=10).splitlines()))
+    else:
+        via = f" using {result.format_name}.fmt" if result.format_name else ''
+        pictures = ''
+        if result.new_pictures:
+            pictures = f", {result.new_pictures} new TikZ picture{'s' if result.new_pictures != 1 else ''} cached"
+        print(f"    🔁 {result.passes} pass{plural}{via}{pictures}")
+    return 0 if result.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
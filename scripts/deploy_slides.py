@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Deploy slide PDFs, touching only the ones whose content changed.
+
+Each PDF is hashed and compared with the copy recorded in the destination's
+deploy manifest (<dest>/.deploy-manifest.json). Unchanged PDFs are skipped.
+Changed or new ones are placed with the cheapest method the filesystem
+offers:
+
+1. reflink (FICLONE; btrfs, XFS, ...): a copy-on-write clone, no data copied
+2. hard link, only with --hardlink: safe only when the build replaces a PDF
+   with a new file instead of rewriting it, as compile_deck.py --out-of-tree
+   does (the topic Makefiles). An in-tree engine run rewrites deck.pdf
+   through the same inode, which would truncate the deployed link mid-build
+3. plain copy
+
+Every placement goes through a temporary name and a rename, so the
+destination never holds a partial PDF. The manifest lists the files that
+changed since the last publish, so the publish step can upload only those
+and then run --mark-published.
+
+Usage:
+    python scripts/deploy_slides.py --dest slides supervised/slides/*.pdf
+    python scripts/deploy_slides.py --dest slides --hardlink supervised/slides/*.pdf   # out-of-tree builds
+    python scripts/deploy_slides.py --dest slides --changed          # pending uploads
+    python scripts/deploy_slides.py --dest slides --mark-published
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from build_cache import file_hash, manifest_lock
+
+MANIFEST_NAME = ".deploy-manifest.json"
+MANIFEST_VERSION = 1
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from <linux/fs.h>
+
+
+class DeployManifest:
+    """What was deployed to a directory and what is waiting to be published."""
+
+    def __init__(self, dest: Path):
+        self.path = dest / MANIFEST_NAME
+        self.files: Dict[str, dict] = {}
+        self.pending: List[str] = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.files = data.get('files', {})
+            self.pending = data.get('pending', [])
+
+    def save(self):
+        data = {'version': MANIFEST_VERSION, 'files': self.files, 'pending': sorted(set(self.pending))}
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix='.deploy-manifest-', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, self.path)
+
+    def is_current(self, name: str, digest: str, target: Path) -> bool:
+        """True if ``target`` still holds the deployed copy with hash ``digest``."""
+        entry = self.files.get(name)
+        if not entry or entry['sha256'] != digest:
+            return False
+        try:
+            stat = target.stat()
+        except OSError:
+            return False
+        # Size and mtime show whether the deployed file was touched since
+        if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+            return True
+        # Touched but not changed, e.g. a hard-linked PDF touched by make on a cache hit
+        if stat.st_size == entry['size'] and file_hash(target) == digest:
+            self.refresh(name, target)
+            return True
+        return False
+
+    def refresh(self, name: str, target: Path):
+        """Accept a post-processed ``target`` as the deployed copy of ``name``."""
+        entry = self.files.get(name)
+        if entry:
+            stat = target.stat()
+            entry['size'], entry['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+
+
+def _reflink(source: Path, tmp: Path):
+    with open(source, 'rb') as src, open(tmp, 'wb') as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def _linked(source: Path, target: Path) -> bool:
+    return target.exists() and os.path.samefile(source, target)
+
+
+def place(source: Path, target: Path, hardlink: bool = False) -> str:
+    """Put ``source`` at ``target`` atomically; return the method used.
+    Hard links are only tried with ``hardlink`` (sources replaced atomically)."""
+    # rename() between two links to one inode does nothing and would leave tmp behind
+    if hardlink and _linked(source, target):
+        return 'hardlink'
+    tmp = target.parent / f".{target.name}.{os.getpid()}.tmp"
+    methods = [('reflink', _reflink), ('hardlink', os.link), ('copy', shutil.copyfile)]
+    if not hardlink:
+        methods = [(method, action) for method, action in methods if method != 'hardlink']
+    for method, action in methods:
+        try:
+            tmp.unlink(missing_ok=True)
+            action(source, tmp)
+            os.replace(tmp, target)
+            return method
+        except OSError:
+            continue
+    tmp.unlink(missing_ok=True)
+    raise OSError(f"could not deploy {source} to {target}")
+
+
+def deploy(pdfs: List[Path], dest: Path, hardlink: bool = False) -> Dict[str, List[str]]:
+    """Deploy ``pdfs`` into ``dest``; return the names per outcome. With
+    ``hardlink`` the PDFs may be hard-linked (see place())."""
+    dest.mkdir(parents=True, exist_ok=True)
+    outcome = {'unchanged': [], 'reflink': [], 'hardlink': [], 'copy': [], 'missing': []}
+
+    # Topics may deploy into the same directory at the same time
+    with manifest_lock(dest / MANIFEST_NAME):
+        manifest = DeployManifest(dest)
+        for pdf in pdfs:
+            if not pdf.is_file():
+                outcome['missing'].append(pdf.name)
+                continue
+            target = dest / pdf.name
+            digest = file_hash(pdf)
+            # Without hard links, a link left by an earlier deploy is replaced by a copy
+            relinked = not hardlink and _linked(pdf, target)
+            if not relinked and (manifest.is_current(pdf.name, digest, target) or (
+                    pdf.name not in manifest.files and target.exists() and file_hash(target) == digest)):
+                outcome['unchanged'].append(pdf.name)
+                if pdf.name in manifest.files:
+                    continue
+            else:
+                outcome[place(pdf, target, hardlink)].append(pdf.name)
+                manifest.pending.append(pdf.name)
+
+            stat = target.stat()
+            manifest.files[pdf.name] = {
+                'sha256': digest,
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'source': os.path.relpath(pdf.resolve(), dest.resolve()),
+                'deployed': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+        manifest.save()
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deploy slide PDFs, skipping unchanged ones")
+    parser.add_argument('pdfs', nargs='*', help='PDF files to deploy')
+    parser.add_argument('--dest', required=True, help='Destination directory')
+    parser.add_argument('--hardlink', action='store_true',
+                        help='Allow hard links (only for PDFs built with compile_deck.py --out-of-tree)')
+    parser.add_argument('--changed', action='store_true',
+                        help='List the files deployed since the last --mark-published')
+    parser.add_argument('--mark-published', action='store_true',
+                        help='Clear the list of files waiting to be published')
+    args = parser.parse_args()
+    dest = Path(args.dest)
+
+    if args.changed or args.mark_published:
+        with manifest_lock(dest / MANIFEST_NAME):
+            manifest = DeployManifest(dest)
+            if args.changed:
+                for name in sorted(set(manifest.pending)):
+                    print(dest / name)
+            if args.mark_published:
+                manifest.pending = []
+                manifest.save()
+        return 0
+
+    outcome = deploy([Path(pdf) for pdf in args.pdfs], dest, args.hardlink)
+    placed = sum(len(outcome[method]) for method in ('reflink', 'hardlink', 'copy'))
+    for method in ('reflink', 'hardlink', 'copy'):
+        for name in outcome[method]:
+            print(f"  📤 {name} ({method})")
+    for name in outcome['missing']:
+        print(f"  ❌ {name} not built")
+    print(f"📦 Deployed {placed} changed PDF{'s' if placed != 1 else ''} to {dest}, "
+          f"{len(outcome['unchanged'])} unchanged")
+    return 1 if outcome['missing'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,18 @@
 Enhance notebook metadata with comprehensive and specific tags.
 
 This script analyzes notebook content and metadata to add more comprehensive tags
-based on actual content, imports, and ML concepts used.
+based on actual content, imports, and ML concepts used. The edit is the "tags"
+pass of notebook_transforms.py.
 """
 
-import json
-import shutil
 import re
 from pathlib import Path
 from collections import defaultdict
 
+from notebook_transforms import add_arguments, find_notebooks, report, transform_notebooks
+
+ADDED_TAGS_PREFIX = 'added tags: '
+
 def extract_tags_from_content(notebook_data, filename):
     """Extract comprehensive tags from notebook content and filename."""
     tags = set()
@@ -220,11 +223,8 @@ def get_current_tags(notebook_data):
     
     return []
 
-def update_notebook_tags(notebook_path, dry_run=False):
-    """Update notebook with enhanced tags."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        notebook_data = json.load(f)
-    
+def tags_pass(notebook_data, notebook_path):
+    """Merge the tags inferred from the name and code into the front matter."""
     # Get current and new tags
     current_tags = get_current_tags(notebook_data)
     new_tags = extract_tags_from_content(notebook_data, notebook_path.stem)
@@ -233,82 +233,55 @@ def update_notebook_tags(notebook_path, dry_run=False):
     all_tags = sorted(list(set(current_tags + new_tags)))
     
     if set(current_tags) == set(all_tags):
-        return False, f"Tags already comprehensive ({len(current_tags)} tags)"
+        return []
     
-    print(f"Enhancing tags for {notebook_path.name}:")
-    print(f"  Current tags ({len(current_tags)}): {current_tags[:3]}{'...' if len(current_tags) > 3 else ''}")
-    print(f"  Enhanced tags ({len(all_tags)}): {all_tags[:5]}{'...' if len(all_tags) > 5 else ''}")
-    print(f"  Added {len(all_tags) - len(current_tags)} new tags")
+    # Update the raw cell with new tags
+    if not (notebook_data.get('cells') and notebook_data['cells'][0].get('cell_type') == 'raw'):
+        return []
+    source = ''.join(notebook_data['cells'][0].get('source', []))
     
-    if dry_run:
-        print("  [DRY RUN - no changes made]")
-        return True, "Would enhance tags"
+    # Format new tags
+    tags_yaml = '[' + ', '.join(f'"{tag}"' for tag in all_tags) + ']'
     
-    # Update the raw cell with new tags
-    if notebook_data.get('cells') and notebook_data['cells'][0].get('cell_type') == 'raw':
-        source = ''.join(notebook_data['cells'][0].get('source', []))
-        
-        # Format new tags
-        tags_yaml = '[' + ', '.join(f'"{tag}"' for tag in all_tags) + ']'
-        
-        # Replace tags in YAML
-        new_source = re.sub(r'tags:\s*\[.*?\]', f'tags: {tags_yaml}', source, flags=re.DOTALL)
-        
-        # Update the cell
-        notebook_data['cells'][0]['source'] = [new_source]
-        
-        # Backup and save
-        backup_path = notebook_path.with_suffix('.ipynb.backup-tags')
-        shutil.copy2(notebook_path, backup_path)
-        
-        with open(notebook_path, 'w', encoding='utf-8') as f:
-            json.dump(notebook_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"  ✓ Enhanced tags and created backup: {backup_path.name}")
-        return True, "Enhanced tags"
-    
-    return False, "No raw metadata cell found"
+    # Replace tags in YAML; front matter without a tags list is left alone
+    new_source = re.sub(r'tags:\s*\[.*?\]', lambda _: f'tags: {tags_yaml}', source, count=1, flags=re.DOTALL)
+    if new_source == source:
+        return []
+    
+    # Update the cell
+    notebook_data['cells'][0]['source'] = [new_source]
+    added = sorted(set(all_tags) - set(current_tags))
+    return [ADDED_TAGS_PREFIX + ', '.join(added)]
 
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="Enhance notebook metadata with comprehensive tags")
     parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
     parser.add_argument('--limit', type=int, help='Limit number of notebooks to process')
+    add_arguments(parser)
     args = parser.parse_args()
     
-    notebooks = list(Path('notebooks').glob('**/*.ipynb'))
+    notebooks = find_notebooks([Path('notebooks')])
     if args.limit:
         notebooks = notebooks[:args.limit]
     
     print(f"Found {len(notebooks)} notebooks to enhance:")
     
-    enhanced_count = 0
     tag_stats = defaultdict(int)
     
-    for notebook in sorted(notebooks):
-        try:
-            enhanced, reason = update_notebook_tags(notebook, dry_run=args.dry_run)
-            if enhanced:
-                enhanced_count += 1
-                # Collect tag statistics
-                if not args.dry_run:
-                    new_tags = extract_tags_from_content(
-                        json.load(open(notebook, 'r')), 
-                        notebook.stem
-                    )
-                    for tag in new_tags:
-                        tag_stats[tag] += 1
-            else:
-                print(f"Skipped {notebook.name}: {reason}")
-            print()
-        except Exception as e:
-            print(f"  ✗ Error processing {notebook.name}: {e}")
-            print()
-    
-    print(f"Summary: {enhanced_count} notebooks {'would be ' if args.dry_run else ''}enhanced")
-    
-    if not args.dry_run and tag_stats:
-        print(f"\nMost common tags:")
+    def count_tags(results):
+        # Tag statistics from the pass messages, while they are reported
+        for result in results:
+            for _, message in result['changes']:
+                for tag in message[len(ADDED_TAGS_PREFIX):].split(', '):
+                    tag_stats[tag] += 1
+            yield result
+    
+    results = transform_notebooks(notebooks, [('tags', {})], args.jobs, args.dry_run, 'tags')
+    report(count_tags(results), args.dry_run)
+    
+    if tag_stats:
+        print(f"\nMost {'commonly added' if not args.dry_run else 'commonly missing'} tags:")
         for tag, count in sorted(tag_stats.items(), key=lambda x: x[1], reverse=True)[:10]:
             print(f"  {tag}: {count} notebooks")
 
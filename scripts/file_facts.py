@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Facts the validators need from each file, cached on disk.
+
+Instead of parsing every .tex file and notebook on each run, the validators
+check facts extracted once per file version:
+
+- .tex: \\includegraphics targets (with line numbers, outside comments),
+  \\includepdf targets and notebookbox URLs
+- .ipynb: per cell, the number of image references and the relative paths
+  it mentions, plus the raw front matter cell Quarto reads the metadata from
+- links ([text](url), ![alt](src), href/src attributes) of .qmd/.md files
+  and notebook markdown cells, and \\href/\\url targets in .tex files, for
+  check_links.py
+- anchors of .qmd/.md files and notebooks (heading ids and explicit ids,
+  see anchor_index.py), for checking fragment links
+
+Facts are stored in .cache/validators/facts.json keyed by path. An entry is
+reused as long as the file's size and mtime match; when only the mtime
+changed (a checkout, a touch) the SHA-256 of the contents decides, so the
+file is read but not parsed again. Bump FACTS_VERSION when an extractor
+changes.
+
+Usage:
+    python scripts/file_facts.py show FILE          # facts of one file
+    python scripts/file_facts.py stats              # number of cached files
+    python scripts/file_facts.py clear              # remove the cache
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from anchor_index import markdown_anchors, notebook_anchors
+from latex_tokens import COMMAND, tokenize
+from slide_deps import REPO_ROOT
+
+FACTS_DIR = REPO_ROOT / ".cache" / "validators"
+FACTS_PATH = FACTS_DIR / "facts.json"
+FACTS_VERSION = 3
+
+INCLUDEGRAPHICS_PATTERN = re.compile(r'\\includegraphics(?:\[[^\]]*\])?\s*\{\s*([^}]+)\s*\}', re.IGNORECASE)
+# Pattern matches: \includepdf[options]{path/to/file.pdf}
+INCLUDEPDF_PATTERN = re.compile(r'\\includepdf(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+NOTEBOOKBOX_PATTERN = re.compile(r'\\begin\{notebookbox\}\{([^}]+)\}', re.IGNORECASE)
+
+IMAGE_PATTERNS = [
+    re.compile(r'!\[[^\]]*\]\([^)]*\.(png|jpg|jpeg|pdf|svg|gif)[^)]*\)', re.IGNORECASE),  # Markdown images
+    re.compile(r'Image\([^)]*["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^)]*\)', re.IGNORECASE),  # Python Image()
+    re.compile(r'plt\.savefig\([^)]*["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^)]*\)', re.IGNORECASE),  # savefig
+    re.compile(r'<img[^>]*src=["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^>]*>', re.IGNORECASE),  # HTML img
+]
+# Relative paths as written in cells; a path pattern a validator looks for
+# ("../shared/figures/...") always lies inside one of these
+RELATIVE_PATH_PATTERN = re.compile(r'\.\./[^\s\'"()<>\[\]{},;]+')
+
+# [text](url "title") and ![alt](url); <url> brackets and titles are dropped.
+# The text may hold an image, as in a [![badge](badge.svg)](url) badge.
+MARKDOWN_LINK_PATTERN = re.compile(r'!?\[((?:!\[[^\]]*\]\([^)]*\)|[^\[\]])*)\]'
+                                   r'\(\s*<?([^)\s>]+)>?(?:\s+["\'][^)]*["\'])?\s*\)')
+HTML_LINK_PATTERN = re.compile(r'<(?:a|img)\b[^>]*?\b(?:href|src)=["\']([^"\']+)["\']', re.IGNORECASE)
+CODE_SPAN_PATTERN = re.compile(r'`+[^`]*`+')
+
+
+def markdown_links(text: str) -> list:
+    """[line, text, url] of the links in markdown, outside code."""
+    links, fence = [], None
+    for line_num, line in enumerate(text.split('\n'), 1):
+        stripped = line.lstrip()
+        if stripped.startswith(('```', '~~~')):
+            marker = stripped[:3]
+            fence = None if fence == marker else (fence or marker)
+            continue
+        if fence:
+            continue
+        line = CODE_SPAN_PATTERN.sub('', line)
+        for label, url in MARKDOWN_LINK_PATTERN.findall(line):
+            links.append([line_num, label.strip(), url])
+            if '](' in label:
+                links.extend([line_num, alt.strip(), src] for alt, src in MARKDOWN_LINK_PATTERN.findall(label))
+        links.extend([line_num, '', url] for url in HTML_LINK_PATTERN.findall(line))
+    return links
+
+
+def latex_links(text: str) -> list:
+    """[line, text, url] of the \\href and \\url targets outside comments."""
+    return [[token.line, token.arg, token.arg] for token in tokenize(text)
+            if token.kind == COMMAND and token.name in ('href', 'url') and token.arg]
+
+
+def tex_facts(text: str) -> dict:
+    includegraphics, notebookbox = [], []
+    for line_num, line in enumerate(text.split('\n'), 1):
+        if not line.strip().startswith('%'):
+            includegraphics.extend([line_num, path.strip()] for path in INCLUDEGRAPHICS_PATTERN.findall(line))
+        notebookbox.extend([line_num, url] for url in NOTEBOOKBOX_PATTERN.findall(line))
+    return {
+        'includegraphics': includegraphics,
+        'includepdf': [path.strip() for path in INCLUDEPDF_PATTERN.findall(text)],
+        'notebookbox': notebookbox,
+        'links': latex_links(text),
+    }
+
+
+def markdown_facts(text: str) -> dict:
+    return {'links': markdown_links(text), 'anchors': markdown_anchors(text)}
+
+
+def notebook_facts(text: str) -> dict:
+    try:
+        notebook = json.loads(text)
+    except ValueError as e:
+        return {'error': str(e)}
+
+    cells, links = [], []
+    for index, cell in enumerate(notebook.get('cells', [])):
+        source = cell.get('source', [])
+        source_text = ''.join(source) if isinstance(source, list) else source
+        if cell.get('cell_type') == 'markdown':
+            # Lines are counted within the cell
+            links.extend([*link, index] for link in markdown_links(source_text))
+        images = sum(len(pattern.findall(source_text)) for pattern in IMAGE_PATTERNS)
+        paths = RELATIVE_PATH_PATTERN.findall(source_text)
+        if images or paths:
+            cells.append({'id': cell.get('id', 'unknown'), 'images': images, 'paths': paths})
+
+    front_matter = None
+    first = notebook['cells'][0] if notebook.get('cells') else {}
+    if first.get('cell_type') == 'raw':
+        source = first.get('source', [])
+        front_matter = ''.join(source) if isinstance(source, list) else source
+    return {'cells': cells, 'front_matter': front_matter, 'links': links,
+            'anchors': notebook_anchors(notebook.get('cells', []))}
+
+
+EXTRACTORS = {'.tex': tex_facts, '.ipynb': notebook_facts, '.md': markdown_facts, '.qmd': markdown_facts}
+
+
+def extract_facts(source) -> dict:
+    """Facts of a repo_scanner.SourceFile, parsed from its contents."""
+    extractor = EXTRACTORS.get(source.suffix)
+    if extractor is None:
+        return {}
+    text = source.text
+    if isinstance(source.error, OSError):
+        return {'error': str(source.error)}
+    facts = extractor(text)
+    if source.error:
+        facts['undecodable'] = str(source.error)
+    return facts
+
+
+class FactCache:
+    """Facts per file, valid while (size, mtime) or the content hash match."""
+
+    def __init__(self, path: Path = FACTS_PATH):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        self.changed_keys = set()
+        self.dirty = False
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == FACTS_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        absolute = os.path.abspath(path)
+        try:
+            return Path(absolute).relative_to(REPO_ROOT).as_posix()
+        except ValueError:
+            return absolute
+
+    def facts(self, source) -> dict:
+        try:
+            stat = source.path.stat()
+        except OSError:
+            return extract_facts(source)
+        key = self._key(source.path)
+        entry = self.entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['facts']
+
+        digest = hashlib.sha256(source.data).hexdigest()
+        if not entry or entry['sha256'] != digest:
+            entry = {'sha256': digest, 'facts': extract_facts(source)}
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        self.entries[key] = entry
+        self.changed_keys.add(key)
+        self.dirty = True
+        return entry['facts']
+
+    def changed(self) -> Dict[str, dict]:
+        """The entries added or refreshed since the cache was loaded."""
+        return {key: self.entries[key] for key in self.changed_keys}
+
+    def update(self, entries: Dict[str, dict]):
+        """Take over entries another process extracted (see repo_scanner)."""
+        if entries:
+            self.entries.update(entries)
+            self.changed_keys.update(entries)
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': FACTS_VERSION, 'files': self.entries}, f)
+        os.replace(tmp_name, self.path)
+        self.dirty = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the validators' fact cache")
+    parser.add_argument('command', choices=['show', 'stats', 'clear'])
+    parser.add_argument('file', nargs='?', help='File to show the facts of')
+    args = parser.parse_args()
+
+    if args.command == 'clear':
+        shutil.rmtree(FACTS_DIR, ignore_errors=True)
+        print(f"🗑️  Removed {FACTS_DIR}")
+    elif args.command == 'stats':
+        cache = FactCache()
+        size = FACTS_PATH.stat().st_size if FACTS_PATH.exists() else 0
+        print(f"📦 {len(cache.entries)} files cached in {FACTS_PATH} ({size / 1024:.0f} KiB)")
+    else:
+        if not args.file:
+            parser.error("show needs a FILE")
+        from repo_scanner import SourceFile
+        cache = FactCache()
+        print(json.dumps(cache.facts(SourceFile(Path(args.file))), indent=2))
+        cache.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
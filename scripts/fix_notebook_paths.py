@@ -2,149 +2,111 @@
 """
 Script to fix image paths in Jupyter notebooks for Quarto rendering.
 This script will update paths to point to the correct locations in the repository.
+
+The edit is the "image-paths" pass of notebook_transforms.py; the asset
+directories are walked once per run (AssetIndex) instead of once per image.
+
+Usage:
+    python scripts/fix_notebook_paths.py [--dry-run] [-j 4]
 """
 
+import argparse
+import functools
 import os
-import json
-import glob
-import shutil
-
-def find_actual_path(filename, search_dirs):
-    """Find the actual path of a file in the repository."""
-    for search_dir in search_dirs:
-        for root, dirs, files in os.walk(search_dir):
-            if filename in files:
-                # Return relative path from notebooks directory
-                rel_path = os.path.relpath(os.path.join(root, filename), 'notebooks')
-                return rel_path
-    return None
-
-def fix_notebook_paths(notebook_path):
-    """Fix image paths in a single notebook."""
-    
-    # Common search directories for assets
-    search_dirs = [
-        '../shared/figures',
-        '../supervised/assets', 
-        '../unsupervised/assets',
-        '../neural-networks/assets',
-        '../maths/assets',
-        '../optimization/assets',
-        '../datasets',
-        '../shared/assets'
-    ]
-    
-    print(f"Processing {notebook_path}")
-    
-    # Read notebook
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        notebook = json.load(f)
-    
-    modified = False
-    
-    # Process each cell
+import re
+
+from asset_index import AssetIndex
+from notebook_transforms import add_arguments, report, transform_notebooks
+from slide_deps import REPO_ROOT
+
+# Common search directories for assets, in order of preference
+SEARCH_DIRS = (
+    'shared/figures',
+    'supervised/assets',
+    'unsupervised/assets',
+    'neural-networks/assets',
+    'maths/assets',
+    'optimization/assets',
+    'datasets',
+    'shared/assets',
+)
+
+IMAGE = r'[^\'"()]+\.(?:png|jpg|jpeg|gif|svg)'
+
+# Image references: the path is the "path" group
+PATTERNS = [
+    re.compile(r'!\[[^\]]*\]\((?P<path>' + IMAGE + r')\)'),                   # ![alt](path) - Markdown images
+    re.compile(r"Image\(filename=['\"](?P<path>" + IMAGE + r")['\"]"),       # IPython display
+    re.compile(r"(?<![\w.])imread\(['\"](?P<path>" + IMAGE + r")['\"]"),     # imread('path')
+    re.compile(r"plt\.savefig\(['\"](?P<path>" + IMAGE + r")['\"]"),         # Matplotlib save
+    re.compile(r"cv2\.imread\(['\"](?P<path>" + IMAGE + r")['\"]"),          # OpenCV
+    re.compile(r"io\.imread\(['\"](?P<path>" + IMAGE + r")['\"]"),           # skimage
+]
+
+# Generated files (common in notebooks), never looked up
+GENERATED_NAMES = ('demo.gif', 'mnist.gif', 'algo.gif', 'temp.png')
+
+
+@functools.lru_cache(maxsize=None)
+def search_index() -> AssetIndex:
+    return AssetIndex(REPO_ROOT, SEARCH_DIRS)
+
+
+def find_actual_path(filename, notebook_dir):
+    """The first file called ``filename`` in SEARCH_DIRS, relative to ``notebook_dir``."""
+    matches = search_index().by_name.get(filename)
+    if not matches:
+        return None
+    return os.path.relpath(REPO_ROOT / matches[0], notebook_dir)
+
+
+def image_paths_pass(notebook, notebook_path):
+    """Point image references at the files in the asset directories."""
+    notebook_dir = os.path.abspath(os.path.dirname(notebook_path))
+    fixes = []
+
+    def fix(match):
+        image_path = match.group('path')
+        filename = os.path.basename(image_path)
+        if any(gen_name in filename for gen_name in GENERATED_NAMES):
+            return match.group()
+        actual_path = find_actual_path(filename, notebook_dir)
+        if not actual_path or actual_path == image_path:
+            return match.group()
+        fixes.append(f"{image_path} -> {actual_path}")
+        start, end = match.span('path')
+        return match.group()[:start - match.start()] + actual_path + match.group()[end - match.start():]
+
     for cell in notebook['cells']:
-        if 'source' in cell:
-            source_lines = cell['source'] if isinstance(cell['source'], list) else [cell['source']]
-            new_source = []
-            
-            for line in source_lines:
-                original_line = line
-                
-                # Look for image references in various formats
-                import re
-                
-                # Pattern 1: ![alt](path) - Markdown images
-                markdown_pattern = r'!\[([^\]]*)\]\(([^)]+\.(?:png|jpg|jpeg|gif|svg))\)'
-                
-                # Pattern 2: Image(filename='path') - IPython display
-                ipython_pattern = r"Image\(filename=['\"]([^'\"]+\.(?:png|jpg|jpeg|gif|svg))['\"]"
-                
-                # Pattern 3: imread('path') - Image loading
-                imread_pattern = r"imread\(['\"]([^'\"]+\.(?:png|jpg|jpeg|gif|svg))['\"]"
-                
-                # Pattern 4: plt.savefig('path') - Matplotlib save
-                savefig_pattern = r"plt\.savefig\(['\"]([^'\"]+\.(?:png|jpg|jpeg|gif|svg))['\"]"
-                
-                # Pattern 5: cv2.imread('path') - OpenCV
-                cv2_pattern = r"cv2\.imread\(['\"]([^'\"]+\.(?:png|jpg|jpeg|gif|svg))['\"]"
-                
-                # Pattern 6: io.imread('path') - skimage
-                skimage_pattern = r"io\.imread\(['\"]([^'\"]+\.(?:png|jpg|jpeg|gif|svg))['\"]"
-                
-                patterns = [
-                    (markdown_pattern, r'![\1]({})', 2),
-                    (ipython_pattern, r"Image(filename='{}')", 1),
-                    (imread_pattern, r"imread('{}')", 1),
-                    (savefig_pattern, r"plt.savefig('{}'", 1),
-                    (cv2_pattern, r"cv2.imread('{}')", 1),
-                    (skimage_pattern, r"io.imread('{}')", 1)
-                ]
-                
-                for pattern, replacement_template, path_group in patterns:
-                    matches = re.findall(pattern, line)
-                    
-                    for match in matches:
-                        if isinstance(match, tuple):
-                            image_path = match[path_group - 1]
-                        else:
-                            image_path = match
-                        
-                        # Extract just the filename
-                        filename = os.path.basename(image_path)
-                        
-                        # Skip if it's a generated file (common in notebooks)
-                        if any(gen_name in filename for gen_name in ['demo.gif', 'mnist.gif', 'algo.gif', 'temp.png']):
-                            continue
-                        
-                        # Find the actual path
-                        actual_path = find_actual_path(filename, search_dirs)
-                        
-                        if actual_path and actual_path != image_path:
-                            print(f"  Fixing: {image_path} -> {actual_path}")
-                            
-                            if pattern == markdown_pattern:
-                                line = re.sub(pattern, replacement_template.format(actual_path), line)
-                            else:
-                                line = re.sub(pattern, replacement_template.format(actual_path), line)
-                            
-                            modified = True
-                
-                new_source.append(line)
-            
-            if new_source != source_lines:
-                cell['source'] = new_source
-    
-    # Write back if modified
-    if modified:
-        # Create backup
-        backup_path = notebook_path + '.backup'
-        shutil.copy2(notebook_path, backup_path)
-        
-        # Write fixed notebook
-        with open(notebook_path, 'w', encoding='utf-8') as f:
-            json.dump(notebook, f, indent=2, ensure_ascii=False)
-        
-        print(f"  ✓ Fixed and backed up to {backup_path}")
-    else:
-        print(f"  ✓ No changes needed")
+        if 'source' not in cell:
+            continue
+        source_lines = cell['source'] if isinstance(cell['source'], list) else [cell['source']]
+        new_source = []
+        for line in source_lines:
+            for pattern in PATTERNS:
+                line = pattern.sub(fix, line)
+            new_source.append(line)
+        if new_source != source_lines:
+            cell['source'] = new_source if isinstance(cell['source'], list) else new_source[0]
+    return fixes
+
 
 def main():
     """Main function to process all notebooks."""
-    
-    # Change to the ml-teaching directory
-    os.chdir('/Users/nipun/git/ml-teaching')
-    
+    parser = argparse.ArgumentParser(description="Fix image paths in notebooks")
+    parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
+    add_arguments(parser)
+    args = parser.parse_args()
+
     # Find all notebooks
-    notebook_files = glob.glob('notebooks/*.ipynb')
-    
+    notebook_files = sorted((REPO_ROOT / 'notebooks').glob('*.ipynb'))
     print(f"Found {len(notebook_files)} notebooks to process")
-    
-    for notebook_path in notebook_files:
-        fix_notebook_paths(notebook_path)
-    
-    print("\nDone! All notebooks have been processed.")
-    print("Original files have been backed up with .backup extension.")
+
+    results = transform_notebooks(notebook_files, [('image-paths', {})], args.jobs, args.dry_run, 'image-paths')
+    report(results, args.dry_run)
+    if not args.dry_run:
+        print("Original files are in the backup store: python scripts/backup_store.py list")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
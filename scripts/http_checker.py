@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Check external URLs concurrently, with pooled connections and a result cache.
+
+The link checkers skip http(s) links; this one fetches them. It is a small
+asyncio HTTP/1.1 client (standard library only):
+
+- every distinct URL is checked once, however many pages link to it
+- connections are pooled and kept alive per host, at most ``per_host``
+  requests run against one host and ``concurrency`` in total
+- a URL is checked with HEAD; servers that refuse HEAD (400, 403, 404, 405,
+  501) are asked again with GET, whose body is drained (small bodies, so the
+  connection can be reused) or dropped with the connection
+- redirects are followed (up to MAX_REDIRECTS); a 429 or a timeout means
+  "try later" and is neither broken nor cached
+- results are kept in .cache/external-links.json: a working URL is not
+  fetched again for ``ttl`` seconds (a week), a broken one for a day
+
+``host_map`` sends the requests for a host to another address while keeping
+the URL (and the Host header), so a run can be tested offline against a
+local stand-in server:
+
+    python -m http.server 8000 --directory some/dir &
+    python scripts/http_checker.py --no-cache \\
+        --host-map nipunbatra.github.io=http://127.0.0.1:8000 \\
+        https://nipunbatra.github.io/ml-teaching/notebooks/basis.html
+
+Usage:
+    python scripts/http_checker.py URL [URL ...]     # or "-" to read URLs from stdin
+    python scripts/check_links.py --external         # the links of the site
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from slide_deps import REPO_ROOT
+
+CACHE_PATH = REPO_ROOT / ".cache" / "external-links.json"
+CACHE_VERSION = 1
+TTL = 7 * 24 * 3600
+FAILURE_TTL = 24 * 3600
+MAX_REDIRECTS = 5
+# Bodies up to this size are read to keep the connection; larger ones close it
+MAX_DRAIN = 64 * 1024
+# Servers that answer HEAD with these codes are asked again with GET
+HEAD_REFUSED = {400, 403, 404, 405, 501}
+REDIRECTS = {301, 302, 303, 307, 308}
+RATE_LIMITED = 429
+USER_AGENT = 'ml-teaching-link-checker/1.0 (+https://github.com/nipunbatra/ml-teaching)'
+
+
+class ResultCache:
+    """URL -> last result, with its check time; expired entries are ignored."""
+
+    def __init__(self, path: Path = CACHE_PATH, ttl: float = TTL, failure_ttl: float = FAILURE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.results: Dict[str, dict] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.results = data.get('results', {})
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[dict]:
+        result = self.results.get(url)
+        if result is None:
+            return None
+        age = (now or time.time()) - result.get('checked', 0)
+        return result if age < (self.ttl if result['ok'] else self.failure_ttl) else None
+
+    def put(self, result: dict):
+        if result['ok'] is not None:
+            self.results[result['url']] = result
+
+    def save(self):
+        """Write the cache atomically, dropping the entries that expired."""
+        now = time.time()
+        results = {url: result for url, result in self.results.items() if self.get(url, now)}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.external-links-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'results': results}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class _Response:
+    def __init__(self, status: int, headers: Dict[str, str], reusable: bool):
+        self.status = status
+        self.headers = headers
+        self.reusable = reusable
+
+
+class HostPool:
+    """Idle keep-alive connections to one address, and its concurrency limit."""
+
+    def __init__(self, per_host: int):
+        self.limit = asyncio.Semaphore(per_host)
+        self.idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle = []
+
+
+class HttpChecker:
+    def __init__(self, concurrency: int = 32, per_host: int = 4, timeout: float = 15.0,
+                 cache: Optional[ResultCache] = None, host_map: Optional[Dict[str, str]] = None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        # host -> "scheme://address:port" to connect to instead
+        self.host_map = host_map or {}
+        self.ssl_context = ssl.create_default_context()
+        self.requests = 0
+        self.connections = 0
+
+    def check(self, urls: Iterable[str]) -> Dict[str, dict]:
+        """Result of every distinct URL in ``urls`` (fragments dropped): a dict
+        with status, ok (None: rate limited or timed out), error, final_url and checked."""
+        return asyncio.run(self.check_async(urls))
+
+    async def check_async(self, urls: Iterable[str]) -> Dict[str, dict]:
+        results, pending = {}, []
+        for url in dict.fromkeys(url.split('#', 1)[0] for url in urls):
+            cached = self.cache.get(url) if self.cache else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        self._limit = asyncio.Semaphore(self.concurrency)
+        self._pools: Dict[Tuple[str, str, int], HostPool] = defaultdict(lambda: HostPool(self.per_host))
+        try:
+            for result in await asyncio.gather(*(self._check_url(url) for url in pending)):
+                results[result['url']] = result
+                if self.cache is not None:
+                    self.cache.put(result)
+        finally:
+            for pool in self._pools.values():
+                pool.close()
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    async def _check_url(self, url: str) -> dict:
+        result = {'url': url, 'status': None, 'ok': False, 'error': None, 'final_url': url}
+        async with self._limit:
+            try:
+                status, final_url = await self._fetch(url, 'HEAD')
+                if status in HEAD_REFUSED:
+                    status, final_url = await self._fetch(url, 'GET')
+                result.update(status=status, final_url=final_url,
+                              ok=None if status == RATE_LIMITED else status < 400)
+            except asyncio.TimeoutError:
+                result.update(ok=None, error=f"timed out after {self.timeout:g}s")
+            except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+                result['error'] = str(e) or type(e).__name__
+        result['checked'] = time.time()
+        return result
+
+    async def _fetch(self, url: str, method: str) -> Tuple[int, str]:
+        """Status of ``url`` after redirects, and the URL it ended at."""
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await asyncio.wait_for(self._request(url, method), self.timeout)
+            location = response.headers.get('location')
+            if response.status not in REDIRECTS or not location:
+                return response.status, url
+            url = urljoin(url, location)
+        raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+    def _address(self, parts) -> Tuple[str, str, int]:
+        scheme, host = parts.scheme, parts.hostname or ''
+        port = parts.port or (443 if scheme == 'https' else 80)
+        mapped = self.host_map.get(host) or self.host_map.get(parts.netloc)
+        if mapped:
+            target = urlsplit(mapped if '://' in mapped else f"http://{mapped}")
+            scheme, host = target.scheme, target.hostname
+            port = target.port or (443 if scheme == 'https' else 80)
+        if scheme not in ('http', 'https'):
+            raise ValueError(f"unsupported scheme {scheme!r}")
+        return scheme, host, port
+
+    async def _request(self, url: str, method: str) -> _Response:
+        parts = urlsplit(url)
+        address = self._address(parts)
+        pool = self._pools[address]
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        request = (f"{method} {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: {USER_AGENT}\r\n"
+                   f"Accept: */*\r\nAccept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n").encode('latin-1')
+        async with pool.limit:
+            # A pooled connection may have been closed by the server meanwhile:
+            # one more try on a fresh connection then
+            while True:
+                reused = bool(pool.idle)
+                reader, writer = pool.idle.pop() if reused else await self._connect(address)
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    response = await self._read_response(reader, method)
+                    break
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    if not reused:
+                        raise
+                except BaseException:
+                    writer.close()
+                    raise
+            self.requests += 1
+            if response.reusable:
+                pool.idle.append((reader, writer))
+            else:
+                writer.close()
+            return response
+
+    async def _connect(self, address: Tuple[str, str, int]):
+        scheme, host, port = address
+        self.connections += 1
+        if scheme == 'https':
+            return await asyncio.open_connection(host, port, ssl=self.ssl_context, server_hostname=host)
+        return await asyncio.open_connection(host, port)
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> _Response:
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b'', None)
+        version, status = status_line.decode('latin-1').split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        status = int(status)
+        reusable = version != 'HTTP/1.0' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            return _Response(status, headers, reusable)
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            reusable = reusable and await self._drain_chunked(reader)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if reusable and length <= MAX_DRAIN:
+                await reader.readexactly(length)
+            else:
+                reusable = False
+        else:
+            # The body ends when the server closes the connection
+            reusable = False
+        return _Response(status, headers, reusable)
+
+    @staticmethod
+    async def _drain_chunked(reader: asyncio.StreamReader) -> bool:
+        """Read a chunked body; False (connection not reusable) once it exceeds MAX_DRAIN."""
+        total = 0
+        while True:
+            size = int((await reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+            total += size
+            if total > MAX_DRAIN:
+                return False
+            if size == 0:
+                # Trailer lines up to the blank line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return True
+            await reader.readexactly(size + 2)
+
+
+def parse_host_map(entries: Iterable[str]) -> Dict[str, str]:
+    """["host=address", ...] -> {host: address}."""
+    host_map = {}
+    for entry in entries:
+        host, sep, address = entry.partition('=')
+        if not sep or not host or not address:
+            raise argparse.ArgumentTypeError(f"--host-map expects HOST=ADDRESS, got {entry!r}")
+        host_map[host] = address
+    return host_map
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """The options of the external check, shared with check_links.py."""
+    parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight (default: 32)')
+    parser.add_argument('--per-host', type=int, default=4, help='Requests in flight per host (default: 4)')
+    parser.add_argument('--timeout', type=float, default=15.0, help='Seconds per request (default: 15)')
+    parser.add_argument('--ttl', type=float, default=TTL / 3600,
+                        help=f'Hours a working URL stays cached (default: {TTL // 3600})')
+    parser.add_argument('--no-cache', action='store_true', help='Check every URL again, do not update the cache')
+    parser.add_argument('--host-map', action='append', default=[], metavar='HOST=ADDRESS',
+                        help='Connect to ADDRESS (e.g. http://127.0.0.1:8000) for HOST; repeatable')
+
+
+def from_arguments(args) -> HttpChecker:
+    cache = None if args.no_cache else ResultCache(ttl=args.ttl * 3600)
+    return HttpChecker(args.concurrency, args.per_host, args.timeout, cache, parse_host_map(args.host_map))
+
+
+def describe(result: dict) -> str:
+    if result['error']:
+        return result['error']
+    moved = f" → {result['final_url']}" if result['final_url'] != result['url'] else ''
+    return f"HTTP {result['status']}{moved}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check external URLs")
+    parser.add_argument('urls', nargs='+', help='URLs to check, or "-" to read them from stdin')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    urls = [line.strip() for line in sys.stdin if line.strip()] if args.urls == ['-'] else args.urls
+    checker = from_arguments(args)
+    start = time.monotonic()
+    results = checker.check(urls)
+    broken = 0
+    for url, result in results.items():
+        icon = '⏳' if result['ok'] is None else '✅' if result['ok'] else '❌'
+        broken += result['ok'] is False
+        print(f"{icon} {url}: {describe(result)}")
+    print(f"\n🌐 {len(results)} URLs, {broken} broken; {checker.requests} requests over "
+          f"{checker.connections} connections in {time.monotonic() - start:.1f}s")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
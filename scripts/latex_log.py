@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for LaTeX .log files.
+
+pdflatex/xelatex report real problems in the .log, not on stderr. This
+parser reads the log one line at a time (multi-MB beamer logs are never
+loaded whole) and extracts:
+
+- errors ("! ..." with the "l.<n>" line that follows, or file:line:error)
+- missing files ("File `x' not found")
+- undefined references and citations
+- overfull/underfull boxes
+- other LaTeX, class and package warnings
+
+Each entry carries the source file and line. The current file is tracked
+from the "(file" / ")" nesting TeX writes to the log, and lines TeX wrapped
+at max_print_line (79 characters) are joined back first.
+
+Usage:
+    python scripts/latex_log.py slides/knn.log                # readable summary
+    python scripts/latex_log.py slides/knn.tex --all          # log of the deck, including box warnings
+    python scripts/latex_log.py --json slides/*.log           # JSON for tools and CI
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+MAX_PRINT_LINE = 79
+
+ERROR_KINDS = ('error',)
+BOX_KINDS = ('overfull', 'underfull')
+
+# "(./knn.tex", "(/usr/share/texmf/tex/latex/beamer/beamer.cls" and the like
+FILE_OPEN_PATTERN = re.compile(r'\(("?)((?:\.{0,2}/|[A-Za-z]:[\\/]|[\w-])[^()\s"]*\.\w+)\1')
+FILE_LINE_ERROR_PATTERN = re.compile(r'^(\S+\.(?:tex|sty|cls|def|cfg|ltx|bbl)):(\d+): (.*)$')
+WARNING_PATTERN = re.compile(r'^((?:LaTeX|Package|Class)\b.*?\bWarning): (.*)$')
+CONTINUATION_PATTERN = re.compile(r'^\(([\w.@-]+)\)\s+(.*)$')
+INPUT_LINE_PATTERN = re.compile(r'on input line (\d+)')
+BOX_PATTERN = re.compile(r'^((Overfull|Underfull) \\[hv]box .*?)(?: in paragraph at lines (\d+)--\d+'
+                         r'| in alignment at lines (\d+)--\d+| detected at line (\d+)|$)')
+MISSING_FILE_PATTERN = re.compile(r"File [`'\"]?([^`'\"]+?)['\"]? not found")
+UNDEFINED_REF_PATTERN = re.compile(r"Reference [`'](.+?)' on page \d+ undefined")
+UNDEFINED_CITE_PATTERN = re.compile(r"Citation [`'](.+?)' on page \d+ undefined")
+ERROR_LINE_PATTERN = re.compile(r'^l\.(\d+)\s?(.*)$')
+
+
+class LogEntry:
+    """One problem reported in a log."""
+
+    def __init__(self, kind: str, message: str, file: Optional[str] = None,
+                 line: Optional[int] = None, context: str = ''):
+        self.kind = kind
+        self.message = message
+        self.file = file
+        self.line = line
+        self.context = context
+        # Fixed at creation: a "! LaTeX Error: File ... not found" stays an
+        # error after being re-labelled as missing-file
+        if kind in ERROR_KINDS:
+            self.level = 'error'
+        elif kind in BOX_KINDS:
+            self.level = 'badbox'
+        else:
+            self.level = 'warning'
+
+    @property
+    def location(self) -> str:
+        if self.file and self.line:
+            return f"{self.file}:{self.line}"
+        return self.file or '?'
+
+    def to_dict(self) -> dict:
+        return {'kind': self.kind, 'level': self.level, 'file': self.file, 'line': self.line,
+                'message': self.message, 'context': self.context}
+
+
+def logical_lines(raw_lines: Iterable[bytes], max_print_line: int = MAX_PRINT_LINE) -> Iterator[str]:
+    """Undo TeX's hard wrapping: a line of exactly ``max_print_line``
+    characters continues on the next one. pdfTeX counts bytes, XeTeX counts
+    characters, so either length counts."""
+    pending = ''
+    for raw in raw_lines:
+        raw = raw.rstrip(b'\r\n')
+        text = raw.decode('utf-8', errors='replace')
+        pending += text
+        if len(raw) == max_print_line or len(text) == max_print_line:
+            continue
+        yield pending
+        pending = ''
+    if pending:
+        yield pending
+
+
+class LogParser:
+    """Turns the lines of a log into LogEntry objects, keeping the file stack."""
+
+    def __init__(self, lines: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.lines = iter(lines)
+        self.aliases = aliases or {}
+        self.stack: List[Optional[str]] = []
+        self._lookahead: Optional[str] = None
+
+    def _next_line(self) -> Optional[str]:
+        if self._lookahead is not None:
+            text, self._lookahead = self._lookahead, None
+            return text
+        return next(self.lines, None)
+
+    @property
+    def current_file(self) -> Optional[str]:
+        for name in reversed(self.stack):
+            if name:
+                return self.aliases.get(name, name)
+        return None
+
+    def _track_files(self, text: str):
+        position = 0
+        while True:
+            opening, closing = text.find('(', position), text.find(')', position)
+            if opening == -1 and closing == -1:
+                return
+            if closing == -1 or (opening != -1 and opening < closing):
+                match = FILE_OPEN_PATTERN.match(text, opening)
+                if match:
+                    self.stack.append(match.group(2))
+                    position = match.end()
+                else:
+                    self.stack.append(None)  # keeps unrelated parentheses balanced
+                    position = opening + 1
+            else:
+                if self.stack:
+                    self.stack.pop()
+                position = closing + 1
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        while True:
+            text = self._next_line()
+            if text is None:
+                return
+
+            if text.startswith('! '):
+                yield self._error(text[2:])
+                continue
+
+            match = FILE_LINE_ERROR_PATTERN.match(text)
+            if match:
+                name = self.aliases.get(match.group(1), match.group(1))
+                yield LogEntry('error', match.group(3), name, int(match.group(2)))
+                continue
+
+            match = WARNING_PATTERN.match(text)
+            if match:
+                yield self._warning(match.group(1), match.group(2))
+                continue
+
+            match = BOX_PATTERN.match(text)
+            if match:
+                line = next((int(g) for g in match.group(3, 4, 5) if g), None)
+                yield LogEntry(match.group(2).lower(), match.group(1).strip(), self.current_file, line)
+                self._skip_box_contents()
+                continue
+
+            self._track_files(text)
+
+    def _skip_box_contents(self):
+        """The box dump after an over/underfull message ends at a blank line;
+        its parentheses are typeset text, not files."""
+        for _ in range(50):
+            text = self._next_line()
+            if text is None or not text.strip():
+                return
+            if text.startswith(('! ', 'Overfull', 'Underfull')) or WARNING_PATTERN.match(text):
+                self._lookahead = text
+                return
+
+    def _error(self, message: str) -> LogEntry:
+        """An error message runs until the "l.<n>" line that shows the source."""
+        entry = LogEntry('error', message.strip(), self.current_file)
+        missing = MISSING_FILE_PATTERN.search(message)
+        for _ in range(20):  # errors in batchmode are short; never swallow the log
+            text = self._next_line()
+            if text is None:
+                break
+            match = ERROR_LINE_PATTERN.match(text)
+            if match:
+                entry.line = int(match.group(1))
+                entry.context = match.group(2).strip()
+                break
+            if text.startswith('! '):
+                self._lookahead = text
+                break
+        if missing:
+            entry.kind = 'missing-file'
+            entry.context = entry.context or missing.group(1)
+        return entry
+
+    def _warning(self, source: str, message: str) -> LogEntry:
+        """Package warnings continue on lines starting with "(package)"."""
+        while True:
+            text = self._next_line()
+            match = CONTINUATION_PATTERN.match(text) if text else None
+            if not match:
+                self._lookahead = text
+                break
+            message = f"{message} {match.group(2).strip()}"
+
+        match = INPUT_LINE_PATTERN.search(message)
+        line = int(match.group(1)) if match else None
+        if UNDEFINED_REF_PATTERN.search(message):
+            kind = 'undefined-reference'
+        elif UNDEFINED_CITE_PATTERN.search(message):
+            kind = 'undefined-citation'
+        elif MISSING_FILE_PATTERN.search(message):
+            kind = 'missing-file'
+        else:
+            kind = 'warning'
+        return LogEntry(kind, f"{source}: {message.strip()}", self.current_file, line)
+
+
+def parse_log(log_file, aliases: Optional[Dict[str, str]] = None,
+              max_print_line: int = MAX_PRINT_LINE) -> Iterator[LogEntry]:
+    """Yield the problems in ``log_file`` while reading it line by line.
+
+    ``aliases`` maps file names as they appear in the log to the names to
+    report, e.g. a generated body file back to its deck.
+    """
+    with open(log_file, 'rb') as f:
+        yield from LogParser(logical_lines(f, max_print_line), aliases)
+
+
+def summarize(entries: List[LogEntry]) -> Dict[str, int]:
+    return dict(Counter(entry.kind for entry in entries))
+
+
+def format_summary(entries: List[LogEntry], show_boxes: bool = False, limit: int = 0) -> str:
+    """Readable report: errors first, then warnings, then (optionally) boxes."""
+    icons = {'error': '❌', 'warning': '⚠️ ', 'badbox': '📦'}
+    order = {'error': 0, 'warning': 1, 'badbox': 2}
+    shown = [e for e in entries if show_boxes or e.level != 'badbox']
+    shown.sort(key=lambda e: order[e.level])
+    if limit:
+        shown = shown[:limit]
+
+    lines = []
+    for entry in shown:
+        context = f" [{entry.context}]" if entry.context else ''
+        lines.append(f"{icons[entry.level]} {entry.location}: {entry.message}{context}")
+    counts = summarize(entries)
+    if counts:
+        lines.append("📊 " + ', '.join(f"{count} {kind}" for kind, count in sorted(counts.items())))
+    else:
+        lines.append("✅ No errors or warnings")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract errors and warnings from LaTeX logs")
+    parser.add_argument('logs', nargs='+', help='.log files (or the .tex files they belong to)')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a summary')
+    parser.add_argument('--all', action='store_true', help='Include overfull/underfull boxes in the summary')
+    parser.add_argument('--max-print-line', type=int, default=MAX_PRINT_LINE,
+                        help=f'Wrap width of the engine (default: {MAX_PRINT_LINE})')
+    args = parser.parse_args()
+
+    # Imported here: compile_deck itself uses this module
+    from compile_deck import scratch_dir
+
+    report, status = {}, 0
+    for name in args.logs:
+        log_file = Path(name).with_suffix('.log')
+        if not log_file.exists() and Path(name).suffix == '.tex':
+            # Decks built with --out-of-tree keep their log in the scratch directory
+            log_file = scratch_dir(Path(name).resolve()) / log_file.name
+        if not log_file.exists():
+            print(f"❌ {log_file} not found", file=sys.stderr)
+            status = 1
+            continue
+        entries = list(parse_log(log_file, max_print_line=args.max_print_line))
+        if any(entry.level == 'error' for entry in entries):
+            status = 1
+        if args.json:
+            report[str(log_file)] = {'summary': summarize(entries),
+                                     'entries': [entry.to_dict() for entry in entries]}
+        else:
+            print(f"📄 {log_file}")
+            print(format_summary(entries, show_boxes=args.all))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Incremental tokenizer for LaTeX sources.
+
+Reads a file line by line, in one pass, and yields tokens with their line
+and column. It keeps the state regex scans get wrong:
+
+- comments ("%" to the end of the line, but not "\\%") become COMMENT tokens
+- escaped braces and dollars (\\{ \\} \\$) are commands, not groups or math
+- verbatim, lstlisting, minted, ... and \\verb|...| become VERBATIM tokens
+- math mode ($, $$, \\( \\), \\[ \\], equation, align, ...) is recorded on
+  every token
+- \\begin/\\end are checked against a stack of open environments; the
+  mismatches are collected in ``problems`` with their line numbers
+
+Commands carry their first optional ([...]) and mandatory ({...}) argument
+as source text in ``options`` and ``arg``, so \\includegraphics[width=x]{a}
+has arg "a". Checks are visitors over the token stream (see
+scripts/audit_content.py).
+
+Usage:
+    python scripts/latex_tokens.py FILE.tex           # dump the tokens
+    python scripts/latex_tokens.py --check FILE.tex   # brace and environment problems
+"""
+
+import argparse
+import re
+import sys
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+COMMAND = 'command'
+BEGIN = 'begin'
+END = 'end'
+BGROUP = 'bgroup'
+EGROUP = 'egroup'
+MATH = 'math'
+TEXT = 'text'
+COMMENT = 'comment'
+VERBATIM = 'verbatim'
+NEWLINE = 'newline'
+
+VERBATIM_ENVIRONMENTS = {'verbatim', 'verbatim*', 'Verbatim', 'BVerbatim', 'lstlisting', 'minted',
+                         'comment', 'filecontents', 'filecontents*'}
+MATH_ENVIRONMENTS = {'equation', 'equation*', 'align', 'align*', 'alignat', 'alignat*', 'gather',
+                     'gather*', 'multline', 'multline*', 'flalign', 'flalign*', 'eqnarray', 'eqnarray*',
+                     'displaymath', 'math'}
+VERBATIM_COMMANDS = {'verb', 'lstinline', 'mintinline'}
+# \left[ and \bigl[ are delimiters, not optional arguments
+DELIMITER_SIZES = ('left', 'right', 'middle', 'big', 'Big')
+
+# One alternative per token kind; text runs stop at anything special
+TOKEN_PATTERN = re.compile(r'\\(?:[A-Za-z@]+|.?)|%|\$\$|\$|\{|\}|\[|\]|[^\\%${}\[\]]+')
+PERCENT_TEXT_PATTERN = re.compile(r'\\(?:[A-Za-z@]+|.?)|\$\$|\$|\{|\}|\[|\]|[^\\${}\[\]]+')
+ENV_NAME_PATTERN = re.compile(r'\s*\{([^{}]*)\}')
+MATH_DELIMITERS = {'\\(': '\\)', '\\[': '\\]', '$': '$', '$$': '$$'}
+
+
+class Token:
+    __slots__ = ('kind', 'text', 'line', 'col', 'name', 'math', 'opens', 'arg', 'options')
+
+    def __init__(self, kind: str, text: str, line: int, col: int, name: Optional[str] = None,
+                 math: Optional[str] = None):
+        self.kind = kind
+        self.text = text      # source text, e.g. "\\mathbf" or "\\begin{align}"
+        self.line = line
+        self.col = col
+        self.name = name      # command or environment name
+        self.math = math      # open math mode (delimiter or environment), if any
+        self.opens = False    # MATH tokens: True for an opening delimiter
+        self.arg: Optional[str] = None
+        self.options: Optional[str] = None
+
+    def __repr__(self):
+        extra = f" arg={self.arg!r}" if self.arg is not None else ''
+        return f"{self.line}:{self.col} {self.kind} {self.text!r}{extra}{' [math]' if self.math else ''}"
+
+
+class LatexTokenizer:
+    """Line-by-line tokenizer; state carries over between feed_line() calls."""
+
+    def __init__(self, comments: bool = True):
+        # Markdown has no comments; a "%" there is text
+        self.pattern = TOKEN_PATTERN if comments else PERCENT_TEXT_PATTERN
+        self.math: Optional[str] = None
+        self.environments: List[Tuple[str, int]] = []
+        self.verbatim: Optional[str] = None
+        self.problems: List[Tuple[int, str]] = []
+        self.line = 0
+
+    def tokens(self, lines: Iterable[str]) -> Iterator[Token]:
+        for line in lines:
+            yield from self.feed_line(line.rstrip('\r\n'))
+        self.finish()
+
+    def finish(self):
+        """Report the environments still open at the end of the input."""
+        for name, line in reversed(self.environments):
+            self.problems.append((line, f"\\begin{{{name}}} on line {line} is never closed"))
+        self.environments = []
+
+    def feed_line(self, text: str) -> Iterator[Token]:
+        self.line += 1
+        line, pos = self.line, 0
+        if not text.strip() and self.math in ('$', '\\(') and not self.verbatim:
+            # TeX ends inline math at a paragraph break (with an error)
+            self.problems.append((line, f"{self.math} math opened before line {line} is never closed"))
+            self.math = None
+        if self.verbatim:
+            pos = yield from self._verbatim_until_end(text, 0)
+        while pos < len(text):
+            match = self.pattern.match(text, pos)
+            value = match.group(0)
+            if value == '%':
+                yield Token(COMMENT, text[pos:], line, pos)
+                pos = len(text)
+                break
+            if value.startswith('\\') and len(value) > 1 and value[1:].replace('@', 'a').isalpha():
+                pos = yield from self._command(text, pos, value)
+                if self.verbatim:
+                    pos = yield from self._verbatim_until_end(text, pos)
+                continue
+            if value in MATH_DELIMITERS or value in ('\\)', '\\]'):
+                token = self._math(value, line, pos)
+            elif value == '{':
+                token = Token(BGROUP, value, line, pos, math=self.math)
+            elif value == '}':
+                token = Token(EGROUP, value, line, pos, math=self.math)
+            elif value.startswith('\\'):
+                token = Token(COMMAND, value, line, pos, name=value[1:], math=self.math)
+            else:
+                token = Token(TEXT, value, line, pos, math=self.math)
+            yield token
+            pos = match.end()
+        yield Token(NEWLINE, '\n', line, len(text), math=self.math)
+
+    def _math(self, value: str, line: int, col: int) -> Token:
+        if self.math is None and value in MATH_DELIMITERS:
+            self.math = value
+            token = Token(MATH, value, line, col, math=value)
+            token.opens = True
+            return token
+        if self.math in MATH_DELIMITERS and MATH_DELIMITERS[self.math] == value:
+            token = Token(MATH, value, line, col, math=self.math)
+            self.math = None
+            return token
+        # A delimiter that neither opens nor closes (e.g. "$" inside align)
+        return Token(TEXT, value, line, col, math=self.math)
+
+    def _command(self, text: str, pos: int, value: str):
+        name, line = value[1:], self.line
+        end = pos + len(value)
+        if name in ('begin', 'end'):
+            match = ENV_NAME_PATTERN.match(text, end)
+            if match:
+                env = match.group(1).strip()
+                if name == 'begin':
+                    yield self._begin(env, text[pos:match.end()], pos)
+                else:
+                    yield self._end(env, text[pos:match.end()], pos)
+                return match.end()
+        if name in VERBATIM_COMMANDS and end < len(text) and text[end] not in '{[ ':
+            delimiter = text[end]
+            close = text.find(delimiter, end + 1)
+            close = len(text) - 1 if close == -1 else close
+            yield Token(VERBATIM, text[pos:close + 1], line, pos, name=name, math=self.math)
+            return close + 1
+        yield Token(COMMAND, value, line, pos, name=name, math=self.math)
+        return end
+
+    def _begin(self, env: str, source: str, col: int) -> Token:
+        self.environments.append((env, self.line))
+        token = Token(BEGIN, source, self.line, col, name=env, math=self.math)
+        if env in VERBATIM_ENVIRONMENTS:
+            self.verbatim = env
+        elif env in MATH_ENVIRONMENTS and self.math is None:
+            self.math = env
+            token.math = env
+        return token
+
+    def _end(self, env: str, source: str, col: int) -> Token:
+        token = Token(END, source, self.line, col, name=env, math=self.math)
+        if self.math == env:
+            self.math = None
+        open_names = [name for name, _ in self.environments]
+        if open_names and open_names[-1] == env:
+            self.environments.pop()
+        elif env in open_names:
+            # Everything opened after the matching \begin was left open
+            while self.environments[-1][0] != env:
+                name, line = self.environments.pop()
+                self.problems.append((line, f"\\begin{{{name}}} on line {line} is closed by "
+                                            f"\\end{{{env}}} on line {self.line}"))
+            self.environments.pop()
+        else:
+            self.problems.append((self.line, f"\\end{{{env}}} on line {self.line} has no \\begin"))
+        return token
+
+    def _verbatim_until_end(self, text: str, pos: int):
+        marker = f"\\end{{{self.verbatim}}}"
+        end = text.find(marker, pos)
+        if end == -1:
+            if pos < len(text):
+                yield Token(VERBATIM, text[pos:], self.line, pos, name=self.verbatim)
+            return len(text)
+        if end > pos:
+            yield Token(VERBATIM, text[pos:end], self.line, pos, name=self.verbatim)
+        env, self.verbatim = self.verbatim, None
+        yield self._end(env, marker, end)
+        return end + len(marker)
+
+
+class _Lookahead:
+    def __init__(self, tokens: Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.buffered: Optional[Token] = None
+
+    def peek(self) -> Optional[Token]:
+        if self.buffered is None:
+            self.buffered = next(self.tokens, None)
+        return self.buffered
+
+    def next(self) -> Optional[Token]:
+        token = self.peek()
+        self.buffered = None
+        return token
+
+
+def _collect(token: Token, stream: _Lookahead) -> List[Token]:
+    """``token`` followed by its [options] and {argument} tokens, with
+    ``options`` and ``arg`` filled in. Only the argument is buffered."""
+    if token.kind != COMMAND or not token.name[:1].isalpha():
+        return [token]
+    collected = [token]
+    following = stream.peek()
+    if (following is not None and following.kind == TEXT and following.text == '['
+            and not token.name.startswith(DELIMITER_SIZES)):
+        group, depth = [stream.next()], 1
+        while depth and stream.peek() is not None:
+            for inner in _collect(stream.next(), stream):
+                group.append(inner)
+                if inner.kind == TEXT and inner.text in ('[', ']'):
+                    depth += 1 if inner.text == '[' else -1
+        token.options = ''.join(t.text for t in group[1:-1])
+        collected += group
+        following = stream.peek()
+    if following is not None and following.kind == BGROUP:
+        group, depth = [stream.next()], 1
+        while depth and stream.peek() is not None:
+            inner_tokens = _collect(stream.next(), stream)
+            first = inner_tokens[0]
+            if first.kind == BGROUP:
+                depth += 1
+            elif first.kind == EGROUP:
+                depth -= 1
+            group += inner_tokens
+        token.arg = ''.join(t.text for t in group[1:-1] if t.kind != NEWLINE)
+        collected += group
+    return collected
+
+
+def with_arguments(tokens: Iterable[Token]) -> Iterator[Token]:
+    """Fill in ``options`` and ``arg`` of every command token."""
+    stream = _Lookahead(tokens)
+    while stream.peek() is not None:
+        yield from _collect(stream.next(), stream)
+
+
+def tokenize(text: str, comments: bool = True, tokenizer: Optional[LatexTokenizer] = None) -> Iterator[Token]:
+    """Tokens of ``text``; pass a ``tokenizer`` to read its problems afterwards."""
+    tokenizer = tokenizer or LatexTokenizer(comments)
+    return with_arguments(tokenizer.tokens(text.split('\n')))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenize LaTeX sources")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--check', action='store_true', help='Only report brace and environment problems')
+    args = parser.parse_args()
+
+    status = 0
+    for name in args.files:
+        with open(name, 'r', encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+        tokenizer = LatexTokenizer()
+        depth, unmatched = 0, []
+        for token in tokenize(text, tokenizer=tokenizer):
+            if not args.check:
+                print(token)
+            elif token.kind == BGROUP:
+                depth += 1
+            elif token.kind == EGROUP:
+                depth -= 1
+                if depth < 0:
+                    unmatched.append((token.line, f"unmatched }} on line {token.line}"))
+                    depth = 0
+        if args.check:
+            problems = sorted(tokenizer.problems + unmatched)
+            if depth:
+                problems.append((tokenizer.line, f"{depth} unclosed {{ at the end of the file"))
+            for _, message in problems:
+                print(f"{name}: {message}")
+            status = status or bool(problems)
+    return int(status)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Read notebooks incrementally, cell by cell, without loading the outputs.
+
+json.load() on a notebook builds every output, including megabytes of
+base64 images, before the first cell can be looked at. iter_cells() parses
+the .ipynb as a stream instead:
+
+- the file is read in chunks; only the JSON value being parsed is buffered
+- cells are yielded one at a time, and reading stops after ``limit`` cells
+  (the first two cells of a notebook are in its first few kilobytes)
+- the values of ``skip`` keys ("outputs" by default) are scanned over
+  without being decoded: strings are jumped with str.find, brackets counted
+  with str.count, and the keys are left out of the cell
+
+Values that are kept (sources, metadata) are decoded with the json module
+itself (raw_decode), so they come out exactly as from json.load().
+
+    for cell in iter_cells('notebooks/knn.ipynb', limit=2):
+        ...cell['cell_type'], cell['source']...
+
+Usage:
+    python scripts/notebook_stream.py NOTEBOOK [-n N]   # types and first lines of the cells
+"""
+
+import argparse
+import io
+import json
+import re
+import sys
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+CHUNK_SIZE = 1 << 16
+SKIP_KEYS = ('outputs',)
+
+WHITESPACE_PATTERN = re.compile(r'[ \t\n\r]*')
+SCALAR_PATTERN = re.compile(r'[^ \t\n\r,:{}\[\]"]*')
+BRACKET_PATTERN = re.compile(r'[{}\[\]]')
+
+
+class NotebookFormatError(ValueError):
+    """The file is not a well-formed notebook (or not JSON)."""
+
+
+def _escaped(text: str, index: int) -> bool:
+    """True if the character at ``index`` follows an odd number of backslashes."""
+    start = index
+    while start and text[start - 1] == '\\':
+        start -= 1
+    return (index - start) % 2 == 1
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Stream:
+    """JSON values read from a text file one at a time."""
+
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Append the next chunk, dropping what was consumed; False at EOF."""
+        chunk = self.f.read(size or self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """The next character after whitespace ('' at the end of the file)."""
+        while True:
+            self.pos = WHITESPACE_PATTERN.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise NotebookFormatError(f"expected {char!r}, found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next value; the buffer grows until it holds all of it."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise NotebookFormatError(str(e)) from None
+                self._fill(max(self.chunk_size, len(self.buffer)))
+                continue
+            # A number may go on in the next chunk: raw_decode("-25.") stops
+            # at "-25", so a number whose rest of the buffer could still
+            # belong to it ("." "e" "E" sign digits) waits for more data
+            at_end = SCALAR_PATTERN.match(self.buffer, end).end() == len(self.buffer)
+            if at_end and not self.eof and (end == len(self.buffer) or _is_number(value)):
+                self._fill(max(self.chunk_size, len(self.buffer)))
+                continue
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        """Move past the next value without decoding it."""
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in ('{', '['):
+            # A number or literal, possibly continued in the next chunk
+            while True:
+                self.pos = SCALAR_PATTERN.match(self.buffer, self.pos).end()
+                if self.pos < len(self.buffer) or not self._fill():
+                    return
+        self.pos += 1
+        depth = 1
+        while True:
+            # Brackets between here and the next string
+            quote = self.buffer.find('"', self.pos)
+            stop = len(self.buffer) if quote == -1 else quote
+            segment = self.buffer[self.pos:stop]
+            closing = segment.count('}') + segment.count(']')
+            if closing < depth:
+                depth += segment.count('{') + segment.count('[') - closing
+            else:
+                # The value may end in this segment
+                for bracket in BRACKET_PATTERN.finditer(self.buffer, self.pos, stop):
+                    if bracket.group() in '{[':
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if depth == 0:
+                            self.pos = bracket.end()
+                            return
+            self.pos = stop
+            if quote != -1:
+                self._skip_string()
+            elif not self._fill():
+                raise NotebookFormatError("unexpected end of file")
+
+    def _skip_string(self):
+        """Move past the string that starts here (str.find: no regex or
+        decoding over megabytes of base64)."""
+        self.pos += 1
+        while True:
+            end = self.buffer.find('"', self.pos)
+            while end != -1 and _escaped(self.buffer, end):
+                end = self.buffer.find('"', end + 1)
+            if end != -1:
+                self.pos = end + 1
+                return
+            # Keep trailing backslashes: they escape the first character of the next chunk
+            self.pos = len(self.buffer.rstrip('\\'))
+            if not self._fill():
+                raise NotebookFormatError("unterminated string")
+
+    def items(self, skip: Iterable[str] = ()) -> Iterator:
+        """(key, value) of the object that starts here; the values of ``skip``
+        keys are passed over and not yielded."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            if key in skip:
+                self.skip_value()
+            else:
+                yield key, self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise NotebookFormatError(f"expected ',' or '}}', found {separator or 'end of file'!r}")
+
+    def elements(self) -> Iterator[None]:
+        """Stop at every element of the array that starts here; the caller
+        reads the element before asking for the next one."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise NotebookFormatError(f"expected ',' or ']', found {separator or 'end of file'!r}")
+
+
+def _cells(stream: _Stream, limit: Optional[int], skip: Iterable[str]) -> Iterator[Dict]:
+    skip = set(skip)
+    for key in _keys(stream):
+        if key != 'cells':
+            stream.skip_value()
+            continue
+        if limit is not None and limit <= 0:
+            return
+        for count, _ in enumerate(stream.elements(), 1):
+            yield dict(stream.items(skip))
+            if limit is not None and count >= limit:
+                return
+        return
+
+
+def _keys(stream: _Stream) -> Iterator[str]:
+    """Keys of the top-level object; the caller consumes each value."""
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        key = stream.value()
+        stream.expect(':')
+        yield key
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == '}':
+            return
+        if separator != ',':
+            raise NotebookFormatError(f"expected ',' or '}}', found {separator or 'end of file'!r}")
+
+
+def iter_cells(path, limit: Optional[int] = None, skip: Iterable[str] = SKIP_KEYS) -> Iterator[Dict]:
+    """The cells of the notebook at ``path``, at most ``limit`` of them, without
+    the ``skip`` keys. Raises NotebookFormatError (a ValueError) or OSError."""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _cells(_Stream(f), limit, skip)
+
+
+def iter_cells_text(text: str, limit: Optional[int] = None, skip: Iterable[str] = SKIP_KEYS,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[Dict]:
+    """iter_cells() over notebook JSON that is already in memory."""
+    return _cells(_Stream(io.StringIO(text), chunk_size), limit, skip)
+
+
+def read_notebook(path, skip: Iterable[str] = SKIP_KEYS) -> Dict:
+    """The whole notebook like json.load(), except for the ``skip`` keys of its cells."""
+    skip = set(skip)
+    notebook = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _Stream(f)
+        for key in _keys(stream):
+            if key == 'cells':
+                notebook['cells'] = [dict(stream.items(skip)) for _ in stream.elements()]
+            else:
+                notebook[key] = stream.value()
+    return notebook
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the cells of a notebook")
+    parser.add_argument('notebook')
+    parser.add_argument('-n', '--limit', type=int, help='Stop after N cells')
+    args = parser.parse_args()
+
+    try:
+        for index, cell in enumerate(iter_cells(args.notebook, args.limit)):
+            source = cell.get('source', [])
+            text = ''.join(source) if isinstance(source, list) else source
+            first = text.strip().split('\n', 1)[0][:70]
+            print(f"{index:4d}  {cell.get('cell_type', '?'):8s}  {first}")
+    except (OSError, ValueError) as e:
+        print(f"❌ {args.notebook}: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Apply notebook edits as passes, with one read and one write per notebook.
+
+The notebook scripts (metadata, Colab links, tags, badges, image paths)
+each used to open, parse and rewrite every notebook, each in its own JSON
+style. Their edits are now passes: functions that change a parsed notebook
+in place and describe what they changed,
+
+    def colab_pass(notebook: dict, path: Path, **options) -> List[str]
+
+and transform_notebooks() runs any sequence of them over many notebooks:
+
+- every notebook is read and parsed once, all passes are applied, and it is
+  serialized once, in the JSON style the file already had (indent, key
+  order, escaped or literal non-ASCII, final newline), so a pass only
+  changes the lines it edits
+- nothing is written when no pass changed anything or the new bytes equal
+  the old ones
+- the file is replaced atomically (temporary file in the same directory,
+  then rename), so an interrupted run never leaves half a notebook
+- notebooks are independent: with jobs > 1 they are transformed by that
+  many processes, results are reported in input order
+- the old bytes of a rewritten notebook go to the backup store
+  (backup_store.py), labelled with the passes, not to a sibling file
+
+Passes are given by name (PASSES) with their options, so they can be sent
+to worker processes.
+
+Usage:
+    python scripts/notebook_transforms.py --passes metadata,colab,tags [PATH ...] [-j 4] [--dry-run] [--no-backup]
+    python scripts/notebook_transforms.py --list        # available passes
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backup_store import BackupStore
+
+# name -> "module:function"; the modules are the scripts the passes come from
+PASSES = {
+    'metadata': 'add_notebook_metadata:metadata_pass',
+    'colab': 'add_missing_colab_links:colab_pass',
+    'tags': 'enhance_notebook_tags:tags_pass',
+    'badges': 'insert_badges:badges_pass',
+    'image-paths': 'fix_notebook_paths:image_paths_pass',
+}
+
+PassSpec = Tuple[str, dict]
+
+
+def resolve(name: str) -> Callable[..., List[str]]:
+    """The pass function registered as ``name``."""
+    try:
+        module_name, function = PASSES[name].split(':')
+    except KeyError:
+        raise ValueError(f"unknown pass {name!r} (available: {', '.join(PASSES)})") from None
+    return getattr(importlib.import_module(module_name), function)
+
+
+class JsonStyle:
+    """How a notebook file was serialized, so it can be written the same way."""
+
+    def __init__(self, indent: int = 1, ensure_ascii: bool = False, sort_keys: bool = True,
+                 newline: bool = True):
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.sort_keys = sort_keys
+        self.newline = newline
+
+    @classmethod
+    def detect(cls, text: str, notebook: dict) -> 'JsonStyle':
+        """The style of ``text``; defaults to nbformat's (indent 1, sorted keys)."""
+        after_brace = text[1:text.find('"')] if text.startswith('{\n') else ''
+        indent = len(after_brace) - 1 if after_brace.strip() == '' and len(after_brace) > 1 else 1
+        # Non-ASCII text written as \uXXXX escapes, or literally
+        ensure_ascii = text.isascii() and '\\u' in text
+        dicts = [notebook] + [cell for cell in notebook.get('cells', []) if isinstance(cell, dict)]
+        sort_keys = all(list(d) == sorted(d) for d in dicts)
+        return cls(indent, ensure_ascii, sort_keys, text.endswith('\n'))
+
+    def dumps(self, notebook: dict) -> str:
+        text = json.dumps(notebook, indent=self.indent, ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys)
+        return text + '\n' if self.newline else text
+
+
+def write_atomic(path: Path, data: bytes):
+    """Replace ``path`` with ``data`` through a temporary file and a rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def transform_notebook(path, passes: Sequence[PassSpec], dry_run: bool = False,
+                       backup: Optional[str] = None) -> dict:
+    """Apply ``passes`` ([(name, options)]) to one notebook and write it back
+    if it changed; with a ``backup`` label the old bytes are stored first.
+
+    Returns {'path', 'changes': [(pass, message)], 'written', 'error'}.
+    """
+    path = Path(path)
+    result = {'path': str(path), 'changes': [], 'written': False, 'error': None}
+    try:
+        data = path.read_bytes()
+        text = data.decode('utf-8')
+        notebook = json.loads(text)
+        style = JsonStyle.detect(text, notebook)
+        for name, options in passes:
+            for message in resolve(name)(notebook, path, **options) or []:
+                result['changes'].append((name, message))
+        if not result['changes']:
+            return result
+        new_data = style.dumps(notebook).encode('utf-8')
+        if new_data == data:
+            # The passes set values the notebook already had
+            result['changes'] = []
+        if new_data == data or dry_run:
+            return result
+        if backup:
+            BackupStore().save(path, data, label=backup)
+        write_atomic(path, new_data)
+        result['written'] = True
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    return result
+
+
+def _transform(args) -> dict:
+    return transform_notebook(*args)
+
+
+def transform_notebooks(paths: Iterable, passes: Sequence[PassSpec], jobs: int = 1, dry_run: bool = False,
+                        backup: Optional[str] = None) -> Iterator[dict]:
+    """transform_notebook() over ``paths``, with ``jobs`` processes; results in order."""
+    tasks = [(path, passes, dry_run, backup) for path in paths]
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(_transform, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+    else:
+        yield from map(_transform, tasks)
+
+
+def find_notebooks(paths: Iterable) -> List[Path]:
+    """The notebooks given, directories searched recursively (checkpoints skipped)."""
+    notebooks = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            notebooks.extend(nb for nb in sorted(path.glob('**/*.ipynb')) if '.ipynb_checkpoints' not in nb.parts)
+        else:
+            notebooks.append(path)
+    return notebooks
+
+
+def report(results: Iterable[dict], dry_run: bool = False) -> Dict[str, int]:
+    """Print the changes per notebook; return the counts."""
+    counts = {'notebooks': 0, 'changed': 0, 'written': 0, 'errors': 0}
+    for result in results:
+        counts['notebooks'] += 1
+        name = Path(result['path']).name
+        if result['error']:
+            counts['errors'] += 1
+            print(f"  ✗ Error processing {name}: {result['error']}")
+            continue
+        if not result['changes']:
+            continue
+        counts['changed'] += 1
+        counts['written'] += result['written']
+        print(f"📝 {name}")
+        for pass_name, message in result['changes']:
+            print(f"  {pass_name}: {message}")
+    verb = 'would change' if dry_run else 'changed'
+    print(f"\nSummary: {counts['notebooks']} notebooks, {counts['changed']} {verb}, "
+          f"{counts['written']} written, {counts['errors']} errors")
+    return counts
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """The pipeline option shared by the notebook scripts (they all have --dry-run)."""
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Notebooks transformed in parallel (default: 1)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply notebook passes with one read and one write per notebook")
+    parser.add_argument('paths', nargs='*', default=['notebooks'], help='Notebooks or directories (default: notebooks)')
+    parser.add_argument('--passes', default='', help=f"Comma-separated passes, applied in order ({', '.join(PASSES)})")
+    parser.add_argument('--list', action='store_true', help='List the available passes')
+    parser.add_argument('--dry-run', action='store_true', help='Preview changes without modifying files')
+    parser.add_argument('--no-backup', action='store_true', help='Do not keep the old notebooks in the backup store')
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list or not args.passes:
+        for name in PASSES:
+            print(f"  {name:12s} {(resolve(name).__doc__ or '').strip().splitlines()[0]}")
+        return 0
+    try:
+        passes = [(name, {}) for name in args.passes.split(',') if name]
+        for name, _ in passes:
+            resolve(name)
+    except ValueError as e:
+        parser.error(str(e))
+
+    notebooks = find_notebooks(args.paths)
+    print(f"Found {len(notebooks)} notebooks; passes: {', '.join(name for name, _ in passes)}")
+    backup = None if args.no_backup else ','.join(name for name, _ in passes)
+    counts = report(transform_notebooks(notebooks, passes, args.jobs, args.dry_run, backup), args.dry_run)
+    return 1 if counts['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
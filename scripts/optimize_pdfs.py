@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Shrink deployed slide PDFs after the build.
+
+Each PDF is rewritten with compressed object streams and recompressed
+streams, and identical images on different pages are merged into one
+object. PDFs are processed in parallel; a result is only kept when it is
+smaller, and every file is replaced through a rename, so hard-linked build
+outputs (see deploy_slides.py) are never modified.
+
+Results are cached in .cache/pdf-optimize by the SHA-256 of the input, so a
+PDF that deploy_slides.py puts back unchanged is restored from the cache
+instead of being processed again. The deploy manifest is updated to accept
+the optimized file.
+
+Uses pikepdf when it is installed (pip install pikepdf) and the qpdf
+command otherwise; qpdf alone does not merge duplicate images. Fonts are
+not touched: xelatex already embeds subsets.
+
+Usage:
+    python scripts/optimize_pdfs.py [slides] [-j 4]
+    python scripts/optimize_pdfs.py clear           # remove the cache
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from build_cache import file_hash, manifest_lock
+from deploy_slides import MANIFEST_NAME, DeployManifest
+from slide_deps import REPO_ROOT
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+OPTIMIZE_CACHE_DIR = REPO_ROOT / ".cache" / "pdf-optimize"
+INDEX_PATH = OPTIMIZE_CACHE_DIR / "index.json"
+
+
+def dedupe_images(pdf) -> int:
+    """Point every page at one copy of each distinct image; return the number merged."""
+    seen: Dict[str, object] = {}
+    merged = 0
+    for page in pdf.pages:
+        resources = page.obj.get('/Resources')
+        xobjects = resources.get('/XObject') if resources is not None else None
+        if xobjects is None:
+            continue
+        for name in list(xobjects.keys()):
+            image = xobjects[name]
+            if image.get('/Subtype') != '/Image':
+                continue
+            digest = hashlib.sha256(image.read_raw_bytes())
+            for key in ('/Width', '/Height', '/BitsPerComponent', '/ColorSpace', '/Filter',
+                        '/DecodeParms', '/SMask'):
+                digest.update(repr(image.get(key)).encode())
+            first = seen.setdefault(digest.hexdigest(), image)
+            if first.objgen != image.objgen:
+                xobjects[name] = first
+                merged += 1
+    return merged
+
+
+def _optimize_pikepdf(source: Path, output: Path) -> int:
+    with pikepdf.open(source) as pdf:
+        merged = dedupe_images(pdf)
+        pdf.remove_unreferenced_resources()
+        pdf.save(output, object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                 compress_streams=True, recompress_flate=True)
+    return merged
+
+
+def _optimize_qpdf(source: Path, output: Path) -> int:
+    subprocess.run(['qpdf', '--object-streams=generate', '--compress-streams=y', '--recompress-flate',
+                    '--compression-level=9', str(source), str(output)],
+                   check=True, capture_output=True, timeout=300)
+    return 0
+
+
+def optimize(source: str, cached: str) -> dict:
+    """Worker: optimize ``source`` into ``cached`` (or copy it when that does not help)."""
+    source, cached = Path(source), Path(cached)
+    fd, tmp_name = tempfile.mkstemp(dir=cached.parent, suffix='.pdf')
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        try:
+            merged = (_optimize_pikepdf if pikepdf else _optimize_qpdf)(source, tmp)
+        except Exception as e:
+            return {'error': str(e).strip().splitlines()[-1] if str(e).strip() else type(e).__name__}
+        if tmp.stat().st_size >= source.stat().st_size:
+            shutil.copyfile(source, tmp)
+            merged = 0
+        os.replace(tmp, cached)
+        return {'merged': merged}
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _load_index() -> Dict[str, dict]:
+    try:
+        with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index: Dict[str, dict]):
+    fd, tmp_name = tempfile.mkstemp(dir=OPTIMIZE_CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(tmp_name, INDEX_PATH)
+
+
+def _install(cached: Path, target: Path):
+    tmp = target.parent / f".{target.name}.{os.getpid()}.tmp"
+    shutil.copyfile(cached, tmp)
+    os.replace(tmp, target)
+
+
+def optimize_directory(directory: Path, jobs: Optional[int] = None) -> int:
+    pdfs = sorted(directory.glob('*.pdf'))
+    OPTIMIZE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    index = _load_index()
+    # Optimized outputs are recognized too, so a second run does nothing
+    optimized = {entry['output']: digest for digest, entry in index.items()}
+
+    todo, restore, skipped = {}, {}, 0
+    for pdf in pdfs:
+        digest = file_hash(pdf)
+        if digest in optimized:
+            skipped += 1
+        elif digest in index and (OPTIMIZE_CACHE_DIR / f"{digest}.pdf").exists():
+            restore[pdf] = digest
+        else:
+            todo[pdf] = digest
+
+    failed = 0
+    if todo:
+        print(f"🗜️  Optimizing {len(todo)} PDF{'s' if len(todo) != 1 else ''} "
+              f"with {'pikepdf' if pikepdf else 'qpdf'}...")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pdf: pool.submit(optimize, str(pdf), str(OPTIMIZE_CACHE_DIR / f"{digest}.pdf"))
+                       for pdf, digest in todo.items()}
+            for pdf, future in futures.items():
+                outcome = future.result()
+                if 'error' in outcome:
+                    print(f"  ❌ {pdf.name}: {outcome['error']}")
+                    failed += 1
+                    continue
+                digest = todo[pdf]
+                cached = OPTIMIZE_CACHE_DIR / f"{digest}.pdf"
+                index[digest] = {'output': file_hash(cached), 'input_bytes': pdf.stat().st_size,
+                                 'output_bytes': cached.stat().st_size, 'merged_images': outcome['merged']}
+                restore[pdf] = digest
+        _save_index(index)
+
+    saved_total = 0
+    with manifest_lock(directory / MANIFEST_NAME):
+        manifest = DeployManifest(directory)
+        for pdf, digest in sorted(restore.items()):
+            entry = index[digest]
+            saved = entry['input_bytes'] - entry['output_bytes']
+            if saved <= 0:
+                print(f"  ➖ {pdf.name}: already minimal")
+                continue
+            _install(OPTIMIZE_CACHE_DIR / f"{digest}.pdf", pdf)
+            manifest.refresh(pdf.name, pdf)
+            saved_total += saved
+            merged = f", {entry['merged_images']} duplicate images merged" if entry['merged_images'] else ''
+            print(f"  📉 {pdf.name}: {entry['input_bytes'] / 1024:.0f} → {entry['output_bytes'] / 1024:.0f} KiB "
+                  f"(-{saved / 1024:.0f} KiB{merged}){'' if pdf in todo else ' [cached]'}")
+        if manifest.path.exists():
+            manifest.save()
+
+    print(f"📦 Saved {saved_total / 1024 / 1024:.1f} MiB in {len(restore)} PDFs, "
+          f"{skipped} already optimized")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompress deployed slide PDFs")
+    parser.add_argument('directory', nargs='?', default=str(REPO_ROOT / 'slides'),
+                        help='Directory of PDFs, or "clear" to remove the cache (default: slides)')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Parallel workers (default: CPU count)')
+    args = parser.parse_args()
+
+    if args.directory == 'clear':
+        shutil.rmtree(OPTIMIZE_CACHE_DIR, ignore_errors=True)
+        print(f"🗑️  Removed {OPTIMIZE_CACHE_DIR}")
+        return 0
+    if pikepdf is None and shutil.which('qpdf') is None:
+        print("⚠️  Neither pikepdf nor qpdf is installed, PDFs are left as they are")
+        return 0
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"❌ {directory} not found")
+        return 1
+    return optimize_directory(directory, args.jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Precompiled preamble formats for slide decks (the mylatexformat approach).
+
+Most decks start with the same block of \\documentclass and \\usepackage
+lines (beamer theme, tikz, tcolorbox, common-boxes.sty, notation.sty, ...).
+That leading block is dumped once into a format file with
+
+    xelatex -ini -jobname=<hash> "&xelatex" mylatexformat.ltx <preamble>.tex
+
+and every deck with the same block is compiled from that format, so the
+packages are not loaded again for each deck. The rest of the deck (\\title,
+\\author, local macros and the document itself) is compiled normally.
+
+Formats live in .cache/formats/<hash>.fmt. The hash covers the preamble
+text, every local .sty file it loads and the engine version, so editing a
+shared style or upgrading TeX Live produces a new format automatically.
+
+Usage:
+    python scripts/preamble_format.py [--engine xelatex] [--tikz-cache] <deck.tex> ...   # dump formats ahead of time
+
+Pass --tikz-cache when the decks are compiled with it (the topic Makefiles
+do): the TikZ-cache prelude is part of the format, so only then does a
+pre-dumped format match the one `make` looks for.
+"""
+
+import argparse
+import fcntl
+import functools
+import hashlib
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+from slide_deps import REPO_ROOT, resolve_package, strip_comments
+
+FORMATS_DIR = REPO_ROOT / ".cache" / "formats"
+
+# Lines that may appear in the shareable part of a preamble
+PREAMBLE_LINE = re.compile(
+    r'^\s*(?:$|%|\\documentclass\b|\\usepackage\b|\\RequirePackage\b|'
+    r'\\PassOptionsToPackage\b|\\usetheme\b|\\usecolortheme\b|\\usefonttheme\b)'
+)
+PACKAGE_PATTERN = re.compile(r'\\(?:usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+
+
+def split_preamble(content: str) -> Tuple[str, str]:
+    """Split a deck into its shareable package block and everything after it.
+
+    The block ends at the first line that is not a class/package/theme
+    command, comment or blank line. Returns ("", content) if the deck does
+    not start with \\documentclass.
+    """
+    lines = content.splitlines(keepends=True)
+    end = 0
+    while end < len(lines) and PREAMBLE_LINE.match(lines[end]):
+        end += 1
+    head = ''.join(lines[:end])
+    if '\\documentclass' not in strip_comments(head):
+        return '', content
+    return head, ''.join(lines[end:])
+
+
+@functools.lru_cache(maxsize=None)
+def engine_version(engine: str) -> str:
+    """First line of `<engine> --version`, so a TeX upgrade invalidates formats."""
+    try:
+        completed = subprocess.run([engine, '--version'], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+    return completed.stdout.splitlines()[0] if completed.stdout else ''
+
+
+def _local_styles(head: str, base_dir: Path) -> list:
+    """Local .sty files loaded by the preamble block, followed transitively."""
+    found, pending = [], [(head, base_dir)]
+    while pending:
+        content, source_dir = pending.pop()
+        for match in PACKAGE_PATTERN.finditer(strip_comments(content)):
+            for name in match.group(1).split(','):
+                style = resolve_package(name.strip(), base_dir, source_dir)
+                if style and style not in found:
+                    found.append(style)
+                    pending.append((style.read_text(encoding='utf-8', errors='ignore'), style.parent))
+    return sorted(found)
+
+
+def normalize_preamble(head: str) -> str:
+    """Preamble without comments or blank lines, so cosmetic edits share a format."""
+    lines = (line.strip() for line in strip_comments(head).splitlines())
+    return ''.join(f"{line}\n" for line in lines if line)
+
+
+def preamble_hash(head: str, base_dir: Path, engine: str, prelude: str = '') -> str:
+    digest = hashlib.sha256()
+    digest.update(engine.encode())
+    digest.update(engine_version(engine).encode())
+    digest.update(prelude.encode())
+    digest.update(normalize_preamble(head).encode())
+    for style in _local_styles(head, base_dir):
+        digest.update(style.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def ensure_format(head: str, base_dir: Path, engine: str = 'xelatex',
+                  timeout: int = 300, prelude: str = '') -> Optional[str]:
+    """Return the name of an up-to-date format for ``head``, dumping it if needed.
+
+    ``prelude`` is TeX code run before \\documentclass, such as the
+    definitions that switch on the TikZ cache. Returns None when the
+    preamble cannot be dumped. A dump the engine rejected (non-zero exit)
+    is remembered so later builds go straight to a normal compile; a
+    timeout or a missing engine is not, so the next build tries again.
+    """
+    name = f"{engine}-{preamble_hash(head, base_dir, engine, prelude)}"
+    fmt_file = FORMATS_DIR / f"{name}.fmt"
+    failed_marker = FORMATS_DIR / f"{name}.failed"
+    FORMATS_DIR.mkdir(parents=True, exist_ok=True)
+
+    # Parallel builds of decks sharing a preamble wait for a single dump
+    with open(FORMATS_DIR / f"{name}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if fmt_file.exists():
+            return name
+        if failed_marker.exists():
+            return None
+
+        preamble_file = FORMATS_DIR / f"{name}.tex"
+        preamble_file.write_text(prelude + '\n' + normalize_preamble(head) + '\\begin{document}\n\\end{document}\n',
+                                 encoding='utf-8')
+        command = [engine, '-ini', '-interaction=batchmode', f'-jobname={name}',
+                   f'-output-directory={FORMATS_DIR}', f'&{engine}', 'mylatexformat.ltx',
+                   str(preamble_file)]
+        try:
+            # Run from the deck directory so relative \usepackage paths resolve
+            completed = subprocess.run(command, cwd=base_dir, capture_output=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            # Slow, interrupted or no engine on PATH: not the preamble's fault
+            return name if fmt_file.exists() else None
+
+        if fmt_file.exists():
+            return name
+        if completed.returncode != 0:
+            failed_marker.touch()
+        return None
+
+
+def body_path(tex_file: Path) -> Path:
+    """Where the body of ``tex_file`` is written for a format-based compile."""
+    digest = hashlib.sha256(str(tex_file).encode()).hexdigest()[:12]
+    return FORMATS_DIR / "bodies" / f"{tex_file.stem}-{digest}.tex"
+
+
+def write_body(tex_file: Path, head: str, body: str) -> Path:
+    """Write the part of a deck that follows its dumped preamble.
+
+    The preamble is replaced by the \\endofdump marker plus blank lines, so
+    line numbers in the log still match the original deck.
+    """
+    body_file = body_path(tex_file)
+    body_file.parent.mkdir(parents=True, exist_ok=True)
+    # \csname keeps the marker harmless if the format does not define it
+    marker = '\\csname endofdump\\endcsname'
+    body_file.write_text(marker + '\n' * head.count('\n') + body, encoding='utf-8')
+    return body_file
+
+
+def format_environment(env: Optional[dict] = None) -> dict:
+    """Environment that lets the engine find formats in .cache/formats."""
+    env = dict(os.environ if env is None else env)
+    # A trailing separator keeps kpathsea's default search path
+    env['TEXFORMATS'] = f"{FORMATS_DIR}{os.pathsep}{env.get('TEXFORMATS', '')}"
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dump precompiled preamble formats for slide decks")
+    parser.add_argument('decks', nargs='+', help='Deck .tex files')
+    parser.add_argument('--engine', default='xelatex', help='TeX engine (default: xelatex)')
+    parser.add_argument('--tikz-cache', action='store_true',
+                        help='Include the TikZ-cache prelude, as compile_deck.py --tikz-cache does')
+    args = parser.parse_args()
+    # tikz_cache imports this module
+    from tikz_cache import cache_prelude
+
+    status = 0
+    for deck in args.decks:
+        tex_file = Path(deck).resolve()
+        head, _ = split_preamble(tex_file.read_text(encoding='utf-8', errors='ignore'))
+        if not head:
+            print(f"⏭️  {deck}: no shareable preamble")
+            continue
+        prelude = cache_prelude(tex_file, args.engine) if args.tikz_cache else ''
+        name = ensure_format(head, tex_file.parent, args.engine, prelude=prelude)
+        if name:
+            print(f"✅ {deck}: {name}.fmt")
+        else:
+            print(f"❌ {deck}: could not dump preamble (see {FORMATS_DIR})")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+One walk over the repository, shared by all validators.
+
+The validators in tests/ and the audit scripts each used to rglob the tree
+and read every file on their own. RepoScanner walks the tree once, pruning
+directories that never hold sources (.git, _site, build-temp, build caches),
+and reads each file at most once: the text is handed to every checker that
+wants the file and dropped again, so large notebooks are never held in
+memory together. Checkers that only need the facts of a file
+(source.facts, see file_facts.py) get them from .cache/validators without
+the file being read at all while it is unchanged.
+
+A checker subclasses Checker:
+
+    class TodoChecker(Checker):
+        suffixes = ('.tex',)
+
+        def visit(self, source):            # once per matching file
+            ...source.path, source.facts, source.text, source.lines...
+
+        def finish(self) -> bool:           # after the walk: report
+            ...
+
+    RepoScanner().scan([TodoChecker(), ...])
+
+tests/run_validation.py runs all validators over one scan. With
+--changed-since <rev> the scan is restricted to the files changed since
+<rev> and the decks that reference them (select_changed). With --jobs N
+the files are split into contiguous shards visited by N processes; each
+shard gets a copy of the checkers, and the copies are merged back in shard
+order (Checker.merge), so reports come out exactly as in a serial scan.
+
+Checkers test referenced files with path_exists()/path_is_file(), which
+stat each distinct path once per process however many decks point at it.
+
+Usage:
+    python scripts/repo_scanner.py          # files per suffix after pruning
+"""
+
+import functools
+import os
+import pickle
+import stat
+import subprocess
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from file_facts import FactCache, extract_facts
+
+PRUNE_DIRS = {'.git', '_site', 'build-temp', '.cache', '.quarto', 'node_modules', '__pycache__'}
+# Shards per worker: notebooks cost far more than decks, small shards even it out
+SHARDS_PER_JOB = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _stat_mode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+
+
+def path_exists(path) -> bool:
+    """Path.exists(), memoized per normalized absolute path."""
+    return _stat_mode(os.path.abspath(path)) is not None
+
+
+def path_is_file(path) -> bool:
+    """Path.is_file(), memoized like path_exists()."""
+    mode = _stat_mode(os.path.abspath(path))
+    return mode is not None and stat.S_ISREG(mode)
+
+
+class SourceFile:
+    """A file found by the scanner; its contents are read on first use."""
+
+    def __init__(self, path: Path, fact_cache: Optional[FactCache] = None):
+        self.path = path
+        self.error: Optional[Exception] = None
+        self._fact_cache = fact_cache
+        self._data: Optional[bytes] = None
+        self._text: Optional[str] = None
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            try:
+                self._data = self.path.read_bytes()
+            except OSError as e:
+                self.error, self._data = e, b''
+        return self._data
+
+    @property
+    def text(self) -> str:
+        """Contents decoded as UTF-8; undecodable bytes are dropped and the
+        problem is kept in ``error`` for checkers that care."""
+        if self._text is None:
+            data = self.data
+            try:
+                self._text = data.decode('utf-8')
+            except UnicodeDecodeError as e:
+                self.error, self._text = e, data.decode('utf-8', errors='ignore')
+        return self._text
+
+    @property
+    def facts(self) -> dict:
+        """What the validators check, from the fact cache when the file is unchanged."""
+        if self._fact_cache is None:
+            return extract_facts(self)
+        return self._fact_cache.facts(self)
+
+    @property
+    def lines(self) -> List[str]:
+        return self.text.split('\n')
+
+    def release(self):
+        self._data = self._text = None
+
+
+class Checker:
+    """Base class of the checkers fed by RepoScanner.scan()."""
+
+    suffixes: Sequence[str] = ()
+
+    def start(self, scanner: 'RepoScanner'):
+        """Called before any file is visited, with the full file list available."""
+
+    def wants(self, source: SourceFile) -> bool:
+        return source.suffix in self.suffixes
+
+    def visit(self, source: SourceFile):
+        raise NotImplementedError
+
+    def finish(self) -> bool:
+        """Report the results; return False if the check failed."""
+        return True
+
+    def merge(self, other: 'Checker'):
+        """Add the results of ``other``, a copy of this checker that visited
+        the next shard of files in a parallel scan."""
+        raise NotImplementedError
+
+
+class RepoScanner:
+    def __init__(self, root='.', prune: Iterable[str] = PRUNE_DIRS, cache: bool = True):
+        self.root = Path(root)
+        self.prune = set(prune)
+        self.fact_cache = FactCache() if cache else None
+        self.files: List[SourceFile] = []
+        self.dirs: List[Path] = []
+        self.selected: Optional[Set[str]] = None
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = sorted(d for d in dirnames if d not in self.prune)
+            directory = Path(dirpath)
+            self.dirs.append(directory)
+            self.files.extend(SourceFile(directory / name, self.fact_cache) for name in sorted(filenames))
+
+    def with_suffix(self, *suffixes: str) -> List[SourceFile]:
+        return [source for source in self.files if source.suffix in suffixes]
+
+    def _relative(self, path) -> str:
+        return os.path.normpath(os.path.relpath(path, self.root))
+
+    def is_selected(self, path) -> bool:
+        return self.selected is None or self._relative(path) in self.selected
+
+    def reverse_dependencies(self) -> Dict[str, Set[str]]:
+        """Referenced file (root-relative, without extension) -> .tex files
+        referencing it, from the \\includegraphics, \\includepdf and
+        notebookbox facts. Targets need not exist, so a deleted or renamed
+        asset still maps to the decks that used it."""
+        reverse = defaultdict(set)
+        for source in self.with_suffix('.tex'):
+            facts = source.facts
+            tex = self._relative(source.path)
+            base = os.path.dirname(tex)
+            targets = [os.path.join(base, path) for _, path in facts.get('includegraphics', [])]
+            for path in facts.get('includepdf', []):
+                targets += [os.path.join(base, path), path]
+            for _, url in facts.get('notebookbox', []):
+                targets.append(os.path.join('notebooks', os.path.basename(url)))
+            for target in targets:
+                reverse[os.path.splitext(os.path.normpath(target))[0]].add(tex)
+        return reverse
+
+    def select_changed(self, changed: Iterable[str]) -> Set[str]:
+        """Restrict feed() to the ``changed`` files (root-relative) and the
+        .tex files that reference any of them; return the selection."""
+        changed = {os.path.normpath(path) for path in changed}
+        reverse = self.reverse_dependencies()
+        selected = set(changed)
+        for path in changed:
+            selected.update(reverse.get(os.path.splitext(path)[0], ()))
+        self.selected = selected
+        return selected
+
+    def feed(self, checkers: List[Checker], jobs: int = 1):
+        """Visit every (selected) file once, handing it to each checker that wants
+        it; with ``jobs`` > 1 the files are visited by that many processes."""
+        for checker in checkers:
+            checker.start(self)
+        sources = [source for source in self.files
+                   if (self.selected is None or self.is_selected(source.path))
+                   and any(checker.wants(source) for checker in checkers)]
+        if jobs > 1 and len(sources) > 1:
+            self._feed_parallel(checkers, sources, jobs)
+        else:
+            _visit(checkers, sources)
+        if self.fact_cache is not None:
+            self.fact_cache.save()
+
+    def _feed_parallel(self, checkers: List[Checker], sources: List[SourceFile], jobs: int):
+        count = min(len(sources), jobs * SHARDS_PER_JOB)
+        bounds = [len(sources) * i // count for i in range(count + 1)]
+        shards = [[str(source.path) for source in sources[start:end]] for start, end in zip(bounds, bounds[1:])]
+        # Every shard gets the checkers as they are after start(); pickled
+        # here because the pool pickles lazily, after merges have begun
+        state = pickle.dumps(checkers)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_visit_shard, state, shard, self.fact_cache is not None) for shard in shards]
+            for future in futures:
+                copies, facts = future.result()
+                for checker, copy in zip(checkers, copies):
+                    checker.merge(copy)
+                if self.fact_cache is not None:
+                    self.fact_cache.update(facts)
+
+    def scan(self, checkers: List[Checker], jobs: int = 1) -> List[bool]:
+        self.feed(checkers, jobs)
+        return [checker.finish() for checker in checkers]
+
+
+def _visit(checkers: List[Checker], sources: Iterable[SourceFile]):
+    for source in sources:
+        for checker in checkers:
+            if checker.wants(source):
+                checker.visit(source)
+        source.release()
+
+
+def _visit_shard(state: bytes, paths: List[str], cache: bool) -> Tuple[List[Checker], Dict[str, dict]]:
+    """Worker: visit one shard; return the checkers and the facts it extracted."""
+    checkers = pickle.loads(state)
+    fact_cache = FactCache() if cache else None
+    _visit(checkers, (SourceFile(Path(path), fact_cache) for path in paths))
+    return checkers, fact_cache.changed() if fact_cache is not None else {}
+
+
+def changed_since(rev: str, root='.') -> Dict[str, str]:
+    """Files changed between ``rev`` and the working tree, with their git
+    status letter (A, M, D, ...); untracked files count as added. Renames
+    are split into a deletion and an addition so both paths are reported."""
+    def git(*args) -> List[str]:
+        result = subprocess.run(['git', *args], cwd=root, capture_output=True, text=True, check=True)
+        return [line for line in result.stdout.splitlines() if line]
+
+    changed = {}
+    for line in git('diff', '--name-status', '--no-renames', '--relative', rev, '--'):
+        status, path = line.split('\t', 1)
+        changed[path] = status[0]
+    for path in git('ls-files', '--others', '--exclude-standard'):
+        changed[path] = 'A'
+    return changed
+
+
+def main():
+    scanner = RepoScanner()
+    counts = Counter(source.suffix or '(none)' for source in scanner.files)
+    print(f"📂 {len(scanner.files)} files in {len(scanner.dirs)} directories "
+          f"(pruned: {', '.join(sorted(scanner.prune))})")
+    for suffix, count in counts.most_common(15):
+        print(f"  {count:6d}  {suffix}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
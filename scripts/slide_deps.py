@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Dependency graph extractor for LaTeX slide decks.
+
+A deck depends on its own .tex source, every file it pulls in with
+\\input/\\include, each \\includegraphics and \\includepdf asset (searched
+along \\graphicspath), and the repository style files it loads, following
+\\usepackage/\\RequirePackage chains inside shared/styles. System packages
+such as tikz or amsmath are not tracked.
+
+Usage:
+    python scripts/slide_deps.py <deck.tex> ...                  # list dependencies
+    python scripts/slide_deps.py --format json --all             # JSON graph of every deck
+    python scripts/slide_deps.py --format make --target slides/x.pdf --output .deps/x.d slides/x.tex
+    python scripts/slide_deps.py --affected shared/styles/theme-nipun.sty --all
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Directories searched for \usepackage{name} / \RequirePackage{name}. This
+# mirrors the \input@path set up by shared/styles/custom.sty.
+STYLE_DIRS = [REPO_ROOT / "shared" / "styles", REPO_ROOT / "shared" / "notation"]
+
+TOPICS = ["basics", "maths", "optimization", "supervised", "unsupervised", "neural-networks", "advanced"]
+
+GRAPHICS_EXTENSIONS = ['.pdf', '.png', '.jpg', '.jpeg', '.eps']
+
+COMMENT_PATTERN = re.compile(r'(?<!\\)%.*')
+INPUT_PATTERN = re.compile(r'\\(?:input|include)\s*\{([^}]+)\}')
+GRAPHICS_PATTERN = re.compile(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+INCLUDEPDF_PATTERN = re.compile(r'\\includepdf\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+PACKAGE_PATTERN = re.compile(r'\\(?:usepackage|RequirePackage)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+GRAPHICSPATH_PATTERN = re.compile(r'\\graphicspath\s*\{((?:\s*\{[^}]*\})+)\s*\}')
+
+
+def strip_comments(content: str) -> str:
+    """Remove LaTeX line comments, keeping escaped \\% characters."""
+    return COMMENT_PATTERN.sub('', content)
+
+
+def _first_existing(candidates: List[Path]) -> Optional[Path]:
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def resolve_input(name: str, base_dir: Path) -> Optional[Path]:
+    """Resolve an \\input/\\include argument relative to the compile directory."""
+    return _first_existing([base_dir / name, base_dir / f"{name}.tex"])
+
+
+def resolve_graphic(name: str, base_dir: Path, search_dirs: List[Path] = ()) -> Optional[Path]:
+    """Resolve an \\includegraphics/\\includepdf argument.
+
+    Like graphicx, the compile directory is searched before each
+    \\graphicspath entry, and the known extensions before the bare name.
+    """
+    candidates = []
+    for directory in [base_dir, *search_dirs]:
+        if not Path(name).suffix:
+            candidates.extend(directory / f"{name}{ext}" for ext in GRAPHICS_EXTENSIONS)
+        candidates.append(directory / name)
+    return _first_existing(candidates)
+
+
+def resolve_package(name: str, base_dir: Path, source_dir: Path) -> Optional[Path]:
+    """Resolve a package name to a local .sty file, or None for system packages."""
+    filename = name if name.endswith('.sty') else f"{name}.sty"
+    if '/' in name:
+        return _first_existing([base_dir / filename])
+    return _first_existing([source_dir / filename, base_dir / filename] +
+                           [style_dir / filename for style_dir in STYLE_DIRS])
+
+
+class DeckScan:
+    """Dependency edges of one deck.
+
+    ``edges`` holds (source, target, kind) triples where kind is one of
+    ``input``, ``package``, ``graphic`` or ``pdf``; ``missing`` holds
+    (source, name, kind) for local references that could not be resolved.
+    """
+
+    def __init__(self, tex_file: Path):
+        self.tex_file = tex_file
+        self.edges: List[Tuple[Path, Path, str]] = []
+        self.missing: List[Tuple[Path, str, str]] = []
+        self.graphics_dirs: List[Path] = []
+
+    @property
+    def dependencies(self) -> List[Path]:
+        """Every file the deck depends on, including the deck itself, sorted."""
+        return sorted({self.tex_file} | {target for _, target, _ in self.edges})
+
+
+def scan_deck(tex_file) -> DeckScan:
+    """Walk a deck and the local files it loads, recording every dependency edge."""
+    tex_file = Path(tex_file).resolve()
+    base_dir = tex_file.parent  # decks are compiled from their own directory
+    scan = DeckScan(tex_file)
+    seen: Set[Path] = set()
+    pending = [tex_file]
+
+    while pending:
+        current = pending.pop(0)
+        if current in seen:
+            continue
+        seen.add(current)
+        if current.suffix not in ('.tex', '.sty'):
+            continue
+
+        try:
+            content = strip_comments(current.read_text(encoding='utf-8', errors='ignore'))
+        except OSError:
+            continue
+
+        def add(target: Optional[Path], name: str, kind: str):
+            if target:
+                scan.edges.append((current, target, kind))
+                pending.append(target)
+            else:
+                scan.missing.append((current, name, kind))
+
+        for match in GRAPHICSPATH_PATTERN.finditer(content):
+            for entry in re.findall(r'\{([^}]*)\}', match.group(1)):
+                if entry.strip():
+                    scan.graphics_dirs.append(base_dir / entry.strip())
+
+        for match in INPUT_PATTERN.finditer(content):
+            name = match.group(1).strip()
+            add(resolve_input(name, base_dir), name, 'input')
+
+        for pattern, kind in ((GRAPHICS_PATTERN, 'graphic'), (INCLUDEPDF_PATTERN, 'pdf')):
+            for match in pattern.finditer(content):
+                name = match.group(1).strip()
+                if '\\' in name or '#' in name:
+                    continue  # computed names such as \i or macro parameters
+                add(resolve_graphic(name, base_dir, scan.graphics_dirs), name, kind)
+
+        for match in PACKAGE_PATTERN.finditer(content):
+            for name in match.group(1).split(','):
+                name = name.strip()
+                resolved = resolve_package(name, base_dir, current.parent)
+                if resolved:
+                    add(resolved, name, 'package')
+                elif '/' in name:
+                    scan.missing.append((current, name, 'package'))
+
+    return scan
+
+
+def deck_dependencies(tex_file) -> List[Path]:
+    """Return every local file the deck depends on, including the deck itself.
+
+    Paths are resolved and returned in a stable (sorted) order.
+    """
+    return scan_deck(tex_file).dependencies
+
+
+def find_decks(root: Path = REPO_ROOT) -> List[Path]:
+    """All slide decks: <topic>/slides/*.tex."""
+    decks = []
+    for topic in TOPICS:
+        decks.extend((root / topic / "slides").glob("*.tex"))
+    return sorted(deck.resolve() for deck in decks)
+
+
+def build_graph(decks: List[Path]) -> Dict[Path, DeckScan]:
+    return {Path(deck).resolve(): scan_deck(deck) for deck in decks}
+
+
+def reverse_dependencies(graph: Dict[Path, DeckScan]) -> Dict[Path, List[Path]]:
+    """Map each file to the decks that depend on it."""
+    reverse = defaultdict(set)
+    for deck, scan in graph.items():
+        for dep in scan.dependencies:
+            reverse[dep].add(deck)
+    return {dep: sorted(decks) for dep, decks in reverse.items()}
+
+
+def affected_decks(graph: Dict[Path, DeckScan], changed) -> List[Path]:
+    """Decks that must be rebuilt when any of ``changed`` is modified."""
+    reverse = reverse_dependencies(graph)
+    affected = set()
+    for path in changed:
+        affected.update(reverse.get(Path(path).resolve(), []))
+    return sorted(affected)
+
+
+def _display(path: Path, relative_to: Path) -> str:
+    return Path(os.path.relpath(path, relative_to)).as_posix()
+
+
+def graph_to_json(graph: Dict[Path, DeckScan], relative_to: Path = REPO_ROOT) -> dict:
+    """Serializable graph: per-deck typed edges plus the reverse index."""
+    rel = lambda p: _display(p, relative_to)
+    return {
+        'decks': {
+            rel(deck): {
+                'dependencies': [rel(dep) for dep in scan.dependencies if dep != deck],
+                'edges': [{'from': rel(src), 'to': rel(dst), 'kind': kind}
+                          for src, dst, kind in scan.edges],
+                'missing': [{'from': rel(src), 'name': name, 'kind': kind}
+                            for src, name, kind in scan.missing],
+            }
+            for deck, scan in sorted(graph.items())
+        },
+        'reverse': {rel(dep): [rel(deck) for deck in decks]
+                    for dep, decks in sorted(reverse_dependencies(graph).items())},
+    }
+
+
+def make_fragment(scan: DeckScan, targets: List[str], relative_to: Path) -> str:
+    """Makefile rule listing the deck's dependencies, in the style of `gcc -MD -MP`.
+
+    Every dependency also gets an empty rule, so deleting or renaming a file
+    makes the deck rebuild instead of failing with "No rule to make target".
+    """
+    deps = [_display(dep, relative_to) for dep in scan.dependencies]
+    lines = [f"{' '.join(targets)}: \\"]
+    lines.extend(f"  {dep} \\" for dep in deps[:-1])
+    lines.append(f"  {deps[-1]}")
+    lines.append("")
+    for dep in deps:
+        if Path(relative_to, dep).resolve() != scan.tex_file:
+            lines.append(f"{dep}:")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract dependency graphs from LaTeX slide decks")
+    parser.add_argument('decks', nargs='*', help='Deck .tex files (default with --all: every */slides/*.tex)')
+    parser.add_argument('--all', action='store_true', help='Scan every deck in the repository')
+    parser.add_argument('--format', choices=['list', 'json', 'make'], default='list')
+    parser.add_argument('--target', action='append', default=[],
+                        help='Make target(s) for --format make (default: the deck PDF)')
+    parser.add_argument('--output', help='Write to this file instead of stdout')
+    parser.add_argument('--affected', nargs='+', metavar='FILE',
+                        help='Only print the decks that depend on these files')
+    args = parser.parse_args()
+
+    decks = [Path(d) for d in args.decks]
+    if args.all or not decks:
+        decks.extend(find_decks())
+    if not decks:
+        parser.error("no decks given")
+
+    cwd = Path.cwd()
+    graph = build_graph(decks)
+
+    if args.affected:
+        output = ''.join(f"{_display(deck, cwd)}\n" for deck in affected_decks(graph, args.affected))
+    elif args.format == 'json':
+        output = json.dumps(graph_to_json(graph), indent=2) + '\n'
+    elif args.format == 'make':
+        fragments = []
+        for deck, scan in graph.items():
+            targets = args.target or [_display(deck.with_suffix('.pdf'), cwd)]
+            if args.output:
+                targets = targets + [args.output]  # regenerate the fragment with the deck
+            fragments.append(make_fragment(scan, targets, cwd))
+        output = '\n'.join(fragments)
+    else:
+        lines = []
+        for deck, scan in graph.items():
+            lines.append(f"{_display(deck, cwd)}:")
+            lines.extend(f"  {_display(dep, cwd)}" for dep in scan.dependencies if dep != deck)
+            lines.extend(f"  ❌ missing {kind}: {name}" for _, name, kind in scan.missing)
+        output = '\n'.join(lines) + '\n'
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output, encoding='utf-8')
+    else:
+        sys.stdout.write(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Find many literal terms in one pass over a text (Aho-Corasick).
+
+The content audit looks for every discouraged spelling and every command
+that needs a package. Searching for each term separately costs one scan of
+the file per term; TermMatcher builds one automaton for all of them, so a
+text is read once however many terms there are:
+
+    matcher = TermMatcher(ignore_case=True)
+    matcher.add('data set', 'dataset')
+    matcher.add('over fitting', 'overfitting')
+    matcher.build()
+    for start, end, value in matcher.finditer(text):
+        ...
+
+Overlapping matches are all reported, in the order they end.
+
+Usage:
+    python scripts/term_matcher.py TERM [TERM ...] < FILE    # positions of the terms
+"""
+
+import argparse
+import re
+import sys
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+class TermMatcher:
+    def __init__(self, ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        # Node 0 is the root; goto[n] maps a character to the next node
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[int, object]]] = [[]]
+        self.terms = 0
+        self.first = None
+        self.built = False
+
+    def _fold(self, text: str) -> str:
+        if not self.ignore_case:
+            return text
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded
+        # Only length-preserving case folds, so positions stay valid
+        return ''.join(c if len(c) == 1 else ch for ch, c in ((ch, ch.lower()) for ch in text))
+
+    def add(self, term: str, value: object = None):
+        """Add ``term``; its matches are reported with ``value`` (default: the term)."""
+        if not term:
+            raise ValueError("empty term")
+        node = 0
+        for ch in self._fold(term):
+            following = self.goto[node].get(ch)
+            if following is None:
+                following = len(self.goto)
+                self.goto[node][ch] = following
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            node = following
+        self.outputs[node].append((len(term), term if value is None else value))
+        self.terms += 1
+        self.built = False
+
+    def build(self):
+        """Compute the failure links; called by finditer() when needed."""
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, following in self.goto[node].items():
+                queue.append(following)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[following] = self.goto[state].get(ch, 0)
+                # A match ending here also ends every suffix that is a term
+                self.outputs[following] = self.outputs[following] + self.outputs[self.fail[following]]
+        # From the root, skip straight to the next character that starts a term
+        self.first = None
+        if self.goto[0]:
+            self.first = re.compile('[' + ''.join(re.escape(ch) for ch in self.goto[0]) + ']')
+        self.built = True
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, object]]:
+        """(start, end, value) of every term occurrence in ``text``."""
+        if not self.built:
+            self.build()
+        if self.first is None:
+            # No terms, nothing to find
+            return
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        text = self._fold(text)
+        node, position, size = 0, 0, len(text)
+        while position < size:
+            if node == 0:
+                match = self.first.search(text, position)
+                if match is None:
+                    return
+                position = match.start()
+            ch = text[position]
+            position += 1
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in outputs[node]:
+                yield position - length, position, value
+
+    def __len__(self):
+        return self.terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find terms in standard input")
+    parser.add_argument('terms', nargs='+')
+    parser.add_argument('-i', '--ignore-case', action='store_true')
+    args = parser.parse_args()
+
+    matcher = TermMatcher(args.ignore_case)
+    for term in args.terms:
+        matcher.add(term)
+    found = 0
+    for line_num, line in enumerate(sys.stdin, 1):
+        for start, _, term in matcher.finditer(line):
+            print(f"{line_num}:{start + 1}: {term}")
+            found += 1
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
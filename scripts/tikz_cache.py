@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of TikZ pictures shared by all decks.
+
+compile_deck.py --tikz-cache defines \\mlTikzCache and \\mlTikzCacheContext
+before the deck is read, which makes shared/styles/custom.sty load
+tikz-cache.sty. Pictures are then memoized into .cache/tikz as
+
+    <md5 of picture source>-<md5 of context>.pdf   (plus a .memo file)
+
+where the context includes the deck's preamble hash (see
+preamble_format.py). Identical pictures compile once and are reused across
+passes, decks and CI runs that restore .cache/tikz. A picture named with
+\\tikzsetnextfilename{name} gets the prefix "name.".
+
+After each pass the new externs listed in <deck>.mmz are extracted from the
+deck PDF with memoize-extract, and one more pass typesets the deck from them.
+
+Usage:
+    python scripts/tikz_cache.py stats              # number and size of cached pictures
+    python scripts/tikz_cache.py clear              # remove the cache
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from preamble_format import preamble_hash, split_preamble
+from slide_deps import REPO_ROOT
+
+TIKZ_CACHE_DIR = REPO_ROOT / ".cache" / "tikz"
+
+EXTRACT_SCRIPTS = ['memoize-extract.pl', 'memoize-extract.py']
+NEW_EXTERN_PATTERN = re.compile(r'\\mmzNewExtern\b')
+
+
+def cache_prelude(tex_file: Path, engine: str) -> str:
+    """TeX definitions that switch on the cache for ``tex_file``."""
+    head, _ = split_preamble(tex_file.read_text(encoding='utf-8', errors='ignore'))
+    context = preamble_hash(head, tex_file.parent, engine)
+    return f"\\def\\mlTikzCache{{{TIKZ_CACHE_DIR.as_posix()}/}}\\def\\mlTikzCacheContext{{{context}}}"
+
+
+def cache_environment(env: Optional[dict] = None) -> dict:
+    """Environment that lets TeX and memoize-extract write into .cache/tikz.
+
+    kpathsea's default (openout_any=p) refuses absolute output paths
+    outside the working directory. The directory itself is created here,
+    since tikz-cache.sty tells memoize not to.
+    """
+    TIKZ_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ if env is None else env)
+    env['openout_any'] = 'a'
+    return env
+
+
+def extract_externs(tex_file: Path, env: Optional[dict] = None, work_dir: Optional[Path] = None,
+                    timeout: int = 120) -> int:
+    """Extract the pictures memoized by the last pass; return how many were new.
+
+    ``work_dir`` is where the engine wrote the record and the PDF, if not
+    next to the deck.
+    """
+    work_dir = work_dir or tex_file.parent
+    record = work_dir / f"{tex_file.stem}.mmz"
+    try:
+        new_externs = len(NEW_EXTERN_PATTERN.findall(record.read_text(encoding='utf-8', errors='ignore')))
+    except OSError:
+        return 0
+    if not new_externs:
+        return 0
+
+    script = next((s for s in EXTRACT_SCRIPTS if shutil.which(s)), None)
+    if script is None:
+        return 0
+    try:
+        subprocess.run([script, record.name], cwd=work_dir,
+                       capture_output=True, timeout=timeout, env=cache_environment(env))
+    except (OSError, subprocess.TimeoutExpired):
+        return 0
+    return new_externs
+
+
+def named_externs(name: str) -> List[Path]:
+    """Cached pictures produced under \\tikzsetnextfilename{name}."""
+    if not TIKZ_CACHE_DIR.is_dir():
+        return []
+    return sorted(TIKZ_CACHE_DIR.glob(f"{name}.*.pdf"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the shared TikZ picture cache")
+    parser.add_argument('command', choices=['stats', 'clear'])
+    args = parser.parse_args()
+
+    if args.command == 'clear':
+        shutil.rmtree(TIKZ_CACHE_DIR, ignore_errors=True)
+        print(f"🧹 Cleared {TIKZ_CACHE_DIR}")
+        return 0
+
+    externs = list(TIKZ_CACHE_DIR.rglob("*.pdf")) if TIKZ_CACHE_DIR.is_dir() else []
+    size = sum(extern.stat().st_size for extern in externs)
+    print(f"🖼️  {len(externs)} cached pictures, {size / 1024:.1f} KiB in {TIKZ_CACHE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
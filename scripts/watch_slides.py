@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Watch slide sources and rebuild only the decks a change affects.
+
+The daemon builds the dependency graph of every deck (slide_deps.py) and
+watches the directories of all dependencies with inotify. A burst of saves
+is debounced into one batch and mapped through the reverse dependencies to
+the affected decks, which are compiled by a pool of warm worker processes
+with precompiled preamble formats and the shared TikZ cache, each in its
+own scratch directory (see compile_deck.py --out-of-tree). Editing a
+deck's own source rescans its dependencies, so new \\input or
+\\includegraphics files are picked up.
+
+The last build status is served as JSON on a Unix socket
+(.cache/watch.sock); editors can read it with --status or any socket client,
+e.g. `socat - UNIX-CONNECT:.cache/watch.sock`.
+
+Without inotify (e.g. macOS) the watched files are polled instead.
+
+Usage:
+    python scripts/watch_slides.py [--jobs 2] [--debounce 0.15] [topic ...]
+    python scripts/watch_slides.py --status
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from build_cache import BuildManifest, CACHE_DIR, manifest_lock
+from compile_deck import compile_deck, warm_format
+from slide_deps import REPO_ROOT, TOPICS, build_graph, find_decks, reverse_dependencies, scan_deck
+
+SOCKET_PATH = CACHE_DIR / "watch.sock"
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+class InotifyWatcher:
+    """Directory watches through the raw inotify syscalls (Linux only)."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, Path] = {}
+
+    def watch(self, directory: Path):
+        if directory in self.dirs.values():
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = directory
+
+    def wait(self, timeout: Optional[float]) -> List[Path]:
+        """Paths changed within ``timeout`` seconds (None blocks)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        changed = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += EVENT_HEADER.size + length
+                if wd in self.dirs and name:
+                    changed.append(self.dirs[wd] / os.fsdecode(name))
+
+
+class PollingWatcher:
+    """Fallback that compares mtimes of every file in the watched directories."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.dirs: Set[Path] = set()
+        self.mtimes: Dict[Path, float] = {}
+
+    def _snapshot(self, directory: Path) -> Dict[Path, float]:
+        try:
+            return {entry: entry.stat().st_mtime for entry in directory.iterdir() if entry.is_file()}
+        except OSError:
+            return {}
+
+    def watch(self, directory: Path):
+        if directory not in self.dirs:
+            self.dirs.add(directory)
+            self.mtimes.update(self._snapshot(directory))
+
+    def wait(self, timeout: Optional[float]) -> List[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = {}
+        for directory in self.dirs:
+            current.update(self._snapshot(directory))
+        changed = [path for path in set(current) | set(self.mtimes)
+                   if current.get(path) != self.mtimes.get(path)]
+        self.mtimes = current
+        return changed
+
+
+def _build(deck: str, engine: str) -> dict:
+    """Worker: compile one deck and return a JSON-friendly summary."""
+    result = compile_deck(deck, engine=engine, preamble_format=True, tikz_cache=True, out_of_tree=True)
+    if result.timed_out:
+        status = 'timeout'
+    else:
+        status = 'success' if result.success and result.pdf_file.exists() else 'failed'
+    return {
+        'deck': os.path.relpath(deck, REPO_ROOT),
+        'status': status,
+        'passes': result.passes,
+        'wall_time': round(result.wall_time, 2),
+        'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'errors': [entry.to_dict() for entry in result.errors[:10]],
+    }
+
+
+class SlideWatcher:
+    def __init__(self, decks: List[Path], engine: str, jobs: int, debounce: float):
+        self.engine = engine
+        self.debounce = debounce
+        self.graph = build_graph(decks)
+        self.reverse = reverse_dependencies(self.graph)
+        self.pool = ProcessPoolExecutor(max_workers=jobs)
+        self.lock = threading.Lock()
+        self.building: Set[Path] = set()
+        self.queued: Set[Path] = set()
+        self.status = {'state': 'idle', 'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'last': None, 'decks': {}}
+        try:
+            self.watcher = InotifyWatcher()
+        except OSError:
+            print("⚠️  inotify not available, polling for changes")
+            self.watcher = PollingWatcher()
+        self._watch_dependencies()
+
+    def _watch_dependencies(self):
+        for path in self.reverse:
+            self.watcher.watch(path.parent)
+        for deck in self.graph:
+            self.watcher.watch(deck.parent)  # new decks and re-created sources
+
+    def warm_up(self):
+        """Dump every deck's preamble format up front, in the worker pool."""
+        print(f"🔥 Preparing preamble formats for {len(self.graph)} decks...")
+        decks = list(self.graph)
+        list(self.pool.map(warm_format, decks, [self.engine] * len(decks), [True] * len(decks)))
+
+    def affected(self, changed: Set[Path]) -> Set[Path]:
+        decks = set()
+        for path in changed:
+            path = path.resolve()
+            if path.suffix == '.tex' and path.parent.name == 'slides' and path.exists():
+                # A deck's own source: its dependencies may have changed too
+                self.graph[path] = scan_deck(path)
+                self.reverse = reverse_dependencies(self.graph)
+                self._watch_dependencies()
+            decks.update(self.reverse.get(path, []))
+        return decks
+
+    def submit(self, deck: Path):
+        with self.lock:
+            if deck in self.building:
+                self.queued.add(deck)  # rebuilt again once the running build ends
+                return
+            self.building.add(deck)
+            self.status['state'] = 'building'
+        print(f"🔨 {os.path.relpath(deck, REPO_ROOT)}")
+        future = self.pool.submit(_build, str(deck), self.engine)
+        future.add_done_callback(lambda f, deck=deck: self._finished(deck, f))
+
+    def _finished(self, deck: Path, future):
+        try:
+            summary = future.result()
+        except Exception as e:
+            summary = {'deck': os.path.relpath(deck, REPO_ROOT), 'status': 'exception',
+                       'errors': [{'message': str(e)}]}
+        if summary['status'] == 'success':
+            with manifest_lock():
+                manifest = BuildManifest()
+                manifest.record(deck)
+                manifest.save()
+            print(f"✅ {summary['deck']} in {summary['wall_time']:.1f}s ({summary['passes']} pass"
+                  f"{'es' if summary['passes'] != 1 else ''})")
+        else:
+            print(f"❌ {summary['deck']}: {summary['status']}")
+            for error in summary['errors']:
+                location = f"{error.get('file')}:{error.get('line')}" if error.get('line') else ''
+                print(f"   {location} {error['message']}".rstrip())
+
+        with self.lock:
+            self.building.discard(deck)
+            self.status['last'] = summary
+            self.status['decks'][summary['deck']] = summary['status']
+            again = deck in self.queued
+            self.queued.discard(deck)
+            if not self.building and not again:
+                self.status['state'] = 'idle'
+        if again:
+            self.submit(deck)
+
+    def status_json(self) -> bytes:
+        with self.lock:
+            return (json.dumps(self.status) + '\n').encode()
+
+    def serve_status(self, path: Path = SOCKET_PATH):
+        watcher = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.sendall(watcher.status_json())
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        server = socketserver.ThreadingUnixStreamServer(str(path), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def run(self):
+        print(f"👀 Watching {len(self.reverse)} files for {len(self.graph)} decks (Ctrl-C to stop)")
+        pending: Set[Path] = set()
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            changed = self.watcher.wait(timeout)
+            if changed:
+                # Editors write a file in several steps; wait for the burst to end
+                pending.update(changed)
+                deadline = time.monotonic() + self.debounce
+            elif deadline is not None and time.monotonic() >= deadline:
+                for deck in sorted(self.affected(pending)):
+                    self.submit(deck)
+                pending.clear()
+                deadline = None
+
+
+def query_status(path: Path = SOCKET_PATH) -> int:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            data = b''
+            while chunk := client.recv(65536):
+                data += chunk
+    except OSError:
+        print(f"❌ No watcher is listening on {path}")
+        return 1
+    print(json.dumps(json.loads(data), indent=2))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild affected slide decks when their sources change")
+    parser.add_argument('topics', nargs='*', metavar='topic', help='Topics to watch (default: all)')
+    parser.add_argument('--engine', default='xelatex', help='TeX engine (default: xelatex)')
+    parser.add_argument('-j', '--jobs', type=int, default=2, help='Warm worker processes (default: 2)')
+    parser.add_argument('--debounce', type=float, default=0.15,
+                        help='Seconds without further changes before building (default: 0.15)')
+    parser.add_argument('--no-warm', action='store_true', help='Skip dumping preamble formats at startup')
+    parser.add_argument('--status', action='store_true', help='Print the status of a running watcher and exit')
+    args = parser.parse_args()
+
+    if args.status:
+        return query_status()
+    unknown = sorted(set(args.topics) - set(TOPICS))
+    if unknown:
+        parser.error(f"unknown topic(s): {', '.join(unknown)}")
+
+    decks = find_decks()
+    if args.topics:
+        decks = [deck for deck in decks if deck.relative_to(REPO_ROOT).parts[0] in args.topics]
+
+    watcher = SlideWatcher(decks, args.engine, max(1, args.jobs), args.debounce)
+    server = watcher.serve_status()
+    try:
+        if not args.no_warm:
+            watcher.warm_up()
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        server.shutdown()
+        SOCKET_PATH.unlink(missing_ok=True)
+        watcher.pool.shutdown(cancel_futures=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
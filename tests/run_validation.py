@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Run all repository validators over a single scan of the tree.
+
+Each validator can still be run on its own (python tests/test_*.py). This
+runner walks the repository once with scripts/repo_scanner.py and feeds
+every file to all validators in the same pass, so each .tex file and
+notebook is read once instead of once per validator.
+
+With --changed-since <rev> only the files changed since <rev> (git diff,
+plus untracked files) are validated, together with the .tex files that
+reference them: a renamed figure re-checks every deck that includes it.
+The structure check only runs when files were added or removed.
+
+With --jobs N the files are visited by N processes (see
+scripts/repo_scanner.py); the reports are identical to a serial run. It
+pays off on a cold fact cache, when every notebook has to be parsed.
+
+Usage:
+    python tests/run_validation.py
+    python tests/run_validation.py --changed-since origin/main
+    python tests/run_validation.py --jobs 4
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from repo_scanner import RepoScanner, changed_since
+
+import test_graphics_paths
+import test_missing_pdfs
+import test_notebook_conventions
+import test_notebook_paths
+import test_slide_conventions
+import test_structure
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Run all repository validators over one scan")
+    parser.add_argument('--changed-since', metavar='REV',
+                        help='Only validate files changed since REV and the files referencing them')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Processes visiting the files (default: 1)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    scanner = RepoScanner(".")
+    check_structure = True
+    if args.changed_since:
+        try:
+            changed = changed_since(args.changed_since)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ git could not diff against {args.changed_since}: {e.stderr.strip()}")
+            sys.exit(2)
+        selected = scanner.select_changed(changed)
+        # Modified files cannot change the directory layout
+        check_structure = any(status != 'M' for status in changed.values())
+        print(f"🔀 {len(changed)} files changed since {args.changed_since}, "
+              f"validating {len(selected)} files including the ones referencing them")
+        for path in sorted(selected):
+            print(f"   {'📝' if path in changed else '↩️ '} {path}")
+        print()
+
+    checkers = {
+        "graphics paths": test_graphics_paths.LaTeXGraphicsValidator(),
+        "notebook paths": test_notebook_paths.NotebookPathValidator(),
+        "notebook conventions": test_notebook_conventions.NotebookConventionValidator(),
+        "slide conventions": test_slide_conventions.SlideNamingChecker(),
+        "missing PDFs": test_missing_pdfs.IncludePdfCollector(),
+    }
+    scanner.feed(list(checkers.values()), jobs=args.jobs)
+    scan_time = time.perf_counter() - start
+
+    results = {}
+    print("=" * 80)
+    print("🏗️  STRUCTURE")
+    print("=" * 80)
+    if check_structure:
+        results["structure"] = test_structure.RepositoryStructureValidator().validate()
+    else:
+        print("⏭️  No files added or removed, skipping the structure check")
+    for name, checker in checkers.items():
+        print("\n" + "=" * 80)
+        print(f"🔎 {name.upper()}")
+        print("=" * 80)
+        results[name] = checker.finish()
+
+    print("\n" + "=" * 80)
+    scanned = len(scanner.files) if scanner.selected is None else len(scanner.selected)
+    print(f"📊 VALIDATION SUMMARY ({scanned} files scanned in {scan_time:.2f}s, "
+          f"total {time.perf_counter() - start:.2f}s)")
+    print("=" * 80)
+    for name, passed in results.items():
+        print(f"   {'✅' if passed else '❌'} {name}")
+
+    failed = [name for name, passed in results.items() if not passed]
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(results)} validators failed")
+        sys.exit(1)
+    else:
+        print(f"\n🎉 All {len(results)} validators passed!")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
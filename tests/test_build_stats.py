@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Build Statistics Log Parsing Tests
+
+Checks that scripts/build_stats.py reads the page count and size from the
+"Output written on" line of real engine logs: pdfTeX logs pages and bytes,
+XeTeX (xdvipdfmx) only pages, and long lines are wrapped at 79 columns.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from build_stats import parse_output_summary
+
+# Log tails as the engines write them
+XETEX_LOG = """\
+Package rerunfilecheck Info: File `knn.out' has not changed.
+(rerunfilecheck)             Checksum: D41D8CD98F00B204E9800998ECF8427E;0.
+ )
+Here is how much of TeX's memory you used:
+ 49870 strings out of 476179
+ 71 hyphenation exceptions out of 8191
+ 127i,16n,125p,1120b,1022s stack positions out of 10000i,1000n,20000p,200000b,200000s
+
+Output written on knn.pdf (23 pages).
+"""
+
+PDFTEX_LOG = """\
+ </usr/local/texlive/2023/texmf-dist/fonts/type1/public/amsfonts/cm/cmr10.pfb>
+Output written on knn.pdf (23 pages, 412345 bytes).
+PDF statistics:
+ 412 PDF objects out of 1000 (max. 8388607)
+"""
+
+WRAPPED_LOG = """\
+Output written on /dev/shm/ml-teaching-1000-1a2b3c4d/supervised/slides/decision-t
+rees/decision-trees.pdf (1 page).
+"""
+
+
+def _parse(log_text: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = Path(tmp) / "deck.log"
+        log_file.write_text(log_text, encoding='utf-8')
+        return parse_output_summary(log_file)
+
+
+def test_xetex_log_has_pages_only():
+    assert _parse(XETEX_LOG) == (23, None)
+
+
+def test_pdftex_log_has_pages_and_bytes():
+    assert _parse(PDFTEX_LOG) == (23, 412345)
+
+
+def test_wrapped_output_line():
+    assert _parse(WRAPPED_LOG) == (1, None)
+
+
+def test_missing_output_line():
+    assert _parse("No pages of output.\n") == (None, None)
+
+
+def main():
+    tests = [test_xetex_log_has_pages_only, test_pdftex_log_has_pages_and_bytes,
+             test_wrapped_output_line, test_missing_output_line]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError:
+            failures += 1
+            print(f"❌ {test.__name__}")
+    print(f"\n{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
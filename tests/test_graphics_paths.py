@@ -12,6 +12,10 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Set, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from asset_index import asset_index
+from repo_scanner import Checker, RepoScanner
+
 class GraphicsPathViolation:
     def __init__(self, tex_file: str, line_num: int, graphics_path: str, 
                  violation_type: str, description: str, fix: str):
@@ -22,7 +26,9 @@ class GraphicsPathViolation:
         self.description = description
         self.fix = fix
 
-class LaTeXGraphicsValidator:
+class LaTeXGraphicsValidator(Checker):
+    suffixes = ('.tex',)
+
     def __init__(self, root_path: str = "."):
         self.root = Path(root_path).resolve()
         self.violations: List[GraphicsPathViolation] = []
@@ -33,29 +39,41 @@ class LaTeXGraphicsValidator:
         # Expected pattern: ../assets/{topic-name}/{type}/filename
         self.expected_pattern = re.compile(r'^\.\./assets/([^/]+)/(figures|diagrams|notes)/(.+)$')
         
-        # Pattern to find \includegraphics commands
-        self.includegraphics_pattern = re.compile(
-            r'\\includegraphics(?:\[[^\]]*\])?\s*\{\s*([^}]+)\s*\}', 
-            re.IGNORECASE
-        )
+        # \includegraphics commands are found by scripts/file_facts.py
         
     def validate(self) -> bool:
         """Run graphics path validation on all .tex files"""
+        return RepoScanner(self.root).scan([self])[0]
+
+    def start(self, scanner: RepoScanner):
+        self.file_counts: List[Tuple[Path, int, int]] = []
+    
+    def visit(self, source):
+        facts = source.facts
+        if 'error' in facts:
+            print(f"⚠️  Could not read {source.path}: {facts['error']}")
+            return
+        self.file_counts.append((source.path, *self._validate_tex_file(source.path, facts['includegraphics'])))
+
+    def merge(self, other):
+        self.violations.extend(other.violations)
+        self.file_counts.extend(other.file_counts)
+    
+    def finish(self) -> bool:
+        """Report the results of the scan"""
         print(f"🖼️  Validating \\includegraphics paths in LaTeX files...")
         
-        tex_files = list(self.root.glob("**/*.tex"))
-        if not tex_files:
+        if not self.file_counts:
             print("⚠️  No .tex files found!")
             return True
             
-        print(f"📄 Found {len(tex_files)} .tex files to validate")
+        print(f"📄 Found {len(self.file_counts)} .tex files to validate")
         
         total_graphics = 0
         compliant_graphics = 0
         files_with_graphics = 0
         
-        for tex_file in tex_files:
-            file_graphics, file_compliant = self._validate_tex_file(tex_file)
+        for tex_file, file_graphics, file_compliant in self.file_counts:
             if file_graphics > 0:
                 files_with_graphics += 1
                 total_graphics += file_graphics
@@ -63,7 +81,7 @@ class LaTeXGraphicsValidator:
                 print(f"   📝 {tex_file.name}: {file_compliant}/{file_graphics} graphics paths compliant")
         
         print(f"\n📊 Graphics validation summary:")
-        print(f"   📄 Files with graphics: {files_with_graphics}/{len(tex_files)}")
+        print(f"   📄 Files with graphics: {files_with_graphics}/{len(self.file_counts)}")
         print(f"   🖼️  Total graphics found: {total_graphics}")
         print(f"   ✅ Compliant paths: {compliant_graphics}")
         print(f"   ❌ Non-compliant paths: {total_graphics - compliant_graphics}")
@@ -79,15 +97,8 @@ class LaTeXGraphicsValidator:
             print("✅ All topic names are properly matched")
             return True
     
-    def _validate_tex_file(self, tex_file: Path):
+    def _validate_tex_file(self, tex_file: Path, graphics: List[Tuple[int, str]]):
         """Validate graphics paths in a single .tex file"""
-        try:
-            with open(tex_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"⚠️  Could not read {tex_file}: {e}")
-            return 0, 0
-        
         # Determine expected topic name from file location and name
         expected_topic = self._get_expected_topic_name(tex_file)
         
@@ -95,18 +106,10 @@ class LaTeXGraphicsValidator:
         file_graphics_count = 0
         file_violations_before = len(self.violations)
         
-        # Find all \includegraphics commands
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            # Skip comments
-            if line.strip().startswith('%'):
-                continue
-                
-            matches = self.includegraphics_pattern.findall(line)
-            for graphics_path in matches:
-                graphics_path = graphics_path.strip()
-                file_graphics_count += 1
-                self._validate_graphics_path(tex_file, line_num, graphics_path, expected_topic)
+        # All \includegraphics commands outside comments
+        for line_num, graphics_path in graphics:
+            file_graphics_count += 1
+            self._validate_graphics_path(tex_file, line_num, graphics_path, expected_topic)
         
         # Calculate compliant graphics for this file
         file_violations_after = len(self.violations)
@@ -215,13 +218,13 @@ class LaTeXGraphicsValidator:
             
             # Check if the referenced file actually exists
             asset_file = tex_file.parent / graphics_path
-            if not asset_file.exists():
+            if not asset_index().is_file(asset_file):
                 # Check with common extensions if no extension provided
                 if '.' not in Path(graphics_path).name:
                     extensions = ['.pdf', '.png', '.jpg', '.jpeg', '.svg', '.eps']
                     file_found = False
                     for ext in extensions:
-                        if (tex_file.parent / (graphics_path + ext)).exists():
+                        if asset_index().is_file(tex_file.parent / (graphics_path + ext)):
                             file_found = True
                             break
                     if not file_found:
@@ -231,7 +234,7 @@ class LaTeXGraphicsValidator:
                             graphics_path=graphics_path,
                             violation_type="MISSING_FILE",
                             description=f"Referenced graphics file does not exist: {asset_file}",
-                            fix=f"Create the missing file or fix the path"
+                            fix=self._missing_file_fix(tex_file, graphics_path)
                         ))
                 else:
                     self.violations.append(GraphicsPathViolation(
@@ -240,18 +243,18 @@ class LaTeXGraphicsValidator:
                         graphics_path=graphics_path,
                         violation_type="MISSING_FILE",
                         description=f"Referenced graphics file does not exist: {asset_file}",
-                        fix=f"Create the missing file or fix the path"
+                        fix=self._missing_file_fix(tex_file, graphics_path)
                     ))
         elif cross_match:
             # Cross-category reference is valid, just check file exists
             asset_file = tex_file.parent / graphics_path
-            if not asset_file.exists():
+            if not asset_index().is_file(asset_file):
                 # Check with common extensions if no extension provided
                 if '.' not in Path(graphics_path).name:
                     extensions = ['.pdf', '.png', '.jpg', '.jpeg', '.svg', '.eps']
                     file_found = False
                     for ext in extensions:
-                        if (tex_file.parent / (graphics_path + ext)).exists():
+                        if asset_index().is_file(tex_file.parent / (graphics_path + ext)):
                             file_found = True
                             break
                     if not file_found:
@@ -261,7 +264,7 @@ class LaTeXGraphicsValidator:
                             graphics_path=graphics_path,
                             violation_type="MISSING_FILE",
                             description=f"Referenced graphics file does not exist: {asset_file}",
-                            fix=f"Create the missing file or fix the path"
+                            fix=self._missing_file_fix(tex_file, graphics_path)
                         ))
                 else:
                     self.violations.append(GraphicsPathViolation(
@@ -270,9 +273,15 @@ class LaTeXGraphicsValidator:
                         graphics_path=graphics_path,
                         violation_type="MISSING_FILE",
                         description=f"Referenced graphics file does not exist: {asset_file}",
-                        fix=f"Create the missing file or fix the path"
+                        fix=self._missing_file_fix(tex_file, graphics_path)
                     ))
     
+    def _missing_file_fix(self, tex_file: Path, graphics_path: str) -> str:
+        suggestions = asset_index().suggest(tex_file.parent / graphics_path, relative_to=tex_file.parent)
+        if suggestions:
+            return f"Did you mean {' or '.join(suggestions)}?"
+        return "Create the missing file or fix the path"
+    
     def _is_topic_related(self, actual_topic: str, expected_topic: str, tex_file: Path) -> bool:
         """Check if actual topic name is reasonably related to expected"""
         # Exact match
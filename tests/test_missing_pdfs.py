@@ -6,49 +6,58 @@ Validates that all PDFs referenced by \includepdf exist in the expected location
 
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from asset_index import asset_index
+from repo_scanner import Checker, RepoScanner
+
+
+class IncludePdfCollector(Checker):
+    r"""Collects the \includepdf references of every .tex file in a scan."""
+    suffixes = ('.tex',)
+
+    def __init__(self):
+        self.references = []
+
+    def visit(self, source):
+        # \includepdf targets are found by scripts/file_facts.py
+        facts = source.facts
+        if 'error' in facts or 'undecodable' in facts:
+            print(f"Warning: Could not read {source.path}: {facts.get('error') or facts['undecodable']}")
+            return
+
+        for pdf_path in facts['includepdf']:
+            # Skip LaTeX variables like \i, \thetree
+            if '\\' in pdf_path:
+                continue
+                
+            self.references.append({
+                'tex_file': str(source.path),
+                'pdf_path': pdf_path,
+                'line_context': None  # Could add line number context if needed
+            })
+
+    def merge(self, other):
+        self.references.extend(other.references)
+
+    def finish(self):
+        return report(self.references)
+
 
 def find_includepdf_references():
     r"""Find all \includepdf references in LaTeX files."""
-    references = []
-    root_dir = Path(".")
-    
-    # Find all .tex files
-    tex_files = list(root_dir.rglob("*.tex"))
-    
-    for tex_file in tex_files:
-        try:
-            with open(tex_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find \includepdf commands
-            # Pattern matches: \includepdf[options]{path/to/file.pdf}
-            pattern = r'\\includepdf(?:\[[^\]]*\])?\s*\{([^}]+)\}'
-            matches = re.findall(pattern, content)
-            
-            for match in matches:
-                pdf_path = match.strip()
-                # Skip LaTeX variables like \i, \thetree
-                if '\\' in pdf_path:
-                    continue
-                    
-                references.append({
-                    'tex_file': str(tex_file),
-                    'pdf_path': pdf_path,
-                    'line_context': None  # Could add line number context if needed
-                })
-                
-        except Exception as e:
-            print(f"Warning: Could not read {tex_file}: {e}")
-    
-    return references
+    collector = IncludePdfCollector()
+    RepoScanner(".").feed([collector])
+    return collector.references
 
 
 def validate_pdf_existence(references):
     """Validate that referenced PDFs exist."""
     missing_pdfs = []
     found_pdfs = []
+    assets = asset_index()
     
     for ref in references:
         tex_file = Path(ref['tex_file'])
@@ -73,7 +82,7 @@ def validate_pdf_existence(references):
         actual_path = None
         
         for path in possible_paths:
-            if path.exists() and path.is_file():
+            if assets.is_file(path):
                 pdf_exists = True
                 actual_path = str(path)
                 break
@@ -88,18 +97,17 @@ def validate_pdf_existence(references):
             missing_pdfs.append({
                 'tex_file': ref['tex_file'],
                 'pdf_path': pdf_path,
-                'searched_paths': [str(p) for p in possible_paths]
+                'searched_paths': [str(p) for p in possible_paths],
+                'suggestions': assets.suggest(tex_dir / pdf_path, relative_to=tex_dir)
             })
     
     return found_pdfs, missing_pdfs
 
 
-def main():
-    """Main validation function."""
+def report(references):
+    """Check the collected references and print the results."""
     print("🔍 Searching for \\includepdf references in LaTeX files...")
     
-    references = find_includepdf_references()
-    
     if not references:
         print("✅ No \\includepdf references found in LaTeX files.")
         return True
@@ -120,6 +128,8 @@ def main():
             print(f"      Searched paths:")
             for path in missing['searched_paths']:
                 print(f"        - {path}")
+            if missing['suggestions']:
+                print(f"      Closest existing: {', '.join(missing['suggestions'])}")
             print()
         
         print(f"💡 Suggestions:")
@@ -133,6 +143,11 @@ def main():
         return True
 
 
+def main():
+    """Main validation function."""
+    return RepoScanner(".").scan([IncludePdfCollector()])[0]
+
+
 if __name__ == "__main__":
     success = main()
     exit(0 if success else 1)
\ No newline at end of file
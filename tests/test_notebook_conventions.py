@@ -13,6 +13,9 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Set
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from repo_scanner import Checker, RepoScanner
+
 class NotebookConventionViolation:
     def __init__(self, file_path: str, violation_type: str, description: str, fix: str):
         self.file_path = file_path
@@ -20,7 +23,9 @@ class NotebookConventionViolation:
         self.description = description
         self.fix = fix
 
-class NotebookConventionValidator:
+class NotebookConventionValidator(Checker):
+    suffixes = ('.tex',)
+
     def __init__(self, root_path: str = "."):
         self.root = Path(root_path).resolve()
         self.violations: List[NotebookConventionViolation] = []
@@ -28,21 +33,38 @@ class NotebookConventionValidator:
         # Expected naming pattern: lowercase-with-hyphens.ipynb
         self.valid_notebook_pattern = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*\.ipynb$')
         
-        # Pattern to find notebookbox references in LaTeX
-        self.notebookbox_pattern = re.compile(
-            r'\\begin\{notebookbox\}\{([^}]+)\}',
-            re.IGNORECASE
-        )
-        
     def validate(self) -> bool:
         """Run all notebook convention validations"""
+        return RepoScanner(self.root).scan([self])[0]
+
+    def start(self, scanner: RepoScanner):
+        notebooks_dir = scanner.root / "notebooks"
+        all_notebooks = [f.path for f in scanner.with_suffix(".ipynb") if f.path.parent == notebooks_dir]
+        self.available_notebooks = {nb.stem for nb in all_notebooks}
+        # Names are only checked for the notebooks in the scan's selection
+        self.notebook_files = [nb for nb in all_notebooks if scanner.is_selected(nb)]
+        self.tex_count = 0
+        # notebookbox violations are reported after the naming ones
+        self.reference_violations: List[NotebookConventionViolation] = []
+    
+    def visit(self, source):
+        self.tex_count += 1
+        facts = source.facts
+        if 'error' in facts:
+            print(f"⚠️  Could not read {source.path}: {facts['error']}")
+            return
+        self._validate_notebookbox_references(source.path, facts['notebookbox'])
+
+    def merge(self, other):
+        self.tex_count += other.tex_count
+        self.reference_violations.extend(other.reference_violations)
+    
+    def finish(self) -> bool:
+        """Report the results of the scan"""
         print(f"📓 Validating notebook conventions...")
+        notebook_files = self.notebook_files
         
-        # Get all notebooks
-        notebook_files = list((self.root / "notebooks").glob("*.ipynb"))
-        tex_files = list(self.root.glob("**/*.tex"))
-        
-        print(f"📄 Found {len(notebook_files)} notebooks and {len(tex_files)} LaTeX files")
+        print(f"📄 Found {len(notebook_files)} notebooks and {self.tex_count} LaTeX files")
         
         # Validate naming conventions
         print(f"\n📋 Checking notebook naming conventions...")
@@ -52,9 +74,8 @@ class NotebookConventionValidator:
         
         # Validate notebookbox references
         print(f"\n🔗 Checking LaTeX notebookbox references...")
-        reference_issues = len(self.violations)
-        self._validate_notebookbox_references(tex_files, notebook_files)
-        print(f"   ✅ Reference validation check: {len(self.violations) - reference_issues} issues found")
+        self.violations.extend(self.reference_violations)
+        print(f"   ✅ Reference validation check: {len(self.reference_violations)} issues found")
         
         # Report results
         if self.violations:
@@ -98,25 +119,11 @@ class NotebookConventionValidator:
                     fix=fix
                 ))
     
-    def _validate_notebookbox_references(self, tex_files: List[Path], notebook_files: List[Path]):
+    def _validate_notebookbox_references(self, tex_file: Path, references: List[List]):
         """Validate that notebookbox references match existing notebooks"""
-        # Create set of available notebook names (without .ipynb extension)
-        available_notebooks = {nb.stem for nb in notebook_files}
-        
-        for tex_file in tex_files:
-            try:
-                with open(tex_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-            except Exception as e:
-                print(f"⚠️  Could not read {tex_file}: {e}")
-                continue
-            
-            # Find all notebookbox references
-            lines = content.split('\n')
-            for line_num, line in enumerate(lines, 1):
-                matches = self.notebookbox_pattern.findall(line)
-                for url in matches:
-                    self._validate_notebookbox_url(tex_file, line_num, url, available_notebooks)
+        # notebookbox references are found by scripts/file_facts.py
+        for line_num, url in references:
+            self._validate_notebookbox_url(tex_file, line_num, url, self.available_notebooks)
     
     def _validate_notebookbox_url(self, tex_file: Path, line_num: int, url: str, available_notebooks: Set[str]):
         """Validate a single notebookbox URL reference"""
@@ -124,7 +131,7 @@ class NotebookConventionValidator:
         # Expected format: https://nipunbatra.github.io/ml-teaching/notebooks/NOTEBOOK_NAME.html
         
         if not url.startswith('https://nipunbatra.github.io/ml-teaching/notebooks/'):
-            self.violations.append(NotebookConventionViolation(
+            self.reference_violations.append(NotebookConventionViolation(
                 file_path=f"{tex_file}:{line_num}",
                 violation_type="INVALID_NOTEBOOK_URL",
                 description=f"Notebookbox URL doesn't follow expected pattern: {url}",
@@ -135,7 +142,7 @@ class NotebookConventionValidator:
         # Extract notebook name
         url_path = url.replace('https://nipunbatra.github.io/ml-teaching/notebooks/', '')
         if not url_path.endswith('.html'):
-            self.violations.append(NotebookConventionViolation(
+            self.reference_violations.append(NotebookConventionViolation(
                 file_path=f"{tex_file}:{line_num}",
                 violation_type="INVALID_NOTEBOOK_URL",
                 description=f"Notebookbox URL should end with .html: {url}",
@@ -147,7 +154,7 @@ class NotebookConventionValidator:
         
         # Check if corresponding notebook exists
         if notebook_name not in available_notebooks:
-            self.violations.append(NotebookConventionViolation(
+            self.reference_violations.append(NotebookConventionViolation(
                 file_path=f"{tex_file}:{line_num}",
                 violation_type="MISSING_NOTEBOOK",
                 description=f"Notebookbox references non-existent notebook: {notebook_name}.ipynb",
@@ -157,7 +164,7 @@ class NotebookConventionValidator:
         # Check if notebook name follows naming conventions
         if not self.valid_notebook_pattern.match(f"{notebook_name}.ipynb"):
             suggested_name = self._suggest_notebook_name(notebook_name)
-            self.violations.append(NotebookConventionViolation(
+            self.reference_violations.append(NotebookConventionViolation(
                 file_path=f"{tex_file}:{line_num}",
                 violation_type="INCONSISTENT_NAMING",
                 description=f"Notebookbox references notebook with non-standard name: {notebook_name}",
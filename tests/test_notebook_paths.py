@@ -6,11 +6,13 @@ This script validates that image paths in Jupyter notebooks follow the
 reorganized asset structure and don't reference deprecated shared/ paths.
 """
 
-import json
 import re
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from repo_scanner import Checker, RepoScanner
 
 class NotebookPathViolation:
     def __init__(self, notebook: str, cell_id: str, old_path: str, 
@@ -22,7 +24,9 @@ class NotebookPathViolation:
         self.description = description
         self.fix = fix
 
-class NotebookPathValidator:
+class NotebookPathValidator(Checker):
+    suffixes = ('.ipynb',)
+
     def __init__(self, root_path: str = "."):
         self.root = Path(root_path).resolve()
         self.violations: List[NotebookPathViolation] = []
@@ -40,21 +44,33 @@ class NotebookPathValidator:
     
     def validate(self) -> bool:
         """Run validation on all notebook files"""
+        return RepoScanner(self.root).scan([self])[0]
+
+    def start(self, scanner: RepoScanner):
+        self.file_counts: List[Tuple[Path, int, int]] = []
+    
+    def visit(self, source):
+        self.file_counts.append((source.path, *self._validate_notebook(source)))
+
+    def merge(self, other):
+        self.violations.extend(other.violations)
+        self.file_counts.extend(other.file_counts)
+    
+    def finish(self) -> bool:
+        """Report the results of the scan"""
         print(f"📓 Validating image paths in Jupyter notebooks...")
         
-        notebook_files = list(self.root.glob("**/*.ipynb"))
-        if not notebook_files:
+        if not self.file_counts:
             print("⚠️  No .ipynb files found!")
             return True
             
-        print(f"📄 Found {len(notebook_files)} notebook files to validate")
+        print(f"📄 Found {len(self.file_counts)} notebook files to validate")
         
         notebooks_with_images = 0
         total_images = 0
         compliant_images = 0
         
-        for notebook_file in notebook_files:
-            file_images, file_compliant = self._validate_notebook(notebook_file)
+        for notebook_file, file_images, file_compliant in self.file_counts:
             if file_images > 0:
                 notebooks_with_images += 1
                 total_images += file_images
@@ -63,7 +79,7 @@ class NotebookPathValidator:
                 print(f"   {status} {notebook_file.name}: {file_compliant}/{file_images} image paths compliant")
         
         print(f"\n📊 Notebook validation summary:")
-        print(f"   📓 Notebooks with images: {notebooks_with_images}/{len(notebook_files)}")
+        print(f"   📓 Notebooks with images: {notebooks_with_images}/{len(self.file_counts)}")
         print(f"   🖼️  Total image references: {total_images}")
         print(f"   ✅ Compliant paths: {compliant_images}")
         print(f"   ❌ Deprecated paths: {total_images - compliant_images}")
@@ -78,31 +94,22 @@ class NotebookPathValidator:
             print("✅ All images use proper asset organization")
             return True
     
-    def _validate_notebook(self, notebook_file: Path):
+    def _validate_notebook(self, source):
         """Validate image paths in a single notebook"""
-        try:
-            with open(notebook_file, 'r', encoding='utf-8') as f:
-                notebook = json.load(f)
-        except Exception as e:
-            print(f"⚠️  Could not read {notebook_file}: {e}")
+        notebook_file = source.path
+        # Image references and paths per cell are extracted by scripts/file_facts.py
+        facts = source.facts
+        if 'error' in facts:
+            print(f"⚠️  Could not read {notebook_file}: {facts['error']}")
             return 0, 0
         
         file_images_count = 0
         file_violations_before = len(self.violations)
         
-        for cell in notebook.get('cells', []):
-            cell_id = cell.get('id', 'unknown')
-            source = cell.get('source', [])
-            
-            # Join source lines if it's a list
-            if isinstance(source, list):
-                source_text = ''.join(source)
-            else:
-                source_text = source
-            
+        for cell in facts['cells']:
             # Count image references and check for violations
-            cell_images = self._check_cell_for_deprecated_paths(notebook_file, cell_id, source_text)
-            file_images_count += cell_images
+            file_images_count += cell['images']
+            self._check_cell_for_deprecated_paths(notebook_file, cell['id'], cell['paths'])
         
         # Calculate compliant images for this file
         file_violations_after = len(self.violations)
@@ -111,35 +118,21 @@ class NotebookPathValidator:
         
         return file_images_count, file_compliant_count
     
-    def _check_cell_for_deprecated_paths(self, notebook_file: Path, cell_id: str, source_text: str):
-        """Check a cell's source for deprecated image paths"""
-        image_count = 0
-        
-        # Count all image references (including .png, .jpg, .pdf, etc.)
-        image_patterns = [r'!\[[^\]]*\]\([^)]*\.(png|jpg|jpeg|pdf|svg|gif)[^)]*\)',  # Markdown images
-                         r'Image\([^)]*["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^)]*\)',  # Python Image()
-                         r'plt\.savefig\([^)]*["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^)]*\)',  # Matplotlib savefig
-                         r'<img[^>]*src=["\'][^"\']*\.(png|jpg|jpeg|pdf|svg|gif)[^"\']*["\'][^>]*>']  # HTML img tags
-        
-        for pattern in image_patterns:
-            matches = re.finditer(pattern, source_text, re.IGNORECASE)
-            image_count += len(list(matches))
-        
-        # Check for deprecated paths and add violations
-        for deprecated_pattern, replacement in self.deprecated_patterns.items():
-            matches = re.finditer(deprecated_pattern, source_text)
-            for match in matches:
-                old_path = match.group(0)
-                self.violations.append(NotebookPathViolation(
-                    notebook=str(notebook_file),
-                    cell_id=cell_id,
-                    old_path=old_path,
-                    violation_type="DEPRECATED_PATH",
-                    description=f"Uses deprecated path: {old_path}",
-                    fix=f"Replace with: {replacement}"
-                ))
-        
-        return image_count
+    def _check_cell_for_deprecated_paths(self, notebook_file: Path, cell_id: str, paths: List[str]):
+        """Check the relative paths in a cell's source for deprecated ones"""
+        for path in paths:
+            for deprecated_pattern, replacement in self.deprecated_patterns.items():
+                matches = re.finditer(deprecated_pattern, path)
+                for match in matches:
+                    old_path = match.group(0)
+                    self.violations.append(NotebookPathViolation(
+                        notebook=str(notebook_file),
+                        cell_id=cell_id,
+                        old_path=old_path,
+                        violation_type="DEPRECATED_PATH",
+                        description=f"Uses deprecated path: {old_path}",
+                        fix=f"Replace with: {replacement}"
+                    ))
     
     def _report_violations(self):
         """Report all violations"""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Streaming Notebook Reader Tests
+
+Checks that scripts/notebook_stream.py yields the same cells as json.loads()
+(minus the skipped outputs) for random notebooks read in small chunks, so
+every value is split across chunk boundaries somewhere: strings at escapes,
+numbers at their "." or exponent, brackets inside skipped outputs.
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from notebook_stream import iter_cells_text
+
+SCALARS = [
+    lambda rng: rng.randint(-10**12, 10**12),
+    lambda rng: rng.uniform(-1e6, 1e6),
+    lambda rng: rng.random() * 1e-30,
+    lambda rng: -2.5e20,
+    lambda rng: -25000000000.5,
+    lambda rng: rng.choice([True, False, None]),
+    lambda rng: 'a\\"b' * rng.randint(0, 3),
+    lambda rng: '{[' * rng.randint(0, 3) + '"' + ']}',
+]
+
+
+def _value(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.5:
+        return rng.choice(SCALARS)(rng)
+    if roll < 0.75:
+        return [_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": _value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def _notebook(rng: random.Random) -> dict:
+    cells = [{'cell_type': 'code', 'execution_count': rng.randint(0, 99), 'metadata': _value(rng),
+              'outputs': [_value(rng)], 'source': [str(_value(rng))]}
+             for _ in range(rng.randint(1, 4))]
+    return {'cells': cells, 'metadata': _value(rng), 'nbformat': 4, 'nbformat_minor': 5}
+
+
+def test_random_notebooks_in_small_chunks():
+    rng = random.Random(20261016)
+    for _ in range(500):
+        notebook = _notebook(rng)
+        text = json.dumps(notebook, indent=rng.choice([None, 1, 2]))
+        chunk_size = rng.randint(1, 16)
+        expected = [{key: value for key, value in cell.items() if key != 'outputs'}
+                    for cell in notebook['cells']]
+        cells = list(iter_cells_text(text, chunk_size=chunk_size))
+        assert cells == expected, f"chunk size {chunk_size}: {text[:200]}"
+
+
+def test_number_split_at_decimal_point():
+    text = '{"cells": [{"execution_count": -25000000000.5e-3, "source": []}]}'
+    for chunk_size in range(1, len(text) + 1):
+        cells = list(iter_cells_text(text, chunk_size=chunk_size))
+        assert cells == [{'execution_count': -25000000000.5e-3, 'source': []}], chunk_size
+
+
+def main():
+    tests = [test_random_notebooks_in_small_chunks, test_number_split_at_decimal_point]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except (AssertionError, ValueError) as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failures}/{len(tests)} passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
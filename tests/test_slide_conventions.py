@@ -5,21 +5,33 @@ Validates that slide files follow lowercase-with-hyphens.tex naming convention.
 """
 
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from repo_scanner import Checker, RepoScanner
 
-def find_slide_files():
+
+class SlideNamingChecker(Checker):
+    """Checks file names only, so it reads nothing during the scan."""
+
+    def start(self, scanner):
+        self.slide_files = find_slide_files(scanner)
+
+    def finish(self):
+        return report(self.slide_files)
+
+    def merge(self, other):
+        pass  # nothing is collected per file
+
+
+def find_slide_files(scanner=None):
     """Find all slide .tex files in the slides directories."""
-    slide_files = []
-    root_dir = Path(".")
+    scanner = scanner or RepoScanner(".")
     
     # Find all .tex files in slides directories
-    for slides_dir in root_dir.rglob("slides"):
-        if slides_dir.is_dir():
-            for tex_file in slides_dir.glob("*.tex"):
-                slide_files.append(tex_file)
-    
-    return slide_files
+    return [f.path for f in scanner.with_suffix(".tex")
+            if f.path.parent.name == "slides" and scanner.is_selected(f.path)]
 
 
 def validate_slide_naming_convention(slide_files):
@@ -100,12 +112,10 @@ def get_naming_issue(filename):
     return "; ".join(issues) if issues else "unknown issue"
 
 
-def main():
-    """Main validation function."""
+def report(slide_files):
+    """Validate the slide files and print the results."""
     print("🔍 Searching for slide .tex files...")
     
-    slide_files = find_slide_files()
-    
     if not slide_files:
         print("✅ No slide files found.")
         return True
@@ -137,6 +147,11 @@ def main():
         return True
 
 
+def main():
+    """Main validation function."""
+    return RepoScanner(".").scan([SlideNamingChecker()])[0]
+
+
 if __name__ == "__main__":
     success = main()
     exit(0 if success else 1)
\ No newline at end of file